@@ -1,33 +1,199 @@
 """
 HisMarketing Flask Application
 Ana uygulama dosyası
+
+pandas, scikit-learn ve openpyxl gibi ağır modüller ilgili endpoint'lerde
+ilk kullanımda yüklenir; üretimde wsgi.py ile ön yüklenebilir.
 """
 
-from flask import Flask, render_template, request, jsonify, send_file, session
+from backend.startup import mark_app_ready, startup_report
+
+from flask import (
+    Flask, Response, g, render_template, request, jsonify, send_file, session, stream_with_context
+)
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 from werkzeug.utils import secure_filename
+import hmac
 import os
 import json
+import time
 from datetime import datetime
-import pandas as pd
 
-from backend.data_intelligence import DataIntelligence
-from backend.prediction_engine import PredictionEngine
-from backend.external_data import ExternalDataProvider
+from backend.memory import TRACEMALLOC_ENABLED, memory_ledger
+from backend.metrics import (
+    metrics, request_timings, start_request_timings, stop_request_timings, summarize_timings, timed_stage
+)
+from backend.progress import JobCancelled, ProgressRegistry, report_progress, stream_events
 from backend.utils import (
     generate_file_id, generate_user_token, hash_password, verify_password,
-    allowed_file, read_data_file, save_user_data, load_user_data,
-    create_monthly_aggregation, create_product_summary, NumpyEncoder
+    allowed_file, read_data_file, save_user_data, load_user_data, list_user_reports,
+    frame_to_records, dumps_json, loads_json, append_rows_to_file, unique_days
 )
 
+
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify yanıtlarını dumps_json (varsa orjson) ile serileştir"""
+    
+    @timed_stage('serialize')
+    def dumps(self, obj, **kwargs):
+        return dumps_json(obj, sort_keys=kwargs.get('sort_keys', self.sort_keys)).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return loads_json(s)
+
+
 # Flask app configuration
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
 app.config['SECRET_KEY'] = 'hismarketing_secret_key_2024'
 app.config['UPLOAD_FOLDER'] = 'uploads'
-app.config['MAX_CONTENT_LENGTH'] = 50 * 1024 * 1024  # 50MB max file size
+app.config['MAX_CONTENT_LENGTH'] = int(os.environ.get('HISMARKETING_MAX_UPLOAD_MB', '50')) * 1024 * 1024  # varsayılan 50MB
 
 CORS(app)
 
+# /metrics yalnızca yerel isteklere açıktır; HISMARKETING_METRICS_PUBLIC=1 ile herkese açılır.
+# Aynı makinedeki ters vekil (nginx) arkasında tüm istekler yerel görünür; orada
+# HISMARKETING_METRICS_TOKEN verilmeli veya /metrics vekilde engellenmelidir
+METRICS_PUBLIC = os.environ.get('HISMARKETING_METRICS_PUBLIC', '0') == '1'
+METRICS_TOKEN = os.environ.get('HISMARKETING_METRICS_TOKEN', '')
+LOCAL_ADDRESSES = {'127.0.0.1', '::1'}
+
+# Yönetici e-postaları (virgülle ayrılmış); profil ve bellek endpoint'leri yalnızca bunlara açıktır
+ADMIN_EMAILS = {email.strip() for email in os.environ.get('HISMARKETING_ADMIN_EMAILS', '').split(',') if email.strip()}
+
+# İstenirse (?profile=1 veya X-Profile: 1) ya da örnekleme ile profillenen endpoint'ler
+PROFILED_ENDPOINTS = {'analyze_data', 'generate_prediction', 'backtest_prediction'}
+
+# HISMARKETING_TRACEMALLOC=1 ise istek başına bellek tepe değeri kaydedilir
+if TRACEMALLOC_ENABLED:
+    memory_ledger.start()
+
+
+@app.before_request
+def start_request_metrics():
+    """İstek süresi ölçümünü başlat; istenirse aşama sürelerini topla"""
+    g.request_started = time.perf_counter()
+    if request.path.startswith('/api/'):
+        g.memory_baseline = memory_ledger.begin_request()
+    if request.args.get('timings') == '1' or request.headers.get('X-Timings') == '1':
+        g.timings_token = start_request_timings()
+
+
+@app.after_request
+def record_request_metrics(response):
+    """İstek sayacı ve süresi; istenirse aşama süreleri JSON yanıta eklenir"""
+    endpoint = request.endpoint or 'unknown'
+    started = g.pop('request_started', None)
+    if started is not None and endpoint != 'static':
+        metrics.observe('hismarketing_http_request_duration_seconds', time.perf_counter() - started,
+                        endpoint=endpoint)
+        metrics.inc('hismarketing_http_requests_total', endpoint=endpoint, status=response.status_code)
+    
+    baseline = g.pop('memory_baseline', None)
+    if baseline is not None:
+        body = request.get_json(silent=True) if request.is_json else None
+        file_id = (body or {}).get('file_id') or request.args.get('file_id')
+        if file_id is None and endpoint == 'upload_data' and response.is_json:
+            # Yüklemede kimlik yanıtta üretilir
+            file_id = (response.get_json(silent=True) or {}).get('file_id')
+        memory_ledger.end_request(baseline, endpoint, request_user_email(), file_id)
+    
+    timings = request_timings()
+    if timings is not None and response.is_json and not response.is_streamed:
+        # Gövde yeniden serileştirilmez; 'timings' anahtarı nesnenin başına eklenir
+        body = response.get_data()
+        if body.lstrip().startswith(b'{'):
+            start = body.index(b'{') + 1
+            payload = dumps_json({'stages': timings, 'summary': summarize_timings(timings)})
+            separator = b'' if body[start:].strip() == b'}' else b','
+            response.set_data(body[:start] + b'"timings":' + payload + separator + body[start:])
+    return response
+
+
+@app.teardown_request
+def stop_request_metrics(exc=None):
+    token = g.pop('timings_token', None)
+    if token is not None:
+        stop_request_timings(token)
+    
+    # Yakalanmamış hatada after_request çalışmaz; tepe ölçümü yine de bırakılır
+    baseline = g.pop('memory_baseline', None)
+    if baseline is not None:
+        memory_ledger.end_request(baseline, request.endpoint or 'unknown', request_user_email())
+    
+    # Yanıt üretilemeden biten profil kaydedilmez ama kilidi bırakılır
+    profile = g.pop('profile', None)
+    if profile is not None:
+        profile.stop()
+
+
+def request_user_email():
+    """Authorization başlığındaki token'ın kullanıcısı (yoksa None)"""
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    if not token:
+        return None
+    for email, user_data in users_db.items():
+        if user_data['token'] == token:
+            return email
+    return None
+
+
+@app.before_request
+def start_request_profile():
+    """Yönetici isterse veya örnekleme denk gelirse isteği profille"""
+    if request.endpoint not in PROFILED_ENDPOINTS:
+        return
+    
+    from backend.profiling import RequestProfile, sampled
+    
+    user_email = request_user_email()
+    requested = request.args.get('profile') == '1' or request.headers.get('X-Profile') == '1'
+    if requested and user_email in ADMIN_EMAILS:
+        reason = 'requested'
+    elif user_email and sampled():
+        reason = 'sampled'
+    else:
+        return
+    
+    profile = RequestProfile(request.endpoint, user_email, reason)
+    if profile.start():
+        g.profile = profile
+
+
+@app.after_request
+def save_request_profile(response):
+    """Profili girdi dosyasının parmak iziyle birlikte kaydet"""
+    profile = g.pop('profile', None)
+    if profile is None:
+        return response
+    profile.stop()
+    
+    try:
+        from backend.profiling import file_fingerprint
+        
+        body = request.get_json(silent=True) or {}
+        file_data = user_files.get(profile.user_email, {}).get(body.get('file_id'))
+        fingerprint = None
+        extra = {'file_id': body.get('file_id')}
+        if file_data:
+            if os.path.exists(file_data['filepath']):
+                fingerprint = file_fingerprint(file_data['filepath'])
+            info = file_data['data_intelligence'].data_info
+            extra.update({
+                'filename': file_data.get('filename'),
+                'row_count': info.get('row_count'),
+                'columns': info.get('columns'),
+                'detected_columns': info.get('detected_columns'),
+            })
+        profile.save(response.status_code, fingerprint, extra)
+        response.headers['X-Profile-Id'] = profile.profile_id
+    except Exception:
+        import traceback
+        traceback.print_exc()
+    return response
+
+
 # Create necessary directories
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 os.makedirs('user_data', exist_ok=True)
@@ -54,6 +220,225 @@ def save_users_db(users_db):
 users_db = load_users_db()
 user_files = {}
 
+# Uzun süren işlerin ilerleme kaydı
+progress_jobs = ProgressRegistry()
+
+
+def start_progress_job(user_email, kind):
+    """İstekte job_id varsa ilerleme işini başlat"""
+    job_id = (request.json or {}).get('job_id')
+    if not job_id:
+        return None
+    
+    job = progress_jobs.get_or_create(job_id, user_email, kind)
+    if job is not None and job.finished:
+        job = progress_jobs.create(job_id, user_email, kind)
+    return job
+
+
+@app.after_request
+def finish_abandoned_job(response):
+    """
+    Hata ile dönen istekte bitmemiş ilerleme işini kapat
+    
+    İstemci olay akışını istekten önce açabildiğinden iş, istek doğrulama
+    hatasıyla (dosya yok, analiz yapılmamış vb.) dönse bile oluşmuş olabilir;
+    kapatılmazsa akış açık kalır.
+    """
+    if response.status_code < 400 or not request.is_json:
+        return response
+    
+    job_id = (request.get_json(silent=True) or {}).get('job_id')
+    user_email = request_user_email()
+    job = progress_jobs.get(job_id, owner=user_email) if job_id and user_email else None
+    if job is not None and not job.finished:
+        message = (response.get_json(silent=True) or {}).get('message') if response.is_json else None
+        job.finish('error', message)
+    return response
+
+
+def summarize_cube(cube, di):
+    """
+    Satış küpünden analiz sonucu ve ürün sorgu indeksi
+    
+    Analiz ve ekleme (append) aynı özetleri üretir; ikisi de ham satırlar
+    yerine küp hücreleri üzerinden çalışır.
+    """
+    stats = cube.summary_statistics()
+    
+    # Aylık satış trendi
+    date_col = di.get_column('date')
+    quantity_col = di.get_column('quantity')
+    revenue_col = di.get_column('revenue')
+    
+    monthly_sales = []
+    if date_col and quantity_col:
+        monthly_df = cube.monthly_series('quantity')
+        monthly_df['quantity'] = monthly_df['quantity'].astype(float)
+        monthly_sales = frame_to_records(monthly_df, {'year_month': 'month', 'quantity': 'sales'})
+    
+    # Ürün bazlı kâr
+    product_col = di.get_column('product')
+    cost_col = di.get_column('cost')
+    
+    # Ürün sorguları için özet tablo ve sıralama indeksleri (veri seti başına bir kez)
+    product_index = None
+    if product_col and quantity_col:
+        product_summary = cube.product_summary()
+        from backend.product_query import ProductQueryIndex
+        product_index = ProductQueryIndex(product_summary)
+    
+    product_profits = []
+    if product_index and revenue_col and cost_col:
+        product_profits = product_index.top(20, sort='quantity')
+    
+    analysis_result = {
+        'total_revenue': stats.get('total_revenue', 0),
+        'total_expense': stats.get('total_cost', 0),
+        'net_profit': stats.get('total_profit', 0),
+        'product_count': stats.get('unique_products', 0),
+        'monthly_sales': monthly_sales,
+        'product_profits': product_profits,
+        'top_products': product_profits[:10]
+    }
+    
+    return analysis_result, product_index
+
+
+def features_meta(file_data):
+    """Arrow dosyasının yanına yazılan, kaydı geri yüklemeye yeten bilgi"""
+    return {
+        'user_email': file_data.get('user_email'),
+        'file_id': file_data['file_id'],
+        'filename': file_data['filename'],
+        'filepath': file_data['filepath'],
+        'uploaded_at': file_data['uploaded_at'],
+        'info': file_data['info'],
+        'detected_columns': file_data['data_intelligence'].detected_columns,
+    }
+
+
+def store_features(file_data, df_features):
+    """
+    Özellik tablosunu Arrow deposuna yaz (pyarrow yoksa süreç belleğinde tut)
+    
+    Arrow dosyası bellek eşlemeli açıldığından aynı makinedeki worker'lar
+    tabloyu sayfa önbelleği üzerinden paylaşır.
+    """
+    from backend.dataset_store import dataset_store
+    if dataset_store.available:
+        key = f"{file_data['file_id']}.features"
+        try:
+            dataset_store.put(key, df_features, features_meta(file_data))
+            file_data['features_key'] = key
+            file_data.pop('df', None)
+            return
+        except ValueError:
+            # Karışık tipli sütunlar: bellekte tut
+            dataset_store.delete(key)
+    
+    file_data.pop('features_key', None)
+    file_data['df'] = df_features
+
+
+def get_file_data(user_email, file_id):
+    """
+    Kullanıcının veri seti kaydı (yoksa None)
+    
+    Kayıt bu süreçte yoksa Arrow deposundaki bilgi dosyasından geri yüklenir
+    (başka bir worker'da analiz edilmiş veya yeniden başlatmadan önce
+    yüklenmiş veri seti). Geri yüklenen kayıtta özellik tablosu vardır; satış
+    küpü, ürün indeksi ve anomaliler analiz yeniden çalıştırılınca oluşur.
+    """
+    files = user_files.get(user_email, {})
+    if file_id in files:
+        return files[file_id]
+    
+    # file_id dosya yoluna girer; yalnızca uuid biçimi kabul edilir
+    from backend.dataset_store import dataset_store
+    if not dataset_store.available or not file_id.replace('-', '').isalnum():
+        return None
+    key = f"{file_id}.features"
+    meta = dataset_store.get_meta(key)
+    if meta is None or meta.get('user_email') != user_email or not dataset_store.exists(key):
+        return None
+    
+    from backend.data_intelligence import DataIntelligence
+    di = DataIntelligence()
+    di.detected_columns = meta['detected_columns']
+    
+    file_data = {
+        'file_id': file_id,
+        'user_email': user_email,
+        'filename': meta['filename'],
+        'filepath': meta['filepath'],
+        'uploaded_at': meta['uploaded_at'],
+        'info': meta['info'],
+        'data_intelligence': di,
+        'df_prepared': None,
+        'cube': None,
+        'known_days': None,
+        'daily_sales': None,
+        'features_key': key
+    }
+    return user_files.setdefault(user_email, {}).setdefault(file_id, file_data)
+
+
+def delete_file_data(user_email, file_id):
+    """Veri setini süreçten, Arrow deposundan ve yükleme klasöründen sil"""
+    file_data = user_files.get(user_email, {}).pop(file_id, None)
+    
+    from backend.dataset_store import dataset_store
+    dataset_store.delete(f"{file_id}.features")
+    
+    if file_data and os.path.exists(file_data['filepath']):
+        os.remove(file_data['filepath'])
+
+
+def append_features(file_data, df_new):
+    """
+    Yeni satırların özelliklerini tabloya ekle
+    
+    Arrow deposunda mevcut tablo yeniden yazılmaz; satırlar ek parça olarak
+    yazılır. Özellikler satır bazlı olduğundan yeni satırlar geçmişe ihtiyaç
+    duymadan çıkarılır. Ekleme kaynak dosyanın yolunu (Excel -> CSV) ve satır
+    sayısını değiştirdiğinden bilgi dosyası da yeniden yazılır; file_data
+    bu güncellemelerden sonra verilmelidir.
+    """
+    if 'features_key' in file_data:
+        from backend.dataset_store import dataset_store
+        try:
+            dataset_store.append(file_data['features_key'], df_new)
+            dataset_store.update_meta(file_data['features_key'], features_meta(file_data))
+            return
+        except ValueError:
+            # Şemaya uymayan satırlar (örn: sütun tipi değişti): tablo yeniden yazılır
+            pass
+    
+    import pandas as pd
+    store_features(file_data, pd.concat([load_features(file_data), df_new], ignore_index=True))
+
+
+def has_features(file_data):
+    """Veri seti için özellik tablosu oluşturulmuş mu?"""
+    return 'df' in file_data or 'features_key' in file_data
+
+
+def load_features(file_data, columns=None):
+    """
+    Özellik tablosunu oku
+    
+    Args:
+        file_data: user_files kaydı
+        columns: Yalnızca bu sütunlar okunur (None ise tümü)
+    """
+    if 'features_key' in file_data:
+        from backend.dataset_store import dataset_store
+        return dataset_store.get(file_data['features_key'], columns)
+    
+    df = file_data['df']
+    return df[[col for col in columns if col in df.columns]] if columns else df
+
 
 # ===== ROUTES =====
 
@@ -187,12 +572,34 @@ def upload_data():
         
         file.save(filepath)
         
-        # Dosyayı oku ve analiz et
-        df = read_data_file(filepath)
-        
-        # Data Intelligence ile analiz
-        di = DataIntelligence()
-        file_info = di.analyze_file(df)
+        from backend.chunked_analysis import analyze_in_chunks, should_process_in_chunks
+        daily_sales = None
+        
+        if should_process_in_chunks(filepath):
+            # Büyük dosya: tamamı belleğe alınmadan parça parça analiz edilir
+            di, file_info, cube, daily_sales = analyze_in_chunks(filepath)
+            df_prepared = None
+            date_col = di.get_column('date')
+            known_days = unique_days(daily_sales[date_col]) if daily_sales is not None else None
+        else:
+            # Dosyayı oku ve analiz et
+            df = read_data_file(filepath)
+            
+            # Data Intelligence ile analiz
+            from backend.data_intelligence import DataIntelligence
+            di = DataIntelligence()
+            file_info = di.analyze_file(df)
+            # Ham tablo analizden sonra tutulmaz; hazırlanmış kopya yeterli
+            di.df = None
+            
+            # Veriyi hazırla ve satış küpünü bir kez oluştur
+            from backend.sales_cube import SalesCube
+            df_prepared = di.prepare_dataframe(df)
+            cube = SalesCube.build(df_prepared, di)
+            
+            # Eklemelerde tekrar eden günleri ayıklamak için mevcut günler
+            date_col = di.get_column('date')
+            known_days = unique_days(df_prepared[date_col]) if date_col else None
         
         # Kullanıcı dosyasını kaydet
         if user_email not in user_files:
@@ -200,11 +607,16 @@ def upload_data():
         
         user_files[user_email][file_id] = {
             'file_id': file_id,
+            'user_email': user_email,
             'filename': filename,
             'filepath': filepath,
             'uploaded_at': datetime.now().isoformat(),
             'info': file_info,
-            'data_intelligence': di
+            'data_intelligence': di,
+            'df_prepared': df_prepared,
+            'cube': cube,
+            'known_days': known_days,
+            'daily_sales': daily_sales
         }
         
         return jsonify({
@@ -214,6 +626,7 @@ def upload_data():
             'row_count': file_info['row_count'],
             'column_count': file_info['column_count'],
             'detected_columns': list(file_info['detected_columns'].values()),
+            'chunked': file_info.get('chunked', False),
             'message': 'Dosya başarıyla yüklendi'
         })
         
@@ -221,9 +634,172 @@ def upload_data():
         return jsonify({'success': False, 'message': f'Yükleme hatası: {str(e)}'}), 500
 
 
+@app.route('/api/data/append', methods=['POST'])
+def append_data():
+    """Mevcut veri setine yeni satırlar ekle (günlük güncellemeler)"""
+    try:
+        # Token kontrolü
+        token = request.headers.get('Authorization', '').replace('Bearer ', '')
+        user_email = None
+        
+        for email, user_data in users_db.items():
+            if user_data['token'] == token:
+                user_email = email
+                break
+        
+        if not user_email:
+            return jsonify({'success': False, 'message': 'Yetkisiz erişim'}), 401
+        
+        # Dosya ID
+        file_id = request.form.get('file_id')
+        
+        if not file_id or get_file_data(user_email, file_id) is None:
+            return jsonify({'success': False, 'message': 'Dosya bulunamadı'}), 404
+        
+        # Dosya kontrolü
+        if 'file' not in request.files:
+            return jsonify({'success': False, 'message': 'Dosya bulunamadı'}), 400
+        
+        file = request.files['file']
+        
+        if file.filename == '':
+            return jsonify({'success': False, 'message': 'Dosya seçilmedi'}), 400
+        
+        if not allowed_file(file.filename):
+            return jsonify({'success': False, 'message': 'Desteklenmeyen dosya formatı'}), 400
+        
+        file_data = user_files[user_email][file_id]
+        di = file_data['data_intelligence']
+        
+        # Depodan geri yüklenen kayıtta küp ve gün listesi analizle yeniden oluşur
+        if file_data.get('cube') is None:
+            return jsonify({'success': False, 'message': 'Önce veri analizi yapın'}), 400
+        
+        # Yeni satırları geçici dosyadan oku
+        file_ext = secure_filename(file.filename).rsplit('.', 1)[1].lower()
+        delta_path = os.path.join(app.config['UPLOAD_FOLDER'], f"{generate_file_id()}.{file_ext}")
+        file.save(delta_path)
+        try:
+            delta = read_data_file(delta_path)
+        finally:
+            os.remove(delta_path)
+        
+        # Kayıtlı sütun eşleştirmesine göre doğrula
+        missing = [col for col in di.detected_columns.values() if col not in delta.columns]
+        if missing:
+            return jsonify({
+                'success': False,
+                'message': f'Eksik sütunlar: {", ".join(missing)}'
+            }), 400
+        
+        delta_prepared = di.prepare_dataframe(delta)
+        
+        # Veri setinde zaten bulunan günlere ait satırları ayıkla
+        import numpy as np
+        date_col = di.get_column('date')
+        known_days = file_data.get('known_days')
+        skipped_days = []
+        skipped_rows = 0
+        if date_col and known_days is not None:
+            days = delta_prepared[date_col].to_numpy(dtype='datetime64[D]')
+            overlap = np.isin(days, known_days)
+            if overlap.any():
+                skipped_days = [str(day) for day in np.unique(days[overlap])]
+                skipped_rows = int(overlap.sum())
+                delta = delta[~overlap]
+                delta_prepared = delta_prepared[~overlap]
+        
+        appended = len(delta_prepared)
+        
+        if appended:
+            # Kalıcı veri dosyasına yalnızca yeni satırları yaz
+            file_data['filepath'] = append_rows_to_file(file_data['filepath'], delta)
+            
+            # Küpü yeni satırların küpüyle birleştir
+            from backend.sales_cube import SalesCube
+            file_data['cube'] = file_data['cube'].merge(SalesCube.build(delta_prepared, di))
+            file_data['info']['row_count'] += appended
+            
+            if date_col and known_days is not None:
+                file_data['known_days'] = np.union1d(known_days, unique_days(delta_prepared[date_col]))
+            
+            # Bellekteki satır tablolarını da güncel tut; yalnızca yeni satırlar işlenir
+            import pandas as pd
+            if file_data.get('daily_sales') is not None:
+                from backend.chunked_analysis import daily_product_sales
+                daily_delta = daily_product_sales(delta_prepared, di)
+                # Bilinen günler ayıklandığından yeni ürün-gün çiftleri mevcutlarla çakışmaz
+                file_data['daily_sales'] = pd.concat([file_data['daily_sales'], daily_delta], ignore_index=True)
+                if has_features(file_data):
+                    append_features(file_data, di.extract_features(daily_delta))
+            else:
+                if file_data.get('df_prepared') is not None:
+                    file_data['df_prepared'] = pd.concat([file_data['df_prepared'], delta_prepared], ignore_index=True)
+                if has_features(file_data):
+                    append_features(file_data, di.extract_features(delta_prepared))
+            
+            # Analiz yapılmışsa özetleri küpten yeniden üret
+            if 'analysis' in file_data:
+                analysis_result, product_index = summarize_cube(file_data['cube'], di)
+                
+                # Anomaliler tüm geçmişi taradığından ilk anomali sorgusunda yeniden hesaplanır
+                if file_data.get('anomalies') is not None:
+                    file_data['anomalies_stale'] = True
+                
+                save_user_data(user_email, 'analysis', analysis_result)
+                file_data['analysis'] = analysis_result
+                file_data['product_index'] = product_index
+        
+        return jsonify({
+            'success': True,
+            'file_id': file_id,
+            'appended_rows': appended,
+            'skipped_rows': skipped_rows,
+            'skipped_days': skipped_days,
+            'row_count': file_data['info']['row_count'],
+            'analysis_updated': bool(appended) and 'analysis' in file_data,
+            'message': f'{appended} satır eklendi'
+        })
+    
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Ekleme hatası: {str(e)}'}), 500
+
+
+@app.route('/api/data/<file_id>', methods=['DELETE'])
+def delete_data(file_id):
+    """Veri setini ve kayıtlı dosyalarını sil"""
+    try:
+        # Token kontrolü
+        token = request.headers.get('Authorization', '').replace('Bearer ', '')
+        user_email = None
+        
+        for email, user_data in users_db.items():
+            if user_data['token'] == token:
+                user_email = email
+                break
+        
+        if not user_email:
+            return jsonify({'success': False, 'message': 'Yetkisiz erişim'}), 401
+        
+        if get_file_data(user_email, file_id) is None:
+            return jsonify({'success': False, 'message': 'Dosya bulunamadı'}), 404
+        
+        delete_file_data(user_email, file_id)
+        
+        return jsonify({
+            'success': True,
+            'file_id': file_id,
+            'message': 'Veri seti silindi'
+        })
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Silme hatası: {str(e)}'}), 500
+
+
 @app.route('/api/data/analyze', methods=['POST'])
 def analyze_data():
     """Veri analizi"""
+    job = None
     try:
         # Token kontrolü
         token = request.headers.get('Authorization', '').replace('Bearer ', '')
@@ -240,84 +816,375 @@ def analyze_data():
         # Dosya ID
         file_id = request.json.get('file_id')
         
-        if not file_id or user_email not in user_files or file_id not in user_files[user_email]:
+        if not file_id or get_file_data(user_email, file_id) is None:
             return jsonify({'success': False, 'message': 'Dosya bulunamadı'}), 404
         
         # Dosya bilgilerini al
         file_data = user_files[user_email][file_id]
         filepath = file_data['filepath']
         di = file_data['data_intelligence']
+        job = start_progress_job(user_email, 'analysis')
+        
+        # Depodan geri yüklenmiş büyük dosya: ürün × gün tablosu parça parça yeniden oluşturulur
+        if file_data['info'].get('chunked') and file_data.get('daily_sales') is None:
+            from backend.chunked_analysis import analyze_in_chunks
+            report_progress(job, 'read', 'Dosya parça parça okunuyor')
+            _, _, file_data['cube'], file_data['daily_sales'] = analyze_in_chunks(filepath)
+        
+        # Yüklemede hazırlanan veriyi kullan (yoksa dosyayı yeniden oku)
+        df_prepared = file_data.pop('df_prepared', None)
+        if file_data.get('daily_sales') is not None:
+            # Parça parça işlenmiş dosya: ham satırlar yerine ürün × gün tablosu
+            df_features = di.extract_features(file_data['daily_sales'])
+        else:
+            if df_prepared is None:
+                report_progress(job, 'read', 'Dosya okunuyor')
+                df = read_data_file(filepath)
+                report_progress(job, 'prepare', 'Veriler hazırlanıyor', rows=len(df))
+                df_prepared = di.prepare_dataframe(df)
+            df_features = di.extract_features(df_prepared)
+        
+        cube = file_data.get('cube')
+        if cube is None:
+            from backend.sales_cube import SalesCube
+            cube = SalesCube.build(df_prepared, di)
+            file_data['cube'] = cube
         
-        # DataFrame'i oku ve hazırla
-        df = read_data_file(filepath)
-        df_prepared = di.prepare_dataframe(df)
-        df_features = di.extract_features(df_prepared)
-        
-        # Analiz yap
-        stats = di.get_summary_statistics(df_features)
-        
-        # Aylık satış trendi
         date_col = di.get_column('date')
-        quantity_col = di.get_column('quantity')
-        revenue_col = di.get_column('revenue')
-        
-        monthly_sales = []
-        if date_col and quantity_col:
-            monthly_df = create_monthly_aggregation(df_features, date_col, quantity_col)
-            monthly_sales = [
-                {'month': row['year_month'], 'sales': float(row[quantity_col])}
-                for _, row in monthly_df.iterrows()
-            ]
-        
-        # Ürün bazlı kâr
-        product_col = di.get_column('product')
-        cost_col = di.get_column('cost')
-        
-        product_profits = []
-        if product_col and revenue_col and cost_col:
-            product_summary = create_product_summary(df_features, product_col, quantity_col, revenue_col, cost_col)
-            product_profits = [
-                {
-                    'product': row['product'],
-                    'quantity': int(row['total_quantity']),
-                    'revenue': float(row.get('total_revenue', 0)),
-                    'profit': float(row.get('profit', 0))
-                }
-                for _, row in product_summary.head(20).iterrows()
-            ]
-        
-        # Sonuçları kaydet
-        analysis_result = {
-            'total_revenue': stats.get('total_revenue', 0),
-            'total_expense': stats.get('total_cost', 0),
-            'net_profit': stats.get('total_profit', 0),
-            'product_count': stats.get('unique_products', 0),
-            'monthly_sales': monthly_sales,
-            'product_profits': product_profits,
-            'top_products': product_profits[:10]
-        }
+        if file_data.get('known_days') is None and date_col:
+            day_source = file_data['daily_sales'] if file_data.get('daily_sales') is not None else df_prepared
+            file_data['known_days'] = unique_days(day_source[date_col])
+        
+        # Analiz yap (satış küpü üzerinden)
+        report_progress(job, 'aggregate', 'Özet istatistikler hesaplanıyor')
+        analysis_result, product_index = summarize_cube(cube, di)
+        
+        # Talep anomalileri (tüm ürünler tek matris üzerinde)
+        report_progress(job, 'anomalies', 'Anomaliler tespit ediliyor')
+        from backend.anomaly_detection import detect_dataset_anomalies
+        anomaly_source = file_data['daily_sales'] if file_data.get('daily_sales') is not None else df_prepared
+        anomalies = detect_dataset_anomalies(anomaly_source, di)
+        if anomalies is not None:
+            analysis_result['anomalies'] = anomalies.summary()
         
         # Kullanıcı verisi olarak kaydet
         save_user_data(user_email, 'analysis', analysis_result)
         
         # Dosya verilerine ekle
         user_files[user_email][file_id]['analysis'] = analysis_result
-        user_files[user_email][file_id]['df'] = df_features
+        store_features(user_files[user_email][file_id], df_features)
+        user_files[user_email][file_id]['anomalies'] = anomalies
+        user_files[user_email][file_id]['product_index'] = product_index
+        
+        if job:
+            job.finish('done', 'Analiz tamamlandı')
         
         return jsonify({
             'success': True,
             **analysis_result
         })
         
+    except JobCancelled:
+        job.finish('cancelled', 'Analiz iptal edildi')
+        return jsonify({'success': False, 'message': 'Analiz iptal edildi'}), 409
+        
     except Exception as e:
         import traceback
         traceback.print_exc()
+        if job:
+            job.finish('error', str(e))
         return jsonify({'success': False, 'message': f'Analiz hatası: {str(e)}'}), 500
 
 
+@app.route('/api/data/products', methods=['GET'])
+def query_products():
+    """Sayfalı ve sıralı ürün sorgusu"""
+    try:
+        # Token kontrolü
+        token = request.headers.get('Authorization', '').replace('Bearer ', '')
+        user_email = None
+        
+        for email, user_data in users_db.items():
+            if user_data['token'] == token:
+                user_email = email
+                break
+        
+        if not user_email:
+            return jsonify({'success': False, 'message': 'Yetkisiz erişim'}), 401
+        
+        # Dosya ID
+        file_id = request.args.get('file_id')
+        
+        if not file_id or get_file_data(user_email, file_id) is None:
+            return jsonify({'success': False, 'message': 'Dosya bulunamadı'}), 404
+        
+        product_index = user_files[user_email][file_id].get('product_index')
+        
+        if product_index is None:
+            return jsonify({'success': False, 'message': 'Önce veri analizi yapın'}), 400
+        
+        try:
+            result = product_index.query(
+                sort=request.args.get('sort', 'quantity'),
+                order=request.args.get('order', 'desc'),
+                page=request.args.get('page', 1, type=int),
+                page_size=request.args.get('page_size', 50, type=int),
+                prefix=request.args.get('q', '').strip() or None
+            )
+        except ValueError as e:
+            return jsonify({'success': False, 'message': str(e)}), 400
+        
+        return jsonify({
+            'success': True,
+            **result
+        })
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Sorgu hatası: {str(e)}'}), 500
+
+
+# Kırılım API'sindeki boyut adları -> küp boyutları
+DRILLDOWN_DIMENSIONS = {
+    'product': 'product',
+    'month': 'month',
+    'category': 'category',
+    'branch': 'location',
+    'location': 'location',
+    'city': 'city',
+    'region': 'region',
+    'supplier': 'supplier',
+}
+
+
+@app.route('/api/data/drilldown', methods=['GET'])
+def drilldown_data():
+    """Kategori, şube, il, bölge, tedarikçi ve ay kırılımları"""
+    try:
+        # Token kontrolü
+        token = request.headers.get('Authorization', '').replace('Bearer ', '')
+        user_email = None
+        
+        for email, user_data in users_db.items():
+            if user_data['token'] == token:
+                user_email = email
+                break
+        
+        if not user_email:
+            return jsonify({'success': False, 'message': 'Yetkisiz erişim'}), 401
+        
+        # Dosya ID
+        file_id = request.args.get('file_id')
+        
+        if not file_id or get_file_data(user_email, file_id) is None:
+            return jsonify({'success': False, 'message': 'Dosya bulunamadı'}), 404
+        
+        cube = user_files[user_email][file_id].get('cube')
+        
+        if cube is None:
+            return jsonify({'success': False, 'message': 'Önce veri analizi yapın'}), 400
+        
+        # Gruplama boyutları (örn: by=category,branch)
+        by = []
+        for name in [b.strip() for b in request.args.get('by', '').split(',') if b.strip()]:
+            if name not in DRILLDOWN_DIMENSIONS:
+                return jsonify({'success': False, 'message': f'Geçersiz boyut: {name}'}), 400
+            by.append(DRILLDOWN_DIMENSIONS[name])
+        
+        missing = [dim for dim in by if dim not in cube.keys]
+        if missing:
+            return jsonify({'success': False, 'message': f'Veride bulunmayan boyut: {", ".join(missing)}'}), 400
+        
+        # Boyut filtreleri (örn: category=Süt&branch=Ankara&branch=İzmir)
+        filters = {}
+        for name, dim in DRILLDOWN_DIMENSIONS.items():
+            values = request.args.getlist(name)
+            if values:
+                if dim not in cube.keys:
+                    return jsonify({'success': False, 'message': f'Veride bulunmayan boyut: {name}'}), 400
+                filters.setdefault(dim, []).extend(values)
+        
+        result = cube.drilldown(
+            by,
+            filters=filters,
+            start_month=request.args.get('start') or None,
+            end_month=request.args.get('end') or None,
+            limit=max(1, min(request.args.get('limit', 1000, type=int), 10000))
+        )
+        
+        return jsonify({
+            'success': True,
+            'dimensions': {name: dim in cube.keys for name, dim in DRILLDOWN_DIMENSIONS.items()},
+            **result
+        })
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Kırılım hatası: {str(e)}'}), 500
+
+
+@app.route('/api/data/anomalies', methods=['GET'])
+def query_anomalies():
+    """Talep anomalileri (ani artış, düşüş, stok tükenmesi)"""
+    try:
+        # Token kontrolü
+        token = request.headers.get('Authorization', '').replace('Bearer ', '')
+        user_email = None
+        
+        for email, user_data in users_db.items():
+            if user_data['token'] == token:
+                user_email = email
+                break
+        
+        if not user_email:
+            return jsonify({'success': False, 'message': 'Yetkisiz erişim'}), 401
+        
+        # Dosya ID
+        file_id = request.args.get('file_id')
+        
+        if not file_id or get_file_data(user_email, file_id) is None:
+            return jsonify({'success': False, 'message': 'Dosya bulunamadı'}), 404
+        
+        file_data = user_files[user_email][file_id]
+        
+        if 'analysis' not in file_data:
+            return jsonify({'success': False, 'message': 'Önce veri analizi yapın'}), 400
+        
+        # Eklemeden sonra ilk sorguda yeniden hesapla
+        if file_data.pop('anomalies_stale', False):
+            from backend.anomaly_detection import detect_dataset_anomalies
+            di = file_data['data_intelligence']
+            columns = [di.get_column('product'), di.get_column('date'), di.get_column('quantity')]
+            file_data['anomalies'] = detect_dataset_anomalies(load_features(file_data, columns), di)
+            file_data['analysis']['anomalies'] = file_data['anomalies'].summary()
+        
+        anomalies = file_data.get('anomalies')
+        
+        if anomalies is None:
+            return jsonify({'success': False, 'message': 'Ürün, tarih ve miktar sütunları gerekli'}), 400
+        
+        return jsonify({
+            'success': True,
+            'summary': anomalies.summary(top=0),
+            'anomalies': anomalies.query(
+                product=request.args.get('product') or None,
+                kind=request.args.get('type') or None,
+                limit=max(1, min(request.args.get('limit', 100, type=int), 5000))
+            ),
+            'by_day': anomalies.by_day(),
+            'by_product': anomalies.by_product()
+        })
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Anomali sorgu hatası: {str(e)}'}), 500
+
+
+@app.route('/api/data/compare', methods=['GET'])
+def compare_data():
+    """Birden fazla veri setinin ürün × dönem karşılaştırması"""
+    try:
+        # Token kontrolü
+        token = request.headers.get('Authorization', '').replace('Bearer ', '')
+        user_email = None
+        
+        for email, user_data in users_db.items():
+            if user_data['token'] == token:
+                user_email = email
+                break
+        
+        if not user_email:
+            return jsonify({'success': False, 'message': 'Yetkisiz erişim'}), 401
+        
+        # Dosya ID'leri (ilki taban; değişimler diğer − taban olduğundan
+        # taban önceki dönemdir, örn: file_id=2023&file_id=2024)
+        file_ids = request.args.getlist('file_id')
+        
+        if len(file_ids) < 2:
+            return jsonify({'success': False, 'message': 'En az iki dosya seçin'}), 400
+        
+        datasets = []
+        for file_id in file_ids:
+            if get_file_data(user_email, file_id) is None:
+                return jsonify({'success': False, 'message': f'Dosya bulunamadı: {file_id}'}), 404
+            datasets.append(user_files[user_email][file_id])
+        
+        if any(dataset.get('cube') is None for dataset in datasets):
+            return jsonify({'success': False, 'message': 'Önce veri analizi yapın'}), 400
+        
+        from backend.comparison import compare_cubes
+        result = compare_cubes(
+            [dataset['cube'] for dataset in datasets],
+            labels=[dataset['filename'] for dataset in datasets],
+            measure=request.args.get('measure', 'quantity'),
+            period=request.args.get('period', 'total'),
+            limit=max(1, min(request.args.get('limit', 500, type=int), 10000))
+        )
+        
+        return jsonify({
+            'success': True,
+            'file_ids': file_ids,
+            **result
+        })
+        
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Karşılaştırma hatası: {str(e)}'}), 500
+
+
+@app.route('/api/data/quicklook', methods=['POST'])
+def quicklook_data():
+    """Büyük dosyalar için tek geçişli yaklaşık analiz"""
+    try:
+        # Token kontrolü
+        token = request.headers.get('Authorization', '').replace('Bearer ', '')
+        user_email = None
+        
+        for email, user_data in users_db.items():
+            if user_data['token'] == token:
+                user_email = email
+                break
+        
+        if not user_email:
+            return jsonify({'success': False, 'message': 'Yetkisiz erişim'}), 401
+        
+        # Dosya ID
+        data = request.json or {}
+        file_id = data.get('file_id')
+        
+        if not file_id or get_file_data(user_email, file_id) is None:
+            return jsonify({'success': False, 'message': 'Dosya bulunamadı'}), 404
+        
+        file_data = user_files[user_email][file_id]
+        di = file_data['data_intelligence']
+        chunksize = max(1000, min(int(data.get('chunk_size', 100000)), 1000000))
+        
+        # Dosyayı parça parça oku; eksik değerler medyanla doldurulmaz
+        from backend.utils import iter_data_chunks
+        from backend.sketches import SketchProfile
+        profile = SketchProfile(di)
+        
+        for chunk in iter_data_chunks(file_data['filepath'], chunksize=chunksize):
+            profile.update(di.prepare_dataframe(chunk, fill_missing=False))
+        
+        return jsonify({
+            'success': True,
+            'quicklook': profile.result()
+        })
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Hızlı analiz hatası: {str(e)}'}), 500
+
+
 @app.route('/api/prediction/generate', methods=['POST'])
 def generate_prediction():
     """Tahmin oluştur"""
+    job = None
     try:
         # Token kontrolü
         token = request.headers.get('Authorization', '').replace('Bearer ', '')
@@ -334,16 +1201,15 @@ def generate_prediction():
         # Dosya ID
         file_id = request.json.get('file_id')
         
-        if not file_id or user_email not in user_files or file_id not in user_files[user_email]:
+        if not file_id or get_file_data(user_email, file_id) is None:
             return jsonify({'success': False, 'message': 'Dosya bulunamadı'}), 404
         
         # Dosya bilgilerini al
         file_data = user_files[user_email][file_id]
         
-        if 'df' not in file_data:
+        if not has_features(file_data):
             return jsonify({'success': False, 'message': 'Önce veri analizi yapın'}), 400
         
-        df = file_data['df']
         di = file_data['data_intelligence']
         
         # Sütunları al
@@ -354,12 +1220,27 @@ def generate_prediction():
         if not all([product_col, date_col, quantity_col]):
             return jsonify({'success': False, 'message': 'Gerekli sütunlar bulunamadı'}), 400
         
+        # Tahmin yalnızca ürün, tarih, miktar ve (varsa) şube sütunlarını kullanır
+        location_col = di.get_column('location')
+        columns = [product_col, date_col, quantity_col]
+        if location_col and location_col not in columns:
+            columns.append(location_col)
+        df = load_features(file_data, columns)
+        if location_col not in df.columns:
+            location_col = None
+        
         # Tahmin motoru
-        pe = PredictionEngine()
+        from backend.prediction_engine import PredictionEngine
+        job = start_progress_job(user_email, 'prediction')
+        pe = PredictionEngine(progress=job)
         
         # Tahmin oluştur
+        # İstenirse anomali günleri eğitimden çıkarılır
+        exclude_anomalies = file_data.get('anomalies') if request.json.get('mask_outliers') else None
+        
         prediction_result = pe.generate_predictions(
-            df, product_col, date_col, quantity_col, top_n=15
+            df, product_col, date_col, quantity_col, top_n=15, exclude_anomalies=exclude_anomalies,
+            location_col=location_col
         )
         
         # Kullanıcı verisi olarak kaydet
@@ -368,17 +1249,170 @@ def generate_prediction():
         # Dosya verilerine ekle
         user_files[user_email][file_id]['prediction'] = prediction_result
         
+        if job:
+            job.finish('done', 'Tahmin tamamlandı')
+        
         return jsonify({
             'success': True,
             **prediction_result
         })
         
+    except JobCancelled:
+        job.finish('cancelled', 'Tahmin iptal edildi')
+        return jsonify({'success': False, 'message': 'Tahmin iptal edildi'}), 409
+        
     except Exception as e:
         import traceback
         traceback.print_exc()
+        if job:
+            job.finish('error', str(e))
         return jsonify({'success': False, 'message': f'Tahmin hatası: {str(e)}'}), 500
 
 
+@app.route('/api/prediction/backtest', methods=['POST'])
+def backtest_prediction():
+    """Kayan başlangıçlı geriye dönük tahmin doğruluğu testi"""
+    job = None
+    try:
+        # Token kontrolü
+        token = request.headers.get('Authorization', '').replace('Bearer ', '')
+        user_email = None
+        
+        for email, user_data in users_db.items():
+            if user_data['token'] == token:
+                user_email = email
+                break
+        
+        if not user_email:
+            return jsonify({'success': False, 'message': 'Yetkisiz erişim'}), 401
+        
+        # Dosya ID
+        file_id = request.json.get('file_id')
+        
+        if not file_id or get_file_data(user_email, file_id) is None:
+            return jsonify({'success': False, 'message': 'Dosya bulunamadı'}), 404
+        
+        # Dosya bilgilerini al
+        file_data = user_files[user_email][file_id]
+        
+        if not has_features(file_data):
+            return jsonify({'success': False, 'message': 'Önce veri analizi yapın'}), 400
+        
+        from backend.backtesting import DEFAULT_TOP_N, MAX_TOP_N
+        try:
+            folds = int(request.json.get('folds', 3))
+            horizon_days = int(request.json.get('horizon_days', 30))
+            top_n = int(request.json.get('top_n', DEFAULT_TOP_N))
+        except (TypeError, ValueError):
+            return jsonify({'success': False, 'message': 'Geçersiz parametre'}), 400
+        
+        if not 1 <= folds <= 12 or not 1 <= horizon_days <= 365 or not 1 <= top_n <= MAX_TOP_N:
+            return jsonify({'success': False,
+                            'message': f'folds 1-12, horizon_days 1-365, top_n 1-{MAX_TOP_N} arasında olmalı'}), 400
+        
+        di = file_data['data_intelligence']
+        
+        # Sütunları al
+        product_col = di.get_column('product')
+        date_col = di.get_column('date')
+        quantity_col = di.get_column('quantity')
+        
+        if not all([product_col, date_col, quantity_col]):
+            return jsonify({'success': False, 'message': 'Gerekli sütunlar bulunamadı'}), 400
+        
+        location_col = di.get_column('location')
+        columns = [product_col, date_col, quantity_col]
+        if location_col and location_col not in columns:
+            columns.append(location_col)
+        df = load_features(file_data, columns)
+        if location_col not in df.columns:
+            location_col = None
+        
+        from backend.prediction_engine import PredictionEngine
+        job = start_progress_job(user_email, 'backtest')
+        pe = PredictionEngine(progress=job)
+        
+        exclude_anomalies = file_data.get('anomalies') if request.json.get('mask_outliers') else None
+        
+        backtest_result = pe.backtest(
+            df, product_col, date_col, quantity_col, top_n=top_n, folds=folds,
+            horizon_days=horizon_days, exclude_anomalies=exclude_anomalies, location_col=location_col
+        )
+        
+        save_user_data(user_email, 'backtest', backtest_result)
+        user_files[user_email][file_id]['backtest'] = backtest_result
+        
+        if job:
+            job.finish('done', 'Geriye dönük test tamamlandı')
+        
+        return jsonify({
+            'success': True,
+            **backtest_result
+        })
+        
+    except JobCancelled:
+        job.finish('cancelled', 'Geriye dönük test iptal edildi')
+        return jsonify({'success': False, 'message': 'Geriye dönük test iptal edildi'}), 409
+        
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        if job:
+            job.finish('error', str(e))
+        return jsonify({'success': False, 'message': f'Geriye dönük test hatası: {str(e)}'}), 500
+
+
+@app.route('/api/jobs/<job_id>/events', methods=['GET'])
+def job_events(job_id):
+    """İş ilerleme olayları (Server-Sent Events)"""
+    # EventSource başlık gönderemediği için token sorgu parametresinden de alınır
+    token = request.args.get('token') or request.headers.get('Authorization', '').replace('Bearer ', '')
+    user_email = None
+    
+    for email, user_data in users_db.items():
+        if user_data['token'] == token:
+            user_email = email
+            break
+    
+    if not user_email:
+        return jsonify({'success': False, 'message': 'Yetkisiz erişim'}), 401
+    
+    job = progress_jobs.get_or_create(job_id, user_email, request.args.get('kind', 'unknown'))
+    if job is None:
+        return jsonify({'success': False, 'message': 'İş bulunamadı'}), 404
+    
+    cancel_on_disconnect = request.args.get('cancel_on_disconnect') == '1'
+    
+    return Response(
+        stream_with_context(stream_events(job, cancel_on_disconnect=cancel_on_disconnect)),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Çalışan işi iptal et"""
+    token = request.headers.get('Authorization', '').replace('Bearer ', '')
+    user_email = None
+    
+    for email, user_data in users_db.items():
+        if user_data['token'] == token:
+            user_email = email
+            break
+    
+    if not user_email:
+        return jsonify({'success': False, 'message': 'Yetkisiz erişim'}), 401
+    
+    job = progress_jobs.get(job_id, owner=user_email)
+    if job is None:
+        return jsonify({'success': False, 'message': 'İş bulunamadı'}), 404
+    
+    job.cancel()
+    
+    return jsonify({'success': True, 'job_id': job_id, 'message': 'İptal isteği alındı'})
+
+
 @app.route('/api/reports/pdf', methods=['GET'])
 def download_pdf():
     """PDF raporu indir"""
@@ -397,9 +1431,11 @@ def download_pdf():
         
         report_type = request.args.get('type', 'analysis')
         
+        version = request.args.get('version', type=int)
+        
         # Basit PDF oluşturma (gerçek uygulamada ReportLab kullanılır)
         # Şimdilik JSON olarak döndür
-        data = load_user_data(user_email, report_type)
+        data = load_user_data(user_email, report_type, version=version)
         
         if not data:
             return jsonify({'success': False, 'message': 'Rapor bulunamadı'}), 404
@@ -407,7 +1443,7 @@ def download_pdf():
         # JSON dosyası olarak indir
         import io
         output = io.BytesIO()
-        output.write(json.dumps(data, cls=NumpyEncoder, indent=2, ensure_ascii=False).encode('utf-8'))
+        output.write(dumps_json(data, indent=True))
         output.seek(0)
         
         return send_file(
@@ -421,6 +1457,34 @@ def download_pdf():
         return jsonify({'success': False, 'message': f'İndirme hatası: {str(e)}'}), 500
 
 
+@app.route('/api/reports/history', methods=['GET'])
+def report_history():
+    """Rapor sürüm geçmişi"""
+    try:
+        # Token kontrolü
+        token = request.headers.get('Authorization', '').replace('Bearer ', '')
+        user_email = None
+        
+        for email, user_data in users_db.items():
+            if user_data['token'] == token:
+                user_email = email
+                break
+        
+        if not user_email:
+            return jsonify({'success': False, 'message': 'Yetkisiz erişim'}), 401
+        
+        report_type = request.args.get('type', 'analysis')
+        
+        return jsonify({
+            'success': True,
+            'type': report_type,
+            'history': list_user_reports(user_email, report_type)
+        })
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Geçmiş hatası: {str(e)}'}), 500
+
+
 @app.route('/api/reports/excel', methods=['GET'])
 def download_excel():
     """Excel raporu indir"""
@@ -439,41 +1503,160 @@ def download_excel():
         
         report_type = request.args.get('type', 'prediction')
         
-        data = load_user_data(user_email, report_type)
+        # 'full' raporu tahmin ve analiz sayfalarını birlikte içerir
+        prediction = load_user_data(user_email, 'prediction') if report_type in ('prediction', 'full') else None
+        analysis = load_user_data(user_email, 'analysis') if report_type in ('analysis', 'full') else None
         
-        if not data:
+        if not prediction and not analysis:
             return jsonify({'success': False, 'message': 'Rapor bulunamadı'}), 404
         
-        # Excel oluştur
-        import io
-        output = io.BytesIO()
-        
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            if report_type == 'prediction' and 'predictions' in data:
-                # Tahmin verileri
-                predictions_data = []
-                for pred in data['predictions']:
-                    row = {'Ürün': pred['product']}
-                    for i, val in enumerate(pred['monthly_predictions'], 1):
-                        row[f'Ay {i}'] = val
-                    row['Toplam'] = pred['total_predicted']
-                    predictions_data.append(row)
-                
-                df_pred = pd.DataFrame(predictions_data)
-                df_pred.to_excel(writer, sheet_name='Tahminler', index=False)
-        
-        output.seek(0)
+        # Excel'i write-only sayfalarla oluştur ve parça parça gönder
+        from backend.reports import EXCEL_MIMETYPE, build_report_sheets, stream_excel_report
+        sheets = build_report_sheets(prediction=prediction, analysis=analysis)
         
-        return send_file(
-            output,
-            as_attachment=True,
-            download_name=f'hismarketing_{report_type}_raporu.xlsx',
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+        return Response(
+            stream_with_context(stream_excel_report(sheets)),
+            mimetype=EXCEL_MIMETYPE,
+            headers={'Content-Disposition': f'attachment; filename=hismarketing_{report_type}_raporu.xlsx'}
         )
         
     except Exception as e:
         return jsonify({'success': False, 'message': f'İndirme hatası: {str(e)}'}), 500
 
 
+@app.route('/api/system/startup', methods=['GET'])
+def system_startup():
+    """Açılış süresi raporu"""
+    return jsonify({'success': True, **startup_report()})
+
+
+@app.route('/api/admin/profiles', methods=['GET'])
+def list_request_profiles():
+    """Kayıtlı istek profilleri"""
+    try:
+        # Token kontrolü
+        token = request.headers.get('Authorization', '').replace('Bearer ', '')
+        user_email = None
+        
+        for email, user_data in users_db.items():
+            if user_data['token'] == token:
+                user_email = email
+                break
+        
+        if not user_email:
+            return jsonify({'success': False, 'message': 'Yetkisiz erişim'}), 401
+        
+        if user_email not in ADMIN_EMAILS:
+            return jsonify({'success': False, 'message': 'Bu işlem için yönetici yetkisi gerekli'}), 403
+        
+        from backend.profiling import list_profiles
+        profiles = list_profiles()
+        
+        return jsonify({'success': True, 'profiles': profiles, 'total': len(profiles)})
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Profil listesi hatası: {str(e)}'}), 500
+
+
+@app.route('/api/admin/profiles/<profile_id>', methods=['GET'])
+def get_request_profile(profile_id):
+    """Profil özeti veya (?download=1) .prof dosyası"""
+    try:
+        # Token kontrolü
+        token = request.headers.get('Authorization', '').replace('Bearer ', '')
+        user_email = None
+        
+        for email, user_data in users_db.items():
+            if user_data['token'] == token:
+                user_email = email
+                break
+        
+        if not user_email:
+            return jsonify({'success': False, 'message': 'Yetkisiz erişim'}), 401
+        
+        if user_email not in ADMIN_EMAILS:
+            return jsonify({'success': False, 'message': 'Bu işlem için yönetici yetkisi gerekli'}), 403
+        
+        from backend.profiling import load_profile, profile_path
+        
+        if request.args.get('download') == '1':
+            path = profile_path(profile_id)
+            if path is None:
+                return jsonify({'success': False, 'message': 'Profil bulunamadı'}), 404
+            return send_file(
+                os.path.abspath(path),
+                mimetype='application/octet-stream',
+                as_attachment=True,
+                download_name=f'{profile_id}.prof'
+            )
+        
+        profile = load_profile(profile_id)
+        if profile is None:
+            return jsonify({'success': False, 'message': 'Profil bulunamadı'}), 404
+        
+        return jsonify({'success': True, 'profile': profile})
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Profil hatası: {str(e)}'}), 500
+
+
+@app.route('/api/admin/memory', methods=['GET'])
+def memory_report():
+    """En çok bellek tutan veri setleri ve (tracemalloc açıksa) ayırma noktaları"""
+    try:
+        # Token kontrolü
+        token = request.headers.get('Authorization', '').replace('Bearer ', '')
+        user_email = None
+        
+        for email, user_data in users_db.items():
+            if user_data['token'] == token:
+                user_email = email
+                break
+        
+        if not user_email:
+            return jsonify({'success': False, 'message': 'Yetkisiz erişim'}), 401
+        
+        if user_email not in ADMIN_EMAILS:
+            return jsonify({'success': False, 'message': 'Bu işlem için yönetici yetkisi gerekli'}), 403
+        
+        limit = max(1, min(request.args.get('limit', 20, type=int), 200))
+        datasets = memory_ledger.largest_datasets(user_files, limit)
+        
+        result = {
+            'success': True,
+            'process': memory_ledger.process_info(),
+            'dataset_count': sum(len(files) for files in user_files.values()),
+            'datasets': datasets,
+            'recent_requests': sorted(memory_ledger.recent, key=lambda entry: entry['peak_bytes'] or 0,
+                                      reverse=True)[:limit],
+        }
+        
+        # Ayırma noktaları; compare=1 ile önceki çağrıdan bu yana artış (sızıntı takibi)
+        if request.args.get('allocations') == '1':
+            result['allocations'] = memory_ledger.allocation_sites(limit, request.args.get('compare') == '1')
+        
+        return jsonify(result)
+        
+    except Exception as e:
+        return jsonify({'success': False, 'message': f'Bellek raporu hatası: {str(e)}'}), 500
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Aşama süreleri ve sayaçlar (Prometheus metin biçimi)"""
+    if METRICS_TOKEN:
+        # Token verilmişse adresten bağımsız olarak token istenir
+        token = request.headers.get('Authorization', '').replace('Bearer ', '')
+        if not hmac.compare_digest(token, METRICS_TOKEN):
+            return jsonify({'success': False, 'message': 'Yetkisiz erişim'}), 403
+    elif not METRICS_PUBLIC and request.remote_addr not in LOCAL_ADDRESSES:
+        return jsonify({'success': False, 'message': 'Yetkisiz erişim'}), 403
+    
+    return Response(metrics.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+mark_app_ready()
+
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,342 @@
+"""
+Anomaly Detection Module
+Tüm ürünler için günlük talep anomalileri (ani artış, düşüş, stok tükenmesi)
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+
+
+# Matrise alınan en fazla gün (son günler); daha eski geçmiş taranmaz
+MAX_DAYS = 730
+
+# Ürün × gün hücre bütçesi; tespit matrisin birkaç float64 kopyasını
+# tuttuğundan çok ürünlü veri setlerinde gün sayısı buna göre kısaltılır
+MAX_CELLS = 10_000_000
+
+
+class DemandMatrix:
+    """
+    Ürün × gün miktar matrisi
+
+    Satırı olmayan günler 0 kabul edilir (satış yok / stok tükenmesi).
+    Matris yoğundur; boyutu sınırlamak için yalnızca son günler alınır
+    (MAX_DAYS ve MAX_CELLS).
+    """
+
+    def __init__(self, products: np.ndarray, start_day: np.datetime64, values: np.ndarray):
+        self.products = products
+        self.start_day = start_day
+        self.values = values
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, product_col: str, date_col: str, quantity_col: str,
+              max_days: int = MAX_DAYS, max_cells: int = MAX_CELLS) -> 'DemandMatrix':
+        """
+        Satırlardan matrisi tek geçişte oluştur
+
+        Gün aralığı max_days'i veya ürün × gün max_cells'i aşarsa yalnızca
+        son günler alınır; daha eski satırlar matrise girmez.
+
+        Args:
+            df: Satır bazlı veri (aynı ürün-gün için birden fazla satır olabilir)
+            product_col: Ürün sütunu
+            date_col: Tarih sütunu
+            quantity_col: Miktar sütunu
+            max_days: En fazla gün sayısı
+            max_cells: En fazla ürün × gün hücre sayısı
+
+        Returns:
+            DemandMatrix
+        """
+        days = pd.to_datetime(df[date_col], errors='coerce').to_numpy(dtype='datetime64[D]')
+        quantity = pd.to_numeric(df[quantity_col], errors='coerce').to_numpy(dtype=np.float64)
+        valid = ~np.isnat(days) & ~np.isnan(quantity)
+
+        if valid.any():
+            # Ürün sayısı kesimden önce bilinmediğinden bütçe tüm ürünlerle hesaplanır
+            last_day = days[valid].max()
+            n_products = max(int(pd.unique(df[product_col].to_numpy()[valid]).size), 1)
+            span = min(max_days, max(max_cells // n_products, 1))
+            valid &= days > last_day - span
+
+        try:
+            product_codes, products = pd.factorize(df[product_col].to_numpy()[valid], sort=True)
+        except TypeError:
+            # Karışık tipli ürün değerleri sıralanamaz
+            product_codes, products = pd.factorize(df[product_col].to_numpy()[valid], sort=False)
+        days = days[valid]
+        if len(days) == 0:
+            return cls(np.array([], dtype=object), np.datetime64('NaT', 'D'), np.zeros((0, 0), dtype=np.float32))
+
+        start_day = days.min()
+        day_codes = (days - start_day).astype(np.int64)
+        n_days = int(day_codes.max()) + 1
+
+        # Ürün ve gün kodları tek bir hücre koduna birleştirilip toplanır
+        cell = product_codes.astype(np.int64) * n_days + day_codes
+        flat = np.bincount(cell, weights=quantity[valid], minlength=len(products) * n_days)
+        values = flat.reshape(len(products), n_days).astype(np.float32)
+
+        return cls(np.asarray(products, dtype=object), start_day, values)
+
+    @property
+    def days(self) -> np.ndarray:
+        """Matris sütunlarının tarihleri"""
+        return self.start_day + np.arange(self.values.shape[1])
+
+
+class AnomalyResult:
+    """
+    Anomali indeksi
+
+    Yalnızca anomali hücreleri (ürün, gün, skor) saklanır; ürün ve gün
+    bazında sayılar bu seyrek listeden türetilir.
+    """
+
+    KINDS = ['spike', 'drop', 'stockout']
+
+    def __init__(self, matrix: DemandMatrix, product_idx: np.ndarray, day_idx: np.ndarray,
+                 scores: np.ndarray, values: np.ndarray, expected: np.ndarray,
+                 threshold: float, window: int):
+        self.products = matrix.products
+        self.start_day = matrix.start_day
+        self.n_days = matrix.values.shape[1]
+        self.product_idx = product_idx
+        self.day_idx = day_idx
+        self.scores = scores
+        self.values = values
+        self.expected = expected
+        self.threshold = threshold
+        self.window = window
+
+        kinds = np.where(scores > 0, 0, np.where(values == 0, 2, 1))
+        self.kinds = kinds.astype(np.int8)
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def _record(self, pos: int) -> Dict[str, Any]:
+        """Tek anomali kaydı"""
+        product = self.products[self.product_idx[pos]]
+        return {
+            'product': product.item() if hasattr(product, 'item') else product,
+            'date': str(self.start_day + self.day_idx[pos]),
+            'quantity': float(self.values[pos]),
+            'expected': round(float(self.expected[pos]), 2),
+            'score': round(float(self.scores[pos]), 2),
+            'type': self.KINDS[self.kinds[pos]],
+        }
+
+    def query(self, product: Optional[str] = None, kind: Optional[str] = None,
+              limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Anomaliler (en yüksek mutlak skor önce)
+
+        Args:
+            product: Yalnızca bu ürün
+            kind: spike, drop veya stockout
+            limit: En fazla kayıt sayısı
+        """
+        mask = np.ones(len(self.scores), dtype=bool)
+        if product is not None:
+            matches = np.flatnonzero(self.products.astype(str) == str(product))
+            mask &= np.isin(self.product_idx, matches)
+        if kind is not None:
+            if kind not in self.KINDS:
+                raise ValueError(f"Geçersiz anomali tipi: {kind}")
+            mask &= self.kinds == self.KINDS.index(kind)
+
+        positions = np.flatnonzero(mask)
+        positions = positions[np.argsort(-np.abs(self.scores[positions]), kind='stable')]
+        return [self._record(pos) for pos in positions[:limit]]
+
+    def by_day(self) -> List[Dict[str, Any]]:
+        """Gün başına anomalili ürün sayısı (yalnızca anomali olan günler)"""
+        counts = np.bincount(self.day_idx, minlength=self.n_days)
+        days = np.flatnonzero(counts)
+        return [{'date': str(self.start_day + day), 'count': int(counts[day])} for day in days]
+
+    def by_product(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """En çok anomalisi olan ürünler"""
+        counts = np.bincount(self.product_idx, minlength=len(self.products))
+        order = np.argsort(-counts, kind='stable')
+        order = order[counts[order] > 0][:limit]
+        return [
+            {
+                'product': self.products[i].item() if hasattr(self.products[i], 'item') else self.products[i],
+                'count': int(counts[i]),
+            }
+            for i in order
+        ]
+
+    def summary(self, top: int = 10) -> Dict[str, Any]:
+        """Dashboard için kısa özet"""
+        return {
+            'total': len(self),
+            'by_type': {kind: int((self.kinds == i).sum()) for i, kind in enumerate(self.KINDS)},
+            'products_affected': int(len(np.unique(self.product_idx))),
+            'threshold': self.threshold,
+            'window': self.window,
+            'start_date': str(self.start_day) if self.n_days else None,
+            'days': int(self.n_days),
+            'top': self.query(limit=top),
+        }
+
+    def row_mask(self, products: pd.Series, dates: pd.Series, kinds: List[str] = ('spike',)) -> np.ndarray:
+        """
+        Anomali hücrelerine düşen satırların maskesi
+
+        Tahmin öncesi aykırı günleri eğitimden çıkarmak için kullanılır.
+
+        Args:
+            products: Satır başına ürün
+            dates: Satır başına tarih
+            kinds: Maskelenecek anomali tipleri
+
+        Returns:
+            True = anomali hücresindeki satır
+        """
+        wanted = np.isin(self.kinds, [self.KINDS.index(k) for k in kinds])
+        if not wanted.any():
+            return np.zeros(len(products), dtype=bool)
+
+        flagged = self.product_idx[wanted].astype(np.int64) * self.n_days + self.day_idx[wanted]
+
+        product_lookup = pd.Index(self.products)
+        product_codes = product_lookup.get_indexer(products.to_numpy())
+        days = pd.to_datetime(dates, errors='coerce').to_numpy(dtype='datetime64[D]')
+        day_codes = (days - self.start_day).astype(np.int64)
+
+        valid = (product_codes >= 0) & ~np.isnat(days) & (day_codes >= 0) & (day_codes < self.n_days)
+        cells = np.where(valid, product_codes.astype(np.int64) * self.n_days + day_codes, -1)
+        return valid & np.isin(cells, flagged)
+
+
+def _rolling_mean_std(values: np.ndarray, window: int) -> tuple:
+    """
+    Her gün için önceki `window` günün ortalaması ve standart sapması
+
+    Kümülatif toplamlarla tüm ürünler için O(ürün × gün) sürede hesaplanır.
+
+    Returns:
+        (ortalama, std) — her biri (ürün, gün - window) boyutunda
+    """
+    n_products, n_days = values.shape
+    sums = np.zeros((n_products, n_days + 1))
+    squares = np.zeros((n_products, n_days + 1))
+    np.cumsum(values, axis=1, out=sums[:, 1:])
+    np.cumsum(values * values, axis=1, out=squares[:, 1:])
+
+    # Gün t için pencere [t - window, t - 1]
+    window_sum = sums[:, window:n_days] - sums[:, :n_days - window]
+    window_squares = squares[:, window:n_days] - squares[:, :n_days - window]
+    mean = window_sum / window
+    std = np.sqrt(np.maximum(window_squares / window - mean * mean, 0.0))
+    return mean, std
+
+
+def _weekday_factors(values: np.ndarray, weekday: np.ndarray) -> np.ndarray:
+    """
+    Ürün başına haftanın günü çarpanları (ortalama = 1)
+
+    Returns:
+        (ürün, 7) boyutunda çarpanlar
+    """
+    sums = np.stack([values[:, weekday == d].sum(axis=1) for d in range(7)], axis=1)
+    counts = np.bincount(weekday, minlength=7).astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        means = sums / np.maximum(counts, 1)
+        overall = means.mean(axis=1, keepdims=True)
+        factors = np.where((overall > 0) & (means > 0), means / overall, 1.0)
+    return factors
+
+
+def detect_anomalies(matrix: DemandMatrix, window: int = 28, threshold: float = 4.0,
+                     clip: float = 3.0, min_scale: float = 1.0, min_activity: float = 0.5) -> AnomalyResult:
+    """
+    Tüm ürünler için sağlam (robust) kayan z-skorları
+
+    1. Miktarlar ürünün haftanın günü çarpanına bölünür (mevsimsel arındırma).
+    2. Önceki `window` günün ortalama/std'si hesaplanır; değerler bu bandın
+       `clip` std dışına taşmayacak şekilde kırpılır (aykırı günler tabanı bozmaz).
+    3. Kırpılmış seri üzerinden taban yeniden hesaplanır; z = (değer - taban) / std.
+
+    |z| >= threshold olan günler anomali sayılır. İlk `window` gün geçmiş
+    olmadığı için skorlanmaz. Penceredeki satışlı gün oranı `min_activity`
+    altındaysa (aralıklı talep) gün skorlanmaz; bu ürünlerde her satış
+    ani artış gibi görünürdü.
+
+    Args:
+        matrix: Ürün × gün matrisi
+        window: Kayan pencere uzunluğu (gün)
+        threshold: Anomali eşiği
+        clip: Kırpma bandı (std cinsinden)
+        min_scale: En küçük ölçek (seyrek satılan ürünlerde sıfıra bölmeyi önler)
+        min_activity: Skorlama için penceredeki en az satışlı gün oranı
+
+    Returns:
+        AnomalyResult
+    """
+    values = matrix.values.astype(np.float64)
+    n_products, n_days = values.shape
+
+    if n_days <= window or n_products == 0:
+        empty = np.array([], dtype=np.int64)
+        return AnomalyResult(matrix, empty, empty, np.array([]), np.array([]), np.array([]), threshold, window)
+
+    # 1970-01-01 Perşembe: (gün + 3) % 7 -> Pazartesi = 0
+    weekday = (matrix.start_day.astype(np.int64) + np.arange(n_days) + 3) % 7
+    factors = _weekday_factors(values, weekday)[:, weekday]
+    adjusted = values / factors
+
+    # Aykırı değerleri yerel banda kırp ve tabanı yeniden hesapla
+    mean, std = _rolling_mean_std(adjusted, window)
+    band = clip * np.maximum(std, min_scale)
+    clipped = adjusted.copy()
+    clipped[:, window:] = np.clip(adjusted[:, window:], mean - band, mean + band)
+    mean, std = _rolling_mean_std(clipped, window)
+
+    observed = adjusted[:, window:]
+    scores = (observed - mean) / np.maximum(std, min_scale)
+
+    activity, _ = _rolling_mean_std((values > 0).astype(np.float64), window)
+    scores[activity < min_activity] = 0.0
+
+    product_idx, day_offset = np.nonzero(np.abs(scores) >= threshold)
+    day_idx = day_offset + window
+
+    return AnomalyResult(
+        matrix,
+        product_idx,
+        day_idx,
+        scores[product_idx, day_offset],
+        matrix.values[product_idx, day_idx],
+        (mean * factors[:, window:])[product_idx, day_offset],
+        threshold,
+        window,
+    )
+
+
+def detect_dataset_anomalies(df: pd.DataFrame, di, **kwargs) -> Optional[AnomalyResult]:
+    """
+    Hazırlanmış veri setinde anomali tespiti
+
+    Args:
+        df: prepare_dataframe çıktısı (veya ürün × gün tablosu)
+        di: Sütunları algılamış DataIntelligence
+        **kwargs: detect_anomalies parametreleri
+
+    Returns:
+        AnomalyResult veya ürün/tarih/miktar sütunları yoksa None
+    """
+    product_col = di.get_column('product')
+    date_col = di.get_column('date')
+    quantity_col = di.get_column('quantity')
+
+    if not all([product_col, date_col, quantity_col]):
+        return None
+
+    matrix = DemandMatrix.build(df, product_col, date_col, quantity_col)
+    return detect_anomalies(matrix, **kwargs)
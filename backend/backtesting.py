@@ -0,0 +1,255 @@
+"""
+Backtesting Module
+Kayan başlangıçlı (rolling-origin) tahmin doğruluğu ölçümü
+
+Özellik tablosu bir kez hazırlanır ve ürünlere bölünür; her ürün için
+birden fazla kesim tarihinde model yalnızca kesimden önceki verilerle
+eğitilip sonraki dönemde sınanır. Ürün grupları çekirdeklere dağıtılır.
+"""
+
+import os
+import time
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.metrics import mean_squared_error
+from sklearn.preprocessing import StandardScaler
+from typing import Any, Dict, List, Optional
+
+from .metrics import timed_stage
+from .prediction_engine import FEATURE_COLUMNS, forecast_errors, make_models
+from .progress import report_progress
+
+
+DEFAULT_FOLDS = 3
+DEFAULT_HORIZON_DAYS = 30
+
+# Paralel iş sayısı; istek başına süreç havuzu açıldığından sınırlı tutulur
+BACKTEST_JOBS = int(os.environ.get('HISMARKETING_BACKTEST_JOBS', str(min(4, os.cpu_count() or 1))))
+
+# HTTP isteğinde varsayılan ve en fazla ürün sayısı (Gunicorn timeout'u içinde kalmak için)
+DEFAULT_TOP_N = 15
+MAX_TOP_N = 200
+
+# Bir işe verilen ürün sayısı (süreçler arası aktarım yükünü azaltır)
+PRODUCTS_PER_TASK = 8
+
+# train_model ile aynı eşikler: az veride ortalama, 30 satırdan fazlasında
+# son %20 model seçimi için ayrılır
+MIN_TRAIN_ROWS = 10
+VALIDATION_MIN_ROWS = 30
+VALIDATION_SHARE = 0.2
+
+# average: eğitim ortalaması (taban çizgisi); selected: train_model'in seçtiği model
+MODEL_TIERS = ['average', 'random_forest', 'gradient_boosting', 'selected']
+
+
+def _fit_fold(X_train: np.ndarray, y_train: np.ndarray, X_test: np.ndarray) -> Dict[str, Any]:
+    """
+    Tek kesim için tüm katmanların tahminleri
+
+    Modeller train_model'deki gibi eğitilir: eğitim penceresinin son %20'si
+    doğrulama için ayrılır ve RMSE'si en düşük model 'selected' olur.
+    """
+    mean = float(np.mean(y_train))
+    predictions = {'average': np.full(len(X_test), mean)}
+    if len(X_train) < MIN_TRAIN_ROWS:
+        predictions['selected'] = predictions['average']
+        return {'predictions': predictions, 'selected': 'average', 'fitted': 0}
+
+    if len(X_train) > VALIDATION_MIN_ROWS:
+        split = int(round(len(X_train) * (1 - VALIDATION_SHARE)))
+        X_fit, y_fit, X_val, y_val = X_train[:split], y_train[:split], X_train[split:], y_train[split:]
+    else:
+        X_fit, y_fit, X_val, y_val = X_train, y_train, X_train, y_train
+
+    scaler = StandardScaler()
+    X_fit_scaled = scaler.fit_transform(X_fit)
+    X_val_scaled = scaler.transform(X_val)
+    X_test_scaled = scaler.transform(X_test)
+
+    models = make_models()
+    selected, best_score = None, float('inf')
+    for tier, model in models.items():
+        model.fit(X_fit_scaled, y_fit)
+        rmse = np.sqrt(mean_squared_error(y_val, np.maximum(model.predict(X_val_scaled), 0)))
+        predictions[tier] = np.maximum(model.predict(X_test_scaled), 0)
+        if rmse < best_score:
+            selected, best_score = tier, rmse
+
+    predictions['selected'] = predictions[selected]
+    return {'predictions': predictions, 'selected': selected, 'fitted': len(models)}
+
+
+def _backtest_batch(batch: List[tuple], cutoffs: np.ndarray, horizon_days: int) -> List[Dict[str, Any]]:
+    """
+    Ürün grubunu tüm kesimlerde sına (işçi süreçte çalışır)
+
+    Args:
+        batch: (ürün, gün dizisi, X, y) listesi; satırlar tarihe göre sıralı
+        cutoffs: Kesim günleri (epoch günü)
+        horizon_days: Kesimden sonra sınanan gün sayısı
+
+    Returns:
+        Ürün başına sonuç
+    """
+    results = []
+    for product, days, X, y in batch:
+        started = time.process_time()
+        actuals = []
+        predicted = {tier: [] for tier in MODEL_TIERS}
+        selected_counts = {}
+        folds = fitted = 0
+
+        for cutoff in cutoffs:
+            train = days <= cutoff
+            test = (days > cutoff) & (days <= cutoff + horizon_days)
+            if not train.any() or not test.any():
+                continue
+
+            fold = _fit_fold(X[train], y[train], X[test])
+            actuals.append(y[test])
+            for tier in MODEL_TIERS:
+                # Az veride yalnızca ortalama vardır; model katmanları ona düşer
+                predicted[tier].append(fold['predictions'].get(tier, fold['predictions']['average']))
+            selected_counts[fold['selected']] = selected_counts.get(fold['selected'], 0) + 1
+            fitted += fold['fitted']
+            folds += 1
+
+        result = {'product': product, 'folds': folds, 'train_rows': int(len(y)), 'test_rows': 0,
+                  'tiers': {}, 'totals': {}, 'selected': selected_counts, 'models_fitted': fitted}
+        if folds:
+            actual = np.concatenate(actuals)
+            result['test_rows'] = int(len(actual))
+            positive = actual > 0
+            for tier in MODEL_TIERS:
+                forecast = np.concatenate(predicted[tier])
+                error = forecast - actual
+                result['tiers'][tier] = forecast_errors(actual, forecast)
+                # Havuzlanmış katman ölçüleri için toplamlar
+                result['totals'][tier] = (
+                    float(np.abs(error).sum()), float(error.sum()), float(actual.sum()),
+                    float((np.abs(error[positive]) / actual[positive]).sum()), int(positive.sum()),
+                )
+        result['compute_seconds'] = time.process_time() - started
+        results.append(result)
+    return results
+
+
+def _partition(df_features: pd.DataFrame, feature_cols: List[str], products: Optional[List] = None) -> List[tuple]:
+    """Özellik tablosunu ürünlere böl: (ürün, gün, X, y); satırlar tarihe göre sıralı"""
+    # Tarihi okunamayan satırlar hiçbir kesime yerleştirilemez
+    df_features = df_features[df_features['date'].notna()].sort_values('date', kind='stable')
+    codes, uniques = pd.factorize(df_features['product'])
+    X = df_features[feature_cols].to_numpy(dtype=float)
+    y = df_features['quantity'].to_numpy(dtype=float)
+    days = df_features['date'].to_numpy().astype('datetime64[D]').astype(np.int64)
+
+    # Kararlı sıralama ürün içinde tarih sırasını korur
+    order = np.argsort(codes, kind='stable')
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(codes[codes >= 0], minlength=len(uniques)))])
+    order = order[codes[order] >= 0]
+
+    positions = {product: i for i, product in enumerate(uniques)}
+    selected = uniques if products is None else [p for p in products if p in positions]
+    partitions = []
+    for product in selected:
+        index = order[bounds[positions[product]]:bounds[positions[product] + 1]]
+        partitions.append((product, days[index], X[index], y[index]))
+    return partitions
+
+
+def _round(errors: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: (round(value, 4) if isinstance(value, float) else value) for key, value in errors.items()}
+
+
+@timed_stage('backtest')
+def rolling_origin_backtest(df_features: pd.DataFrame, feature_cols: List[str] = None,
+                            folds: int = DEFAULT_FOLDS, horizon_days: int = DEFAULT_HORIZON_DAYS,
+                            products: List = None, n_jobs: int = None, progress=None) -> Dict[str, Any]:
+    """
+    Kayan başlangıçlı geriye dönük test
+
+    Kesimler son tarihten geriye horizon_days aralıklarla seçilir; her
+    kesimde eğitim yalnızca kesime kadarki satırları, sınama sonraki
+    horizon_days günü kullanır. Gecikme ve hareketli ortalama özellikleri
+    yalnızca önceki günlerin gerçekleşen değerlerinden geldiği için ölçüm,
+    train_model'in test payı gibi bir adım sonrası doğruluğudur.
+
+    Args:
+        df_features: prepare_features çıktısı ('product', 'date', 'quantity' ile)
+        feature_cols: Özellik sütunları (varsayılan FEATURE_COLUMNS)
+        folds: Kesim sayısı
+        horizon_days: Kesim başına sınama penceresi (gün)
+        products: Sınanacak ürünler (None ise hepsi)
+        n_jobs: Paralel iş sayısı (varsayılan HISMARKETING_BACKTEST_JOBS)
+        progress: ProgressJob (opsiyonel)
+
+    Returns:
+        Ürün ve model katmanı bazında WAPE, MAPE, sapma ve hesaplama süresi
+    """
+    started = time.perf_counter()
+    feature_cols = feature_cols or FEATURE_COLUMNS
+    n_jobs = BACKTEST_JOBS if n_jobs is None else n_jobs
+
+    partitions = _partition(df_features, feature_cols, products)
+    last_day = df_features['date'].max().to_datetime64().astype('datetime64[D]').astype(np.int64)
+    cutoffs = last_day - horizon_days * np.arange(folds, 0, -1)
+
+    batches = [partitions[i:i + PRODUCTS_PER_TASK] for i in range(0, len(partitions), PRODUCTS_PER_TASK)]
+    report_progress(progress, 'backtest', 'Geriye dönük test başladı', current=0, total=len(partitions))
+
+    product_results = []
+    if batches:
+        tasks = Parallel(n_jobs=n_jobs, return_as='generator')(
+            delayed(_backtest_batch)(batch, cutoffs, horizon_days) for batch in batches
+        )
+        for batch_results in tasks:
+            product_results.extend(batch_results)
+            report_progress(progress, 'backtest', 'Ürünler sınanıyor',
+                            current=len(product_results), total=len(partitions))
+
+    # Katman ölçüleri tüm ürünlerin hataları havuzlanarak (satış ağırlıklı) hesaplanır
+    tiers = {}
+    for tier in MODEL_TIERS:
+        totals = [result['totals'][tier] for result in product_results if tier in result['totals']]
+        abs_error, error, actual, ape, positives = np.array(totals).reshape(-1, 5).sum(axis=0)
+        tiers[tier] = _round({
+            'wape': float(abs_error / actual) if actual > 0 else None,
+            'mape': float(ape / positives) if positives > 0 else None,
+            'bias': float(error / actual) if actual > 0 else None,
+            'products': len(totals),
+        })
+
+    selected_counts = {}
+    for result in product_results:
+        for tier, count in result['selected'].items():
+            selected_counts[tier] = selected_counts.get(tier, 0) + count
+
+    products_out = []
+    for result in product_results:
+        products_out.append({
+            'product': result['product'],
+            'folds': result['folds'],
+            'train_rows': result['train_rows'],
+            'test_rows': result['test_rows'],
+            'tiers': {tier: _round(errors) for tier, errors in result['tiers'].items()},
+            'selected': result['selected'],
+            'compute_seconds': round(result['compute_seconds'], 4),
+        })
+
+    return {
+        'folds': folds,
+        'horizon_days': horizon_days,
+        'cutoffs': [str(np.datetime64(int(day), 'D')) for day in cutoffs],
+        'tiers': tiers,
+        'selected_counts': selected_counts,
+        'products': products_out,
+        'compute': {
+            'wall_seconds': round(time.perf_counter() - started, 3),
+            'cpu_seconds': round(sum(result['compute_seconds'] for result in product_results), 3),
+            'n_jobs': n_jobs,
+            'tasks': len(batches),
+            'models_fitted': sum(result['models_fitted'] for result in product_results),
+        },
+    }
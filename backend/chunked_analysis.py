@@ -0,0 +1,171 @@
+"""
+Chunked Analysis Module
+Bellekten büyük dosyalar için parça parça (out-of-core) analiz
+"""
+
+import os
+import pandas as pd
+from typing import Any, Dict, List, Optional, Tuple
+
+from .data_intelligence import DataIntelligence, infer_date_format
+from .progress import report_progress
+from .sales_cube import SalesCube
+from .utils import iter_data_chunks
+
+
+# Bu boyuttan büyük CSV dosyaları parça parça işlenir
+CHUNKED_THRESHOLD_BYTES = int(os.environ.get('HISMARKETING_CHUNKED_MB', '100')) * 1024 * 1024
+
+# Parça başına satır sayısı
+CHUNK_ROWS = int(os.environ.get('HISMARKETING_CHUNK_ROWS', '200000'))
+
+# Bu kadar parça küpü biriktiğinde tek küpte birleştirilir
+FOLD_EVERY = 16
+
+
+def should_process_in_chunks(filepath: str) -> bool:
+    """Dosya parça parça işlenmeli mi? (büyük CSV dosyaları)"""
+    ext = filepath.rsplit('.', 1)[1].lower()
+    return ext == 'csv' and os.path.getsize(filepath) >= CHUNKED_THRESHOLD_BYTES
+
+
+def daily_product_sales(df: pd.DataFrame, di: DataIntelligence) -> Optional[pd.DataFrame]:
+    """
+    Ürün × gün bazında satış miktarı toplamları
+
+    Tahmin motoru ham satırlar yerine bu tabloyla çalışabilir; sütun adları
+    veri setindeki ürün, tarih ve miktar sütunlarıyla aynıdır.
+
+    Args:
+        df: prepare_dataframe çıktısı
+        di: Sütunları algılamış DataIntelligence
+
+    Returns:
+        (ürün, tarih, miktar) DataFrame'i veya gerekli sütunlar yoksa None
+    """
+    product_col = di.get_column('product')
+    date_col = di.get_column('date')
+    quantity_col = di.get_column('quantity')
+
+    if not all([product_col, date_col, quantity_col]):
+        return None
+
+    days = pd.to_datetime(df[date_col], errors='coerce').dt.normalize()
+    daily = pd.DataFrame({
+        product_col: df[product_col].to_numpy(),
+        date_col: days.to_numpy(),
+        quantity_col: pd.to_numeric(df[quantity_col], errors='coerce').to_numpy(),
+    })
+    return daily.groupby([product_col, date_col], sort=False, as_index=False)[quantity_col].sum()
+
+
+def merge_daily_sales(frames: List[pd.DataFrame]) -> pd.DataFrame:
+    """Ürün × gün tablolarını birleştir (aynı gün tekrar toplanır)"""
+    frames = [frame for frame in frames if frame is not None]
+    if len(frames) == 1:
+        return frames[0]
+    merged = pd.concat(frames, ignore_index=True)
+    product_col, date_col, quantity_col = merged.columns
+    return merged.groupby([product_col, date_col], sort=False, as_index=False)[quantity_col].sum()
+
+
+class ChunkedAnalysis:
+    """
+    Hazırlanmış veri parçalarını birleştirilebilir ara toplamlara katlar
+
+    Her parça için bir satış küpü (ürün × ay × boyut toplamları ve satır
+    sayıları) ve ürün × gün miktar tablosu üretilir. Ara sonuçlar belirli
+    aralıklarla birleştirildiğinden bellek kullanımı satır sayısına değil
+    küp hücresi ve ürün-gün sayısına bağlıdır.
+    """
+
+    def __init__(self, di: DataIntelligence):
+        self.di = di
+        self.rows = 0
+        self.missing_values: Dict[str, int] = {}
+        self._cubes: List[SalesCube] = []
+        self._daily: List[pd.DataFrame] = []
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        Ham bir parçayı hazırla ve ara toplamlara ekle
+
+        Eksik sayısal değerler medyanla doldurulmaz (tüm dosyanın medyanı
+        parça parça bilinemez); toplamlarda eksikler atlanır.
+        """
+        self.rows += len(chunk)
+        for col, count in chunk.isnull().sum().items():
+            self.missing_values[col] = self.missing_values.get(col, 0) + int(count)
+
+        prepared = self.di.prepare_dataframe(chunk, fill_missing=False)
+        self._cubes.append(SalesCube.build(prepared, self.di))
+        self._daily.append(daily_product_sales(prepared, self.di))
+
+        if len(self._cubes) >= FOLD_EVERY:
+            self._fold()
+
+    def _fold(self) -> None:
+        """Biriken ara sonuçları tek küp ve tek tabloda birleştir"""
+        if len(self._cubes) > 1:
+            self._cubes = [SalesCube.combine(self._cubes)]
+        if self._daily[0] is not None and len(self._daily) > 1:
+            self._daily = [merge_daily_sales(self._daily)]
+
+    def result(self) -> Tuple[SalesCube, Optional[pd.DataFrame]]:
+        """
+        Returns:
+            (satış küpü, ürün × gün miktar tablosu)
+        """
+        self._fold()
+        return self._cubes[0], self._daily[0]
+
+
+def analyze_in_chunks(filepath: str, chunksize: int = None,
+                      progress=None) -> Tuple[DataIntelligence, Dict[str, Any], SalesCube, Optional[pd.DataFrame]]:
+    """
+    Dosyayı tamamen belleğe almadan analiz et
+
+    Sütun eşleştirmesi ilk parçadan yapılır; tarih biçimi de ilk parçadan
+    belirlenip tüm parçalara aynı şekilde uygulanır.
+
+    Args:
+        filepath: CSV dosya yolu
+        chunksize: Parça başına satır sayısı (None ise CHUNK_ROWS)
+        progress: ProgressJob (opsiyonel)
+
+    Returns:
+        (DataIntelligence, dosya bilgisi, satış küpü, ürün × gün tablosu)
+    """
+    di = DataIntelligence()
+    file_info = None
+    analysis = None
+    date_format = None
+
+    for chunk in iter_data_chunks(filepath, chunksize=chunksize or CHUNK_ROWS):
+        if file_info is None:
+            file_info = di.analyze_file(chunk)
+            # Örnek parça bellekte tutulmasın
+            di.df = None
+            analysis = ChunkedAnalysis(di)
+
+            date_col = di.get_column('date')
+            if date_col:
+                date_format = infer_date_format(chunk[date_col])
+
+        date_col = di.get_column('date')
+        if date_format and date_col in chunk.columns:
+            chunk = chunk.copy()
+            chunk[date_col] = pd.to_datetime(chunk[date_col], format=date_format, errors='coerce')
+
+        analysis.update(chunk)
+        report_progress(progress, 'read', 'Dosya parça parça işleniyor', rows=analysis.rows)
+
+    if analysis is None:
+        raise ValueError("Dosya boş")
+
+    cube, daily = analysis.result()
+    file_info['row_count'] = analysis.rows
+    file_info['missing_values'] = analysis.missing_values
+    file_info['chunked'] = True
+
+    return di, file_info, cube, daily
@@ -0,0 +1,180 @@
+"""
+Comparison Module
+Birden fazla veri setinin ürün × dönem bazında karşılaştırılması
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+
+from .sales_cube import SalesCube
+
+
+PERIODS = ['total', 'month', 'quarter']
+MEASURES = ['quantity', 'revenue', 'cost', 'profit']
+
+
+# Dönem başına anahtar sayısı (yıl kayması * PERIODS_PER_YEAR + dönem - 1)
+PERIODS_PER_YEAR = {'month': 12, 'quarter': 4}
+
+
+def _period_keys(month_codes: np.ndarray, period: str, first_year: int) -> np.ndarray:
+    """
+    Ay kodlarını karşılaştırma dönemine çevir
+
+    Anahtar, veri setinin ilk yılına göre yıl kaymasını da içerir; böylece
+    birden fazla yıla yayılan dosyada farklı yılların aynı ayları toplanmaz
+    ve veri setleri kendi ilk yıllarından itibaren sırayla hizalanır.
+    """
+    year_offset = month_codes // 12 - first_year
+    if period == 'month':
+        return year_offset * 12 + month_codes % 12
+    return year_offset * 4 + (month_codes % 12) // 3
+
+
+def _split_key(key: int, period: str) -> Dict[str, int]:
+    """Dönem anahtarını yıl kayması ve dönem numarasına ayır"""
+    year_offset, number = divmod(int(key), PERIODS_PER_YEAR[period])
+    return {'period': number + 1, 'year_offset': year_offset}
+
+
+def product_period_totals(cube: SalesCube, measure: str = 'quantity', period: str = 'total') -> pd.Series:
+    """
+    Küpten ürün × dönem toplamları
+
+    Dönemler veri setinin ilk yılına göre numaralanır (ör. 'month' için ilk
+    yılın ayları 0-11, ikinci yılınkiler 12-23); böylece farklı yılların
+    dosyaları aynı aylar üzerinden hizalanır. Tarihi okunamayan satırlar
+    dönem karşılaştırmasına girmez.
+
+    Args:
+        cube: Veri setinin satış küpü
+        measure: quantity, revenue, cost veya profit
+        period: total, month veya quarter
+
+    Returns:
+        (product, period) indeksli toplam serisi
+    """
+    if 'product' not in cube.keys:
+        raise ValueError("Veri setinde ürün sütunu yok")
+    if period != 'total' and 'month' not in cube.keys:
+        raise ValueError("Veri setinde tarih sütunu yok")
+
+    needed = ['revenue', 'cost'] if measure == 'profit' else [measure]
+    missing = [m for m in needed if m not in cube.measures]
+    if missing:
+        raise ValueError(f"Veri setinde bulunmayan ölçü: {', '.join(missing)}")
+
+    by = ['product'] if period == 'total' else ['product', 'month']
+    rolled = cube.rollup(by)
+    if period != 'total':
+        rolled = rolled[rolled['month'] != SalesCube.UNKNOWN_MONTH]
+    values = rolled['revenue'] - rolled['cost'] if measure == 'profit' else rolled[measure]
+
+    if period == 'total':
+        keys = np.zeros(len(rolled), dtype=np.int64)
+    else:
+        month_codes = rolled['month'].to_numpy()
+        first_year = int(month_codes.min()) // 12 if len(month_codes) else 0
+        keys = _period_keys(month_codes, period, first_year)
+
+    frame = pd.DataFrame({'product': rolled['product'].to_numpy(), 'period': keys, 'value': values.to_numpy()})
+    return frame.groupby(['product', 'period'], sort=False)['value'].sum()
+
+
+def _growth(delta: np.ndarray, base: float) -> List[Optional[float]]:
+    """Büyüme oranı (%); taban sıfırsa None"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        growth = np.where(base != 0, delta / np.abs(base) * 100, np.nan)
+    return [None if np.isnan(g) else round(float(g), 2) for g in growth]
+
+
+def compare_cubes(cubes: List[SalesCube], labels: List[str], measure: str = 'quantity',
+                  period: str = 'total', limit: int = 500) -> Dict[str, Any]:
+    """
+    Veri setlerini ilkine (taban) göre karşılaştır
+
+    Her veri setinin ürün × dönem toplamları küpünden alınır ve ürün ile
+    dönem anahtarı üzerinden dış birleştirme (outer join) ile hizalanır;
+    ham satırlar okunmaz. Değişimler 'diğer − taban' olarak hesaplanır;
+    yeni ürünler tabanda olmayıp diğer veri setinde olanlardır. Bu yüzden
+    taban önceki dönem olmalıdır (örn: 2023, ardından 2024).
+
+    Args:
+        cubes: Satış küpleri (ilki taban, önceki dönem)
+        labels: Veri seti etiketleri
+        measure: quantity, revenue, cost veya profit
+        period: total, month veya quarter
+        limit: En fazla satır sayısı
+
+    Returns:
+        Hizalı satırlar, dönem toplamları, yeni ve kaybedilen ürünler ve
+        veri setlerinin hangi yıllarının eşleştiği (alignment)
+    """
+    if period not in PERIODS:
+        raise ValueError(f"Geçersiz dönem: {period}")
+    if measure not in MEASURES:
+        raise ValueError(f"Geçersiz ölçü: {measure}")
+    if len(cubes) < 2:
+        raise ValueError("Karşılaştırma için en az iki veri seti gerekli")
+
+    series = [product_period_totals(cube, measure, period) for cube in cubes]
+    aligned = pd.concat(series, axis=1, keys=range(len(series)), join='outer', sort=False).fillna(0.0)
+    values = aligned.to_numpy(dtype=float)
+
+    base = values[:, 0]
+    deltas = values[:, 1:] - base[:, None]
+
+    # Taban veri setine göre en büyük mutlak değişim üstte
+    order = np.argsort(-np.abs(deltas).max(axis=1), kind='stable')
+    products = aligned.index.get_level_values('product')
+    periods = aligned.index.get_level_values('period')
+
+    rows = []
+    for pos in order[:limit]:
+        row = {'product': products[pos].item() if hasattr(products[pos], 'item') else products[pos]}
+        if period != 'total':
+            row.update(_split_key(periods[pos], period))
+        row['values'] = [float(v) for v in values[pos]]
+        row['deltas'] = [float(d) for d in deltas[pos]]
+        row['growth'] = _growth(deltas[pos], base[pos])
+        rows.append(row)
+
+    # Dönem toplamları
+    period_frame = pd.DataFrame(values, index=periods).groupby(level=0, sort=True).sum()
+    period_totals = []
+    for key, totals in zip(period_frame.index, period_frame.to_numpy()):
+        entry = _split_key(key, period) if period != 'total' else {}
+        entry['values'] = [float(v) for v in totals]
+        entry['deltas'] = [float(v - totals[0]) for v in totals[1:]]
+        entry['growth'] = _growth(totals[1:] - totals[0], totals[0])
+        period_totals.append(entry)
+
+    # Ürün bazında varlık: hiç satırı olmayan ürün o veri setinde yok sayılır
+    # (taban dışındaki her veri seti için, labels[1:] sırasıyla)
+    present = [set(s.index.get_level_values('product')) for s in series]
+    new_products = [sorted(map(str, products_i - present[0])) for products_i in present[1:]]
+    lost_products = [sorted(map(str, present[0] - products_i)) for products_i in present[1:]]
+
+    # year_offset 0 her veri setinin kendi ilk yılıdır
+    alignment = []
+    for label, cube in zip(labels, cubes):
+        years = []
+        if 'month' in cube.keys:
+            months = cube.cells['month'].to_numpy()
+            years = sorted({int(code) // 12 for code in np.unique(months[months != SalesCube.UNKNOWN_MONTH])})
+        alignment.append({'label': label, 'years': years})
+
+    return {
+        'labels': labels,
+        'base': labels[0],
+        'measure': measure,
+        'period': period,
+        'alignment': alignment,
+        'rows': rows,
+        'total_rows': len(aligned),
+        'truncated': len(aligned) > limit,
+        'period_totals': period_totals,
+        'new_products': new_products,
+        'lost_products': lost_products,
+    }
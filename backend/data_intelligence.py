@@ -5,10 +5,70 @@ Akıllı veri anlama ve sütun algılama modülü
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
 import re
 from difflib import SequenceMatcher
 
+from .metrics import timed_stage
+
+try:
+    from pandas._libs.tslibs.parsing import guess_datetime_format
+except ImportError:
+    guess_datetime_format = None
+
+
+# Tarih biçimi seçilirken denenen örnek değer sayısı
+DATE_SAMPLE_SIZE = 1000
+
+
+def infer_date_format(values: pd.Series) -> Optional[str]:
+    """
+    Metin tarih sütununun biçimini örnekten seç
+
+    Gün-ay sırası belirsiz değerlerde ('01.02.2024') pandas ay önce kabul
+    eder ve 12'den büyük günler okunamaz. Örnek hem gün önce hem ay önce
+    biçimle ayrıştırılır, daha çok değer okuyan seçilir; eşitlikte yıl
+    sonda ise gün önce (Türkçe biçim), yıl başta ise ay önce (ISO) seçilir.
+
+    Args:
+        values: Tarih sütunu
+
+    Returns:
+        strftime biçimi (metin değilse veya biçim tahmin edilemezse None)
+    """
+    if guess_datetime_format is None:
+        return None
+    sample = values.dropna()
+    sample = sample[sample.map(type) == str].head(DATE_SAMPLE_SIZE)
+    if sample.empty:
+        return None
+
+    def preferred(date_format):
+        if '%d' not in date_format or '%m' not in date_format:
+            return False
+        return (date_format.index('%d') < date_format.index('%m')) != date_format.startswith('%Y')
+
+    best_format, best_score = None, (0, False)
+    for dayfirst in (True, False):
+        date_format = guess_datetime_format(sample.iloc[0], dayfirst=dayfirst)
+        if date_format is None or date_format == best_format:
+            continue
+        parsed = int(pd.to_datetime(sample, format=date_format, errors='coerce').notna().sum())
+        score = (parsed, preferred(date_format))
+        if parsed and score > best_score:
+            best_format, best_score = date_format, score
+    return best_format
+
+
+def parse_dates(values: pd.Series, date_format: str = None) -> pd.Series:
+    """Tarih sütununu dönüştür (biçim verilmezse örnekten seçilir)"""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    date_format = date_format or infer_date_format(values)
+    if date_format:
+        return pd.to_datetime(values, format=date_format, errors='coerce')
+    return pd.to_datetime(values, errors='coerce')
+
 
 class DataIntelligence:
     """
@@ -32,6 +92,7 @@ class DataIntelligence:
         self.detected_columns = {}
         self.data_info = {}
         
+    @timed_stage('detect')
     def analyze_file(self, df: pd.DataFrame) -> Dict[str, Any]:
         """
         Dosyayı analiz et ve yapıyı anla
@@ -157,12 +218,16 @@ class DataIntelligence:
         """
         return self.detected_columns.get(column_type)
     
-    def prepare_dataframe(self, df: pd.DataFrame) -> pd.DataFrame:
+    @timed_stage('prepare')
+    def prepare_dataframe(self, df: pd.DataFrame, fill_missing: bool = True) -> pd.DataFrame:
         """
         DataFrame'i analiz için hazırla
         - Tarih sütunlarını dönüştür
         - Eksik değerleri doldur
         - Veri tiplerini düzelt
+        
+        fill_missing=False ise sayısal eksikler NaN bırakılır; parça parça
+        işlemede tüm dosyanın medyanı bilinmediği için bu mod kullanılır.
         """
         df_prepared = df.copy()
         
@@ -170,7 +235,7 @@ class DataIntelligence:
         date_col = self.get_column('date')
         if date_col and date_col in df_prepared.columns:
             try:
-                df_prepared[date_col] = pd.to_datetime(df_prepared[date_col], errors='coerce')
+                df_prepared[date_col] = parse_dates(df_prepared[date_col])
             except:
                 pass
         
@@ -182,7 +247,7 @@ class DataIntelligence:
                 df_prepared[col_name] = pd.to_numeric(df_prepared[col_name], errors='coerce')
                 
                 # Eksik değerleri doldur
-                if df_prepared[col_name].isnull().any():
+                if fill_missing and df_prepared[col_name].isnull().any():
                     # Medyan ile doldur
                     median_val = df_prepared[col_name].median()
                     if pd.notna(median_val):
@@ -199,6 +264,7 @@ class DataIntelligence:
         
         return df_prepared
     
+    @timed_stage('feature')
     def extract_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """
         Ek özellikler çıkar (tarih bazlı, kategori bazlı vb.)
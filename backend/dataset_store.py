@@ -0,0 +1,267 @@
+"""
+Dataset Store Module
+Hazırlanmış veri setlerinin Arrow IPC dosyalarında saklanması
+
+Dosyalar bellek eşlemeli (memory-mapped) açılır; aynı makinedeki tüm
+worker'lar veriyi işletim sisteminin sayfa önbelleği üzerinden tek bir
+fiziksel kopya olarak paylaşır.
+"""
+
+import json
+import os
+import threading
+import pandas as pd
+from typing import Any, Dict, List, Optional
+
+# Opsiyonel: pyarrow kurulu değilse veri setleri süreç belleğinde tutulur
+try:
+    import pyarrow as pa
+    import pyarrow.ipc
+except ImportError:
+    pa = None
+
+
+# Bu kadar ek parçaya ulaşınca parçalar tek dosyada birleştirilir
+MAX_PARTS = int(os.environ.get('HISMARKETING_DATASET_MAX_PARTS', '32'))
+
+
+class DatasetStore:
+    """
+    Arrow IPC veri seti deposu
+
+    Her veri seti bir anahtarla (örn: '<file_id>.features') bir .arrow
+    dosyasına yazılır; sonradan eklenen satırlar '<anahtar>.<n>.arrow' ek
+    parçalarına yazılır ve okumada birleştirilir. Okumada yalnızca istenen
+    sütunlar seçilir; sayısal sütunlar eşlenmiş bellekten kopyalanmadan
+    okunur. Veri setinin sahibi ve sütun eşleştirmesi yanındaki .json
+    dosyasında tutulur; böylece kayıt başka bir worker'da veya yeniden
+    başlatmadan sonra geri yüklenebilir.
+    """
+
+    def __init__(self, root: str = os.path.join('user_data', 'datasets')):
+        self.root = root
+        self._lock = threading.Lock()
+        # Aynı anda tek birleştirme; diğerleri atlanır (parçalar sonrakinde birleşir)
+        self._compact_lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        """pyarrow kurulu mu?"""
+        return pa is not None
+
+    def path(self, key: str) -> str:
+        """Anahtarın dosya yolu"""
+        return os.path.join(self.root, f"{key}.arrow")
+
+    def _parts(self, key: str) -> List[tuple]:
+        """Ek parçalar: (numara, dosya yolu), eklenme sırasıyla"""
+        if not os.path.isdir(self.root):
+            return []
+        prefix = f"{key}."
+        parts = []
+        for name in os.listdir(self.root):
+            number = name[len(prefix):-len('.arrow')]
+            if name.startswith(prefix) and name.endswith('.arrow') and number.isdigit():
+                parts.append((int(number), os.path.join(self.root, name)))
+        return sorted(parts)
+
+    def part_paths(self, key: str) -> List[str]:
+        """Ek parçaların dosya yolları (eklenme sırasıyla)"""
+        return [path for _, path in self._parts(key)]
+
+    def meta_path(self, key: str) -> str:
+        """Anahtarın bilgi dosyası yolu"""
+        return os.path.join(self.root, f"{key}.json")
+
+    def exists(self, key: str) -> bool:
+        """Veri seti kayıtlı mı?"""
+        return os.path.exists(self.path(key))
+
+    def size(self, key: str) -> int:
+        """Veri setinin diskteki boyutu (tüm parçalar, bayt)"""
+        paths = [self.path(key)] + self.part_paths(key)
+        return sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+
+    def _to_table(self, df: pd.DataFrame, schema=None):
+        try:
+            return pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, KeyError) as e:
+            # Örn: aynı sütunda hem sayı hem metin, ya da ek parçada farklı sütunlar
+            raise ValueError(f"Veri seti Arrow'a dönüştürülemedi: {e}")
+
+    def _write_tmp(self, path: str, table) -> str:
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        return tmp_path
+
+    def put(self, key: str, df: pd.DataFrame, meta: Dict[str, Any] = None) -> str:
+        """
+        DataFrame'i Arrow IPC dosyasına yaz (varsa ek parçalar silinir)
+
+        Önce geçici dosyaya yazılıp yerine taşınır; açık eşlemeler eski
+        dosyayı okumaya devam eder.
+
+        Args:
+            key: Veri seti anahtarı
+            df: Kaydedilecek DataFrame
+            meta: Veri setiyle birlikte saklanacak bilgi (JSON'a dönüştürülebilir)
+
+        Returns:
+            Dosya yolu
+
+        Raises:
+            ValueError: Sütun tipleri Arrow'a dönüştürülemezse
+        """
+        if pa is None:
+            raise RuntimeError("Arrow veri deposu için pyarrow gerekli")
+
+        os.makedirs(self.root, exist_ok=True)
+        path = self.path(key)
+        tmp_path = self._write_tmp(path, self._to_table(df))
+
+        meta_tmp_path = self._write_meta_tmp(key, meta) if meta is not None else None
+
+        with self._lock:
+            os.replace(tmp_path, path)
+            for part_path in self.part_paths(key):
+                os.remove(part_path)
+            if meta_tmp_path:
+                os.replace(meta_tmp_path, self.meta_path(key))
+        return path
+
+    def append(self, key: str, df: pd.DataFrame) -> str:
+        """
+        Satırları yeni bir ek parça olarak yaz
+
+        Mevcut parçalar yeniden yazılmaz; satırlar ilk parçanın şemasına
+        dönüştürülür. Ek parça sayısı MAX_PARTS'a ulaşınca parçalar tek
+        dosyada birleştirilir.
+
+        Args:
+            key: Veri seti anahtarı (put ile yazılmış olmalı)
+            df: Eklenecek satırlar
+
+        Returns:
+            Yazılan parçanın dosya yolu
+
+        Raises:
+            ValueError: Satırlar mevcut şemaya dönüştürülemezse
+        """
+        if pa is None:
+            raise RuntimeError("Arrow veri deposu için pyarrow gerekli")
+
+        with pa.memory_map(self.path(key), 'r') as source:
+            schema = pa.ipc.open_file(source).schema
+        table = self._to_table(df[[field.name for field in schema if field.name in df.columns]], schema)
+
+        with self._lock:
+            parts = self._parts(key)
+            number = parts[-1][0] + 1 if parts else 1
+            part_path = os.path.join(self.root, f"{key}.{number}.arrow")
+            os.replace(self._write_tmp(part_path, table), part_path)
+
+        if len(parts) + 1 >= MAX_PARTS and self._compact(key):
+            return self.path(key)
+        return part_path
+
+    def _compact(self, key: str) -> bool:
+        """
+        Ana dosyayı ve o anki ek parçaları tek dosyada birleştir
+
+        Parça listesi kilit altında alınır ve yalnızca bu parçalar silinir;
+        birleştirme sürerken yazılan parçalar korunur ve numaraları büyük
+        olduğundan okuma sırası değişmez.
+
+        Returns:
+            Birleştirme yapıldı mı (başka bir birleştirme sürüyorsa False)
+        """
+        if not self._compact_lock.acquire(blocking=False):
+            return False
+        try:
+            with self._lock:
+                parts = self._parts(key)
+                sources = self._open(key, parts)
+            table = pa.concat_tables([pa.ipc.open_file(source).read_all() for source in sources])
+            path = self.path(key)
+            tmp_path = self._write_tmp(path, table)
+            with self._lock:
+                os.replace(tmp_path, path)
+                for _, part_path in parts:
+                    os.remove(part_path)
+            return True
+        finally:
+            self._compact_lock.release()
+
+    def _open(self, key: str, parts: List[tuple]) -> list:
+        """Ana dosyayı ve verilen parçaları eşle (kilit altında çağrılır)"""
+        # Açık eşleme, dosya sonradan silinse veya değiştirilse de eski içeriği okur
+        return [pa.memory_map(path, 'r') for path in [self.path(key)] + [path for _, path in parts]]
+
+    def _write_meta_tmp(self, key: str, meta: Dict[str, Any]) -> str:
+        tmp_path = f"{self.meta_path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, default=str)
+        return tmp_path
+
+    def update_meta(self, key: str, meta: Dict[str, Any]) -> None:
+        """
+        Veri setinin bilgisini yeniden yaz (veri dosyalarına dokunulmaz)
+
+        Ekleme kaynak dosyanın yolunu veya satır sayısını değiştirdiğinde
+        çağrılır; aksi halde geri yüklenen kayıt eski bilgiyi görür.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self._write_meta_tmp(key, meta)
+        with self._lock:
+            os.replace(tmp_path, self.meta_path(key))
+
+    def get_meta(self, key: str) -> Optional[Dict[str, Any]]:
+        """Veri setinin bilgisi (yoksa veya okunamazsa None)"""
+        try:
+            with open(self.meta_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def get(self, key: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Veri setini (ek parçalarıyla) bellek eşlemeli aç
+
+        Args:
+            key: Veri seti anahtarı
+            columns: Okunacak sütunlar (None ise tümü)
+
+        Returns:
+            DataFrame
+        """
+        if pa is None:
+            raise RuntimeError("Arrow veri deposu için pyarrow gerekli")
+
+        # Dosyalar kilit altında açılır: eşzamanlı put/birleştirme parçaları
+        # silse de okuma tutarlı bir anlık görüntüyü görür
+        with self._lock:
+            sources = self._open(key, self._parts(key))
+
+        # Eşleme, tablonun tamponları yaşadığı sürece açık kalır
+        tables = []
+        for source in sources:
+            table = pa.ipc.open_file(source).read_all()
+            if columns is not None:
+                table = table.select([col for col in columns if col in table.column_names])
+            tables.append(table)
+        # Parçalar kopyalanmadan tek tabloda zincirlenir
+        table = tables[0] if len(tables) == 1 else pa.concat_tables(tables)
+        # split_blocks: sütunlar tek blokta birleştirilmez (gereksiz kopya yok)
+        return table.to_pandas(split_blocks=True)
+
+    def delete(self, key: str) -> None:
+        """Veri setini, ek parçalarını ve bilgi dosyasını sil"""
+        with self._lock:
+            for path in [self.path(key), self.meta_path(key)] + self.part_paths(key):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+dataset_store = DatasetStore()
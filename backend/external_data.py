@@ -4,54 +4,27 @@ Hava durumu, özel günler ve diğer harici veri kaynaklarını yönetir
 """
 
 import requests
+import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Dict, List, Optional
 import json
 
+from .holiday_calendar import calendar_for, get_holiday_calendar
+from .locations import DEFAULT_COMPETITION, location_attributes, resolve_location
+from .metrics import lru_cache_collector, metrics
+from .shelf_life import shelf_life_classifier
+from .weather import WEATHER_COLUMNS, WeatherProvider, get_weather_provider
+
 
 class ExternalDataProvider:
     """
     Harici veri sağlayıcı sınıfı
     """
     
-    # Türkiye'deki özel günler ve tatiller (2024-2025)
-    SPECIAL_DAYS = {
-        '2024-01-01': {'name': 'Yılbaşı', 'type': 'public_holiday', 'impact': 'high'},
-        '2024-04-10': {'name': 'Ramazan Bayramı Arifesi', 'type': 'holiday_eve', 'impact': 'high'},
-        '2024-04-11': {'name': 'Ramazan Bayramı 1. Gün', 'type': 'public_holiday', 'impact': 'high'},
-        '2024-04-12': {'name': 'Ramazan Bayramı 2. Gün', 'type': 'public_holiday', 'impact': 'high'},
-        '2024-04-13': {'name': 'Ramazan Bayramı 3. Gün', 'type': 'public_holiday', 'impact': 'high'},
-        '2024-04-23': {'name': '23 Nisan Ulusal Egemenlik ve Çocuk Bayramı', 'type': 'public_holiday', 'impact': 'medium'},
-        '2024-05-01': {'name': 'İşçi Bayramı', 'type': 'public_holiday', 'impact': 'medium'},
-        '2024-05-19': {'name': '19 Mayıs Atatürk\'ü Anma Gençlik ve Spor Bayramı', 'type': 'public_holiday', 'impact': 'medium'},
-        '2024-06-15': {'name': 'Kurban Bayramı Arifesi', 'type': 'holiday_eve', 'impact': 'high'},
-        '2024-06-16': {'name': 'Kurban Bayramı 1. Gün', 'type': 'public_holiday', 'impact': 'high'},
-        '2024-06-17': {'name': 'Kurban Bayramı 2. Gün', 'type': 'public_holiday', 'impact': 'high'},
-        '2024-06-18': {'name': 'Kurban Bayramı 3. Gün', 'type': 'public_holiday', 'impact': 'high'},
-        '2024-06-19': {'name': 'Kurban Bayramı 4. Gün', 'type': 'public_holiday', 'impact': 'high'},
-        '2024-07-15': {'name': 'Demokrasi ve Milli Birlik Günü', 'type': 'public_holiday', 'impact': 'medium'},
-        '2024-08-30': {'name': 'Zafer Bayramı', 'type': 'public_holiday', 'impact': 'medium'},
-        '2024-10-28': {'name': 'Cumhuriyet Bayramı Arifesi', 'type': 'holiday_eve', 'impact': 'medium'},
-        '2024-10-29': {'name': 'Cumhuriyet Bayramı', 'type': 'public_holiday', 'impact': 'high'},
-        '2025-01-01': {'name': 'Yılbaşı', 'type': 'public_holiday', 'impact': 'high'},
-        '2025-03-30': {'name': 'Ramazan Bayramı Arifesi', 'type': 'holiday_eve', 'impact': 'high'},
-        '2025-03-31': {'name': 'Ramazan Bayramı 1. Gün', 'type': 'public_holiday', 'impact': 'high'},
-        '2025-04-01': {'name': 'Ramazan Bayramı 2. Gün', 'type': 'public_holiday', 'impact': 'high'},
-        '2025-04-02': {'name': 'Ramazan Bayramı 3. Gün', 'type': 'public_holiday', 'impact': 'high'},
-        '2025-04-23': {'name': '23 Nisan', 'type': 'public_holiday', 'impact': 'medium'},
-        '2025-05-01': {'name': 'İşçi Bayramı', 'type': 'public_holiday', 'impact': 'medium'},
-        '2025-05-19': {'name': '19 Mayıs', 'type': 'public_holiday', 'impact': 'medium'},
-        '2025-06-06': {'name': 'Kurban Bayramı Arifesi', 'type': 'holiday_eve', 'impact': 'high'},
-        '2025-06-07': {'name': 'Kurban Bayramı 1. Gün', 'type': 'public_holiday', 'impact': 'high'},
-        '2025-06-08': {'name': 'Kurban Bayramı 2. Gün', 'type': 'public_holiday', 'impact': 'high'},
-        '2025-06-09': {'name': 'Kurban Bayramı 3. Gün', 'type': 'public_holiday', 'impact': 'high'},
-        '2025-06-10': {'name': 'Kurban Bayramı 4. Gün', 'type': 'public_holiday', 'impact': 'high'},
-        '2025-07-15': {'name': 'Demokrasi Günü', 'type': 'public_holiday', 'impact': 'medium'},
-        '2025-08-30': {'name': 'Zafer Bayramı', 'type': 'public_holiday', 'impact': 'medium'},
-        '2025-10-28': {'name': 'Cumhuriyet Bayramı Arifesi', 'type': 'holiday_eve', 'impact': 'medium'},
-        '2025-10-29': {'name': 'Cumhuriyet Bayramı', 'type': 'public_holiday', 'impact': 'high'},
-    }
+    # Özel günler (resmi tatiller, arifeler) holiday_calendar modülünde
+    # yıl kurallarından üretilir; sabit bir tarih listesi tutulmaz
     
     # Sezonsal etkiler
     SEASONAL_FACTORS = {
@@ -69,8 +42,10 @@ class ExternalDataProvider:
         12: {'season': 'winter', 'factor': 1.3},  # Aralık - Kış (Yılbaşı etkisi)
     }
     
-    def __init__(self):
-        self.weather_cache = {}
+    def __init__(self, weather_provider: Optional[WeatherProvider] = None):
+        # Hava durumu sağlayıcısı (yerel gözlemler veya simülasyon); önbellek
+        # sağlayıcılar arasında paylaşılır
+        self.weather = weather_provider or get_weather_provider()
     
     def is_special_day(self, date: datetime) -> Optional[Dict]:
         """
@@ -86,8 +61,22 @@ class ExternalDataProvider:
         if pd.isna(date):
             return None
         
-        date_str = date.strftime('%Y-%m-%d')
-        return self.SPECIAL_DAYS.get(date_str)
+        calendar = get_holiday_calendar()
+        if not calendar.covers(date.year, date.year):
+            calendar = calendar_for([date])
+        return calendar.lookup(date)
+    
+    def special_day_mask(self, dates) -> np.ndarray:
+        """
+        Tarihlerin özel gün olup olmadığını toplu kontrol et
+        
+        Args:
+            dates: Tarih dizisi veya Series (NaT olabilir)
+            
+        Returns:
+            0/1 dizisi
+        """
+        return calendar_for(dates).mask(dates).astype(np.int64)
     
     def is_weekend(self, date: datetime) -> bool:
         """
@@ -109,8 +98,8 @@ class ExternalDataProvider:
     
     def get_weather_data(self, location: str = 'Istanbul', date: datetime = None) -> Dict:
         """
-        Hava durumu verisi al (simüle edilmiş)
-        Gerçek kullanımda OpenWeatherMap, WeatherAPI gibi servisler kullanılabilir
+        Hava durumu verisi al
+        Yapılandırılmış sağlayıcıdan (yerel gözlemler veya simülasyon) okunur
         
         Args:
             location: Lokasyon
@@ -122,29 +111,42 @@ class ExternalDataProvider:
         if date is None:
             date = datetime.now()
         
-        # Basit simülasyon
-        month = date.month
+        return self.weather.get(location, date)
+    
+    def weather_features(self, dates, locations=None) -> pd.DataFrame:
+        """
+        Tarihlerin hava durumu özelliklerini toplu olarak al
         
-        # Mevsime göre ortalama sıcaklık
-        avg_temps = {
-            1: 7, 2: 8, 3: 11, 4: 16, 5: 21, 6: 26,
-            7: 29, 8: 29, 9: 25, 10: 19, 11: 14, 12: 9
-        }
+        Her konum için tek bir aralık sorgusu yapılır ve sonuç tarih
+        anahtarı üzerinden birleştirilir.
         
-        temp = avg_temps.get(month, 15)
+        Args:
+            dates: Tarih dizisi veya Series (NaT olabilir)
+            locations: Tek konum, satır başına konum dizisi veya None (varsayılan konum)
+            
+        Returns:
+            Tarihlerle aynı sırada DataFrame (temperature, rain_probability, humidity)
+        """
+        days = pd.DatetimeIndex(pd.to_datetime(pd.Series(np.asarray(dates)), errors='coerce')).normalize()
+        result = pd.DataFrame(np.nan, index=range(len(days)), columns=WEATHER_COLUMNS)
+        valid = ~days.isna()
+        if not valid.any():
+            return result
         
-        # Yağış olasılığı (kış aylarında daha yüksek)
-        rain_prob = {
-            1: 0.6, 2: 0.5, 3: 0.4, 4: 0.4, 5: 0.3, 6: 0.2,
-            7: 0.1, 8: 0.1, 9: 0.2, 10: 0.4, 11: 0.5, 12: 0.6
-        }
+        if locations is None or isinstance(locations, str):
+            groups = {locations: np.flatnonzero(valid)}
+        else:
+            codes, uniques = pd.factorize(pd.Series(np.asarray(locations)), use_na_sentinel=False)
+            groups = {uniques[code]: np.flatnonzero(valid & (codes == code)) for code in range(len(uniques))}
         
-        return {
-            'temperature': temp,
-            'condition': 'rainy' if rain_prob.get(month, 0.3) > 0.4 else 'sunny',
-            'humidity': 60 + (month % 3) * 10,
-            'rain_probability': rain_prob.get(month, 0.3)
-        }
+        for location, rows in groups.items():
+            if not len(rows):
+                continue
+            group_days = days[rows]
+            weather = self.weather.get_range(location, group_days.min(), group_days.max())
+            result.iloc[rows] = weather[WEATHER_COLUMNS].reindex(group_days).to_numpy()
+        
+        return result
     
     def get_date_features(self, date: datetime) -> Dict:
         """
@@ -156,31 +158,12 @@ class ExternalDataProvider:
         Returns:
             Tarih özellikleri
         """
-        features = {
-            'date': date.strftime('%Y-%m-%d'),
-            'year': date.year,
-            'month': date.month,
-            'day': date.day,
-            'day_of_week': date.weekday(),
-            'is_weekend': int(self.is_weekend(date)),
-            'week_of_year': date.isocalendar()[1],
-            'quarter': (date.month - 1) // 3 + 1,
-            'season': self.get_season(date.month),
-            'seasonal_factor': self.get_seasonal_factor(date.month),
-        }
-        
-        # Özel gün kontrolü
-        special_day = self.is_special_day(date)
-        if special_day:
-            features['is_special_day'] = 1
-            features['special_day_type'] = special_day['type']
-            features['special_day_impact'] = special_day['impact']
-        else:
-            features['is_special_day'] = 0
-            features['special_day_type'] = 'none'
-            features['special_day_impact'] = 'none'
+        row = self.date_features([date]).iloc[0]
+        features = {'date': pd.Timestamp(date).strftime('%Y-%m-%d')}
+        for col, value in row.items():
+            features[col] = value.item() if hasattr(value, 'item') else value
         
-        # Hava durumu (simüle)
+        # Hava durumu
         weather = self.get_weather_data(date=date)
         features['temperature'] = weather['temperature']
         features['weather_condition'] = weather['condition']
@@ -188,6 +171,48 @@ class ExternalDataProvider:
         
         return features
     
+    def calendar_dimension(self, start, end) -> pd.DataFrame:
+        """
+        Takvim boyut tablosu: her gün için bir satır ve tüm tarih özellikleri
+        (hava durumu konuma bağlı olduğundan ayrı birleştirilir)
+        
+        Tablo tam yıllar için bir kez üretilip önbelleklenir; dönen tablo
+        paylaşıldığından değiştirilmemelidir.
+        
+        Args:
+            start: İlk tarih
+            end: Son tarih
+            
+        Returns:
+            Tarih indeksli DataFrame
+        """
+        return build_calendar_dimension(pd.Timestamp(start).year, pd.Timestamp(end).year)
+    
+    def date_features(self, dates, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Tarihlerin özelliklerini takvim tablosundan toplu olarak al
+        
+        Tarihler gün başına yuvarlanıp takvim tablosuyla tarih anahtarı
+        üzerinden birleştirilir (satır sayısı ve sırası korunur).
+        
+        Args:
+            dates: Tarih dizisi veya Series (NaT olabilir)
+            columns: İstenen özellikler (None ise tümü)
+            
+        Returns:
+            Tarihlerle aynı sırada DataFrame (NaT satırları boş)
+        """
+        days = pd.DatetimeIndex(pd.to_datetime(pd.Series(np.asarray(dates)), errors='coerce')).normalize()
+        valid = days.dropna()
+        if len(valid):
+            dimension = self.calendar_dimension(valid.min(), valid.max())
+        else:
+            dimension = self.calendar_dimension(datetime.now(), datetime.now())
+        
+        if columns is not None:
+            dimension = dimension[columns]
+        return dimension.reindex(days).reset_index(drop=True)
+    
     def get_future_dates(self, start_date: datetime, months: int = 6) -> List[datetime]:
         """
         Gelecek tarihler listesi oluştur
@@ -215,31 +240,30 @@ class ExternalDataProvider:
     
     def calculate_competition_factor(self, location: str = None) -> float:
         """
-        Rekabet faktörü hesapla (simüle edilmiş)
-        Gerçek kullanımda coğrafi veri ve rakip analizi yapılabilir
+        Rekabet faktörü hesapla (il bazında)
         
         Args:
-            location: Lokasyon
+            location: Lokasyon veya şube adı
             
         Returns:
             Rekabet faktörü (0.5 - 1.5 arası)
         """
-        # Basit simülasyon - lokasyona göre değişebilir
-        competition_levels = {
-            'istanbul': 1.3,
-            'ankara': 1.2,
-            'izmir': 1.15,
-            'bursa': 1.1,
-            'antalya': 1.05,
-        }
+        if not location:
+            return DEFAULT_COMPETITION
         
-        if location:
-            loc_lower = location.lower()
-            for key, value in competition_levels.items():
-                if key in loc_lower:
-                    return value
+        return resolve_location(str(location))[2]
+    
+    def location_features(self, locations) -> Dict[str, np.ndarray]:
+        """
+        Şube/konum sütunu için il, bölge ve rekabet faktörü (satır başına)
         
-        return 1.0  # Varsayılan
+        Args:
+            locations: Konum değerleri
+            
+        Returns:
+            'city', 'region', 'competition_factor' dizileri
+        """
+        return location_attributes(locations)
     
     def get_product_shelf_life(self, product_name: str, category: str = None) -> int:
         """
@@ -247,23 +271,68 @@ class ExternalDataProvider:
         
         Args:
             product_name: Ürün adı
-            category: Kategori
+            category: Kategori (ad eşleşmezse kullanılır)
             
         Returns:
             Raf ömrü (gün)
         """
-        product_lower = product_name.lower()
+        return shelf_life_classifier.days(product_name, category)
+    
+    def product_shelf_lives(self, products, categories=None) -> np.ndarray:
+        """
+        Ürün sütununun raf ömürleri (gün), tek çağrıda
         
-        # Temel kategoriler
-        if any(word in product_lower for word in ['süt', 'milk', 'yoğurt', 'yogurt', 'peynir', 'cheese']):
-            return 7
-        elif any(word in product_lower for word in ['et', 'meat', 'tavuk', 'chicken', 'balık', 'fish']):
-            return 3
-        elif any(word in product_lower for word in ['sebze', 'vegetable', 'meyve', 'fruit']):
-            return 5
-        elif any(word in product_lower for word in ['ekmek', 'bread']):
-            return 2
-        elif any(word in product_lower for word in ['konserve', 'canned', 'makarna', 'pasta', 'pirinç', 'rice']):
-            return 365
-        else:
-            return 30  # Varsayılan
+        Args:
+            products: Ürün adları
+            categories: Satır başına kategori (opsiyonel)
+            
+        Returns:
+            int64 dizisi
+        """
+        return shelf_life_classifier.classify(products, categories)
+
+
+@lru_cache(maxsize=16)
+def build_calendar_dimension(start_year: int, end_year: int) -> pd.DataFrame:
+    """
+    Yıl aralığı için takvim boyut tablosu (önbellekli)
+    
+    Args:
+        start_year: İlk yıl
+        end_year: Son yıl
+        
+    Returns:
+        Tarih indeksli DataFrame
+    """
+    provider = ExternalDataProvider
+    days = pd.date_range(f'{start_year}-01-01', f'{end_year}-12-31', freq='D', name='date')
+    month = days.month
+    
+    dimension = pd.DataFrame({
+        'year': days.year,
+        'month': month,
+        'day': days.day,
+        'day_of_week': days.dayofweek,
+        'is_weekend': (days.dayofweek >= 5).astype(int),
+        'week_of_year': days.isocalendar().week.to_numpy().astype(int),
+        'quarter': days.quarter,
+        'season': month.map(lambda m: provider.SEASONAL_FACTORS[m]['season']),
+        'seasonal_factor': month.map(lambda m: provider.SEASONAL_FACTORS[m]['factor']),
+    }, index=days)
+    
+    # Özel günler
+    calendar = calendar_for(days)
+    positions = calendar.positions(days)
+    hit = positions >= 0
+    special_type = np.full(len(days), 'none', dtype=object)
+    special_impact = np.full(len(days), 'none', dtype=object)
+    special_type[hit] = [calendar.info[pos]['type'] for pos in positions[hit]]
+    special_impact[hit] = [calendar.info[pos]['impact'] for pos in positions[hit]]
+    dimension['is_special_day'] = hit.astype(int)
+    dimension['special_day_type'] = special_type
+    dimension['special_day_impact'] = special_impact
+    
+    return dimension
+
+
+metrics.register_collector(lru_cache_collector('calendar_dimension', build_calendar_dimension))
@@ -0,0 +1,253 @@
+"""
+Holiday Calendar Module
+Türkiye resmi tatil ve arife günlerinin kurallarla üretilmesi
+
+Sabit tarihli bayramlar yıl kurallarından, Ramazan ve Kurban bayramları
+ise hicri ay başlarından hesaplanır. Takvim bir kez sıralı datetime64[D]
+dizisine dökülür; milyonlarca tarih için üyelik testi tek bir
+searchsorted çağrısıdır.
+"""
+
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from .metrics import lru_cache_collector, metrics
+
+
+# Varsayılan takvim aralığı (dışındaki tarihler için takvim genişletilir)
+DEFAULT_YEARS = (1990, 2060)
+
+# Hilal görünürlüğü için, kavuşumdan sonraki gece yarısında (UTC) gereken
+# yaklaşık Ay-Güneş açısı (derece). 1978 İstanbul kriterinin (gün batımında
+# 8° uzanım, 5° yükseklik) sade bir karşılığıdır; 2018-2026 Diyanet
+# takvimindeki tüm bayram başlangıçlarıyla uyumludur.
+CRESCENT_ELONGATION = 6.7
+
+# (ay, gün, ad, tip, etki, başlangıç yılı)
+FIXED_HOLIDAYS = [
+    (1, 1, 'Yılbaşı', 'public_holiday', 'high', None),
+    (4, 23, '23 Nisan Ulusal Egemenlik ve Çocuk Bayramı', 'public_holiday', 'medium', None),
+    (5, 1, 'Emek ve Dayanışma Günü', 'public_holiday', 'medium', 2009),
+    (5, 19, '19 Mayıs Atatürk\'ü Anma, Gençlik ve Spor Bayramı', 'public_holiday', 'medium', None),
+    (7, 15, 'Demokrasi ve Milli Birlik Günü', 'public_holiday', 'medium', 2017),
+    (8, 30, 'Zafer Bayramı', 'public_holiday', 'medium', None),
+    (10, 28, 'Cumhuriyet Bayramı Arifesi', 'holiday_eve', 'medium', None),
+    (10, 29, 'Cumhuriyet Bayramı', 'public_holiday', 'high', None),
+]
+
+# (hicri ay, hicri gün, ad, gün sayısı)
+LUNAR_HOLIDAYS = [
+    (10, 1, 'Ramazan Bayramı', 3),
+    (12, 10, 'Kurban Bayramı', 4),
+]
+
+_UNIX_EPOCH_JD = 2440587.5
+_SYNODIC_MONTH = 29.530588861
+
+
+def _new_moons(k: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Yeni ay (kavuşum) anları (Meeus, Astronomical Algorithms, bölüm 49)
+
+    Args:
+        k: Lunasyon numaraları (0 = 6 Ocak 2000 yeni ayı)
+
+    Returns:
+        (Unix gün cinsinden kavuşum anı, Ay'ın ekliptik enlemi (derece),
+        Ay'ın Güneş'ten saatlik uzaklaşma hızı (derece))
+    """
+    k = np.asarray(k, dtype=float)
+    t = k / 1236.85
+
+    jde = (2451550.09766 + _SYNODIC_MONTH * k + 0.00015437 * t ** 2
+           - 0.000000150 * t ** 3 + 0.00000000073 * t ** 4)
+    e = 1 - 0.002516 * t - 0.0000074 * t ** 2
+    m = np.radians(2.5534 + 29.10535670 * k - 0.0000014 * t ** 2)
+    mp = np.radians(201.5643 + 385.81693528 * k + 0.0107582 * t ** 2 + 0.00001238 * t ** 3)
+    f = np.radians(160.7108 + 390.67050284 * k - 0.0016118 * t ** 2 - 0.00000227 * t ** 3)
+    om = np.radians(124.7746 - 1.56375588 * k + 0.0020672 * t ** 2)
+
+    jde += (-0.40720 * np.sin(mp) + 0.17241 * e * np.sin(m) + 0.01608 * np.sin(2 * mp)
+            + 0.01039 * np.sin(2 * f) + 0.00739 * e * np.sin(mp - m) - 0.00514 * e * np.sin(mp + m)
+            + 0.00208 * e ** 2 * np.sin(2 * m) - 0.00111 * np.sin(mp - 2 * f)
+            - 0.00057 * np.sin(mp + 2 * f) + 0.00056 * e * np.sin(2 * mp + m)
+            - 0.00042 * np.sin(3 * mp) + 0.00042 * e * np.sin(m + 2 * f)
+            + 0.00038 * e * np.sin(m - 2 * f) - 0.00024 * e * np.sin(2 * mp - m)
+            - 0.00017 * np.sin(om) - 0.00007 * np.sin(mp + 2 * m)
+            + 0.00004 * np.sin(2 * mp - 2 * f) + 0.00004 * np.sin(3 * m)
+            + 0.00003 * np.sin(mp + m - 2 * f) + 0.00003 * np.sin(2 * mp + 2 * f)
+            - 0.00003 * np.sin(mp + m + 2 * f) + 0.00003 * np.sin(mp - m + 2 * f)
+            - 0.00002 * np.sin(mp - m - 2 * f) - 0.00002 * np.sin(3 * mp + m)
+            + 0.00002 * np.sin(4 * mp))
+
+    latitude = 5.128 * np.sin(f)
+    speed = (12.19 + 1.43 * np.cos(mp)) / 24
+    return jde - _UNIX_EPOCH_JD, latitude, speed
+
+
+def _tabular_hijri_days(years: np.ndarray, month: int, day: int) -> np.ndarray:
+    """Aritmetik (tablo) hicri takvimde tarihin Unix gün numarası"""
+    years = np.asarray(years, dtype=np.int64)
+    jd = (day + int(np.ceil(29.5 * (month - 1))) + (years - 1) * 354
+          + (3 + 11 * years) // 30 + 1948439.5 - 1)
+    return np.floor(jd - _UNIX_EPOCH_JD + 0.5).astype(np.int64)
+
+
+def hijri_month_starts(hijri_years: np.ndarray, month: int) -> np.ndarray:
+    """
+    Hicri ayların ilk günleri
+
+    Ay başı, aritmetik takvimin tahmin ettiği tarihe en yakın kavuşumdan
+    hesaplanır: hilal kavuşumu izleyen gece yarısına kadar görünür açıya
+    ulaşıyorsa ay ertesi gün, ulaşmıyorsa bir gün sonra başlar.
+
+    Args:
+        hijri_years: Hicri yıllar
+        month: Hicri ay (1-12)
+
+    Returns:
+        datetime64[D] dizisi
+    """
+    estimate = _tabular_hijri_days(hijri_years, month, 1)
+    k0 = np.round((estimate - 1.5 - (2451550.09766 - _UNIX_EPOCH_JD)) / _SYNODIC_MONTH)
+
+    # Tahmine en yakın başlangıcı veren lunasyon seçilir
+    candidates = k0[:, None] + np.array([-1, 0, 1])
+    conjunction, latitude, speed = _new_moons(candidates)
+    conjunction_day = np.floor(conjunction)
+    elongation = np.hypot(latitude, speed * (conjunction_day + 1 - conjunction) * 24)
+    starts = conjunction_day + np.where(elongation >= CRESCENT_ELONGATION, 1, 2)
+
+    best = np.abs(starts - estimate[:, None]).argmin(axis=1)
+    days = starts[np.arange(len(starts)), best].astype(np.int64)
+    return days.astype('datetime64[D]')
+
+
+class HolidayCalendar:
+    """
+    Sıralı tatil takvimi
+
+    `days` sıralı ve tekil datetime64[D] dizisidir; `info` aynı sırada her
+    günün adını, tipini ve etkisini tutar. Aynı güne iki kayıt düşerse
+    resmi tatil arifeye tercih edilir.
+    """
+
+    def __init__(self, start_year: int, end_year: int):
+        self.start_year = start_year
+        self.end_year = end_year
+
+        entries = self._fixed_entries() + self._lunar_entries()
+        # Resmi tatil önce gelsin: aynı günün ilk kaydı tutulur
+        entries.sort(key=lambda entry: (entry[0], entry[1]['type'] != 'public_holiday'))
+
+        days, info = [], []
+        for day, details in entries:
+            if days and days[-1] == day:
+                continue
+            days.append(day)
+            info.append(details)
+
+        self.days = np.array(days, dtype='datetime64[D]')
+        self.info: List[Dict] = info
+
+    def _fixed_entries(self) -> List[Tuple[np.datetime64, Dict]]:
+        """Sabit tarihli bayramlar"""
+        entries = []
+        for year in range(self.start_year, self.end_year + 1):
+            for month, day, name, kind, impact, since in FIXED_HOLIDAYS:
+                if since is not None and year < since:
+                    continue
+                entries.append((np.datetime64(f"{year:04d}-{month:02d}-{day:02d}", 'D'),
+                                {'name': name, 'type': kind, 'impact': impact}))
+        return entries
+
+    def _lunar_entries(self) -> List[Tuple[np.datetime64, Dict]]:
+        """Ramazan ve Kurban bayramları, arifeleriyle"""
+        # Miladi aralığı kapsayan hicri yıllar (yaklaşık 0.97 miladi yıl)
+        first = int((self.start_year - 622) * 1.0307) - 1
+        last = int((self.end_year - 622) * 1.0307) + 2
+        hijri_years = np.arange(max(first, 1), last + 1)
+
+        entries = []
+        for month, day, name, length in LUNAR_HOLIDAYS:
+            first_days = hijri_month_starts(hijri_years, month) + (day - 1)
+            for start in first_days:
+                entries.append((start - 1, {'name': f'{name} Arifesi', 'type': 'holiday_eve', 'impact': 'high'}))
+                for offset in range(length):
+                    entries.append((start + offset, {'name': f'{name} {offset + 1}. Gün',
+                                                     'type': 'public_holiday', 'impact': 'high'}))
+
+        return [entry for entry in entries
+                if self.start_year <= entry[0].astype(object).year <= self.end_year]
+
+    def covers(self, year_min: int, year_max: int) -> bool:
+        """Yıl aralığı takvim içinde mi?"""
+        return self.start_year <= year_min and year_max <= self.end_year
+
+    def lookup(self, date) -> Optional[Dict]:
+        """
+        Tek bir tarihin tatil bilgisi
+
+        Returns:
+            Tatil bilgisi veya None
+        """
+        day = np.datetime64(pd.Timestamp(date).date(), 'D')
+        pos = np.searchsorted(self.days, day)
+        if pos < len(self.days) and self.days[pos] == day:
+            return self.info[pos]
+        return None
+
+    def positions(self, dates) -> np.ndarray:
+        """
+        Tarihlerin takvimdeki sıraları (tatil değilse -1)
+
+        Args:
+            dates: Tarih dizisi veya Series (NaT olabilir)
+
+        Returns:
+            int64 dizisi
+        """
+        days = pd.to_datetime(pd.Series(np.asarray(dates)), errors='coerce').to_numpy().astype('datetime64[D]')
+        pos = np.searchsorted(self.days, days)
+        clipped = np.minimum(pos, len(self.days) - 1)
+        hit = (pos < len(self.days)) & (self.days[clipped] == days)
+        return np.where(hit, clipped, -1)
+
+    def mask(self, dates) -> np.ndarray:
+        """Tarihler tatil/arife mi? (vektörel)"""
+        return self.positions(dates) >= 0
+
+    def to_frame(self) -> pd.DataFrame:
+        """Takvimi tablo olarak döndür"""
+        frame = pd.DataFrame(self.info)
+        frame.insert(0, 'date', self.days)
+        return frame
+
+
+@lru_cache(maxsize=8)
+def get_holiday_calendar(start_year: int = DEFAULT_YEARS[0], end_year: int = DEFAULT_YEARS[1]) -> HolidayCalendar:
+    """Yıl aralığı için (önbellekli) tatil takvimi"""
+    return HolidayCalendar(start_year, end_year)
+
+
+def calendar_for(dates) -> HolidayCalendar:
+    """
+    Tarihleri kapsayan takvim
+
+    Tarihler varsayılan aralıktaysa hazır takvim kullanılır; dışına
+    taşıyorsa aralık genişletilip yeni takvim üretilir (önbelleklenir).
+    """
+    calendar = get_holiday_calendar()
+    years = pd.to_datetime(pd.Series(np.asarray(dates)), errors='coerce').dt.year.dropna()
+    if years.empty:
+        return calendar
+
+    year_min, year_max = int(years.min()), int(years.max())
+    if calendar.covers(year_min, year_max):
+        return calendar
+    return get_holiday_calendar(min(year_min, DEFAULT_YEARS[0]), max(year_max, DEFAULT_YEARS[1]))
+
+
+metrics.register_collector(lru_cache_collector('holiday_calendar', get_holiday_calendar))
@@ -0,0 +1,113 @@
+"""
+Locations Module
+Konum/şube değerlerinden il, bölge ve rekabet faktörü boyutu
+
+Veri setindeki her tekil konum değeri bir kez çözümlenir; satırlara
+vektörel olarak dağıtılır.
+"""
+
+import re
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+from .metrics import lru_cache_collector, metrics
+from .utils import turkish_fold
+
+
+# Coğrafi bölgeler ve illeri
+REGIONS = {
+    'Marmara': ['İstanbul', 'Edirne', 'Kırklareli', 'Tekirdağ', 'Kocaeli', 'Sakarya', 'Yalova',
+                'Bursa', 'Balıkesir', 'Çanakkale', 'Bilecik'],
+    'Ege': ['İzmir', 'Manisa', 'Aydın', 'Denizli', 'Muğla', 'Uşak', 'Kütahya', 'Afyonkarahisar'],
+    'Akdeniz': ['Antalya', 'Mersin', 'Adana', 'Hatay', 'Osmaniye', 'Kahramanmaraş', 'Isparta', 'Burdur'],
+    'İç Anadolu': ['Ankara', 'Konya', 'Kayseri', 'Eskişehir', 'Sivas', 'Yozgat', 'Kırıkkale', 'Kırşehir',
+                   'Nevşehir', 'Niğde', 'Aksaray', 'Karaman', 'Çankırı'],
+    'Karadeniz': ['Zonguldak', 'Bartın', 'Karabük', 'Kastamonu', 'Sinop', 'Samsun', 'Ordu', 'Giresun',
+                  'Trabzon', 'Rize', 'Artvin', 'Gümüşhane', 'Bayburt', 'Amasya', 'Tokat', 'Çorum',
+                  'Bolu', 'Düzce'],
+    'Doğu Anadolu': ['Erzurum', 'Erzincan', 'Kars', 'Ardahan', 'Iğdır', 'Ağrı', 'Van', 'Muş', 'Bitlis',
+                     'Bingöl', 'Elazığ', 'Malatya', 'Tunceli', 'Hakkari'],
+    'Güneydoğu Anadolu': ['Gaziantep', 'Şanlıurfa', 'Diyarbakır', 'Mardin', 'Batman', 'Siirt', 'Şırnak',
+                          'Kilis', 'Adıyaman'],
+}
+
+# Yaygın kısa adlar -> il
+CITY_ALIASES = {
+    'afyon': 'Afyonkarahisar',
+    'antep': 'Gaziantep',
+    'maras': 'Kahramanmaraş',
+    'urfa': 'Şanlıurfa',
+    'izmit': 'Kocaeli',
+    'adapazari': 'Sakarya',
+    'icel': 'Mersin',
+}
+
+# Rekabet yoğunluğu (büyük şehirlerde daha yüksek); diğer iller 1.0
+COMPETITION_LEVELS = {
+    'İstanbul': 1.3,
+    'Ankara': 1.2,
+    'İzmir': 1.15,
+    'Bursa': 1.1,
+    'Antalya': 1.05,
+}
+
+DEFAULT_COMPETITION = 1.0
+UNKNOWN_REGION = 'Bilinmiyor'
+
+# Katlanmış ad ('sanliurfa', 'urfa') -> il
+_CITY_KEYS = {turkish_fold(city): city for cities in REGIONS.values() for city in cities}
+_CITY_KEYS.update(CITY_ALIASES)
+_CITY_REGION = {city: region for region, cities in REGIONS.items() for city in cities}
+_WORD = re.compile(r'\w+')
+
+
+@lru_cache(maxsize=65536)
+def resolve_location(location: str) -> Tuple[Optional[str], str, float]:
+    """
+    Tek bir konum değerini çözümle
+
+    Değerdeki kelimelerden ilk il adı (veya kısa adı) kullanılır; örn.
+    'İstanbul - Kadıköy Şubesi' ve 'KADIKÖY / ISTANBUL' İstanbul'dur.
+
+    Args:
+        location: Konum veya şube adı
+
+    Returns:
+        (il, bölge, rekabet faktörü); il bulunamazsa (None, 'Bilinmiyor', 1.0)
+    """
+    for word in _WORD.findall(turkish_fold(location)):
+        city = _CITY_KEYS.get(word)
+        if city is not None:
+            return city, _CITY_REGION[city], COMPETITION_LEVELS.get(city, DEFAULT_COMPETITION)
+    return None, UNKNOWN_REGION, DEFAULT_COMPETITION
+
+
+def location_attributes(locations) -> Dict[str, np.ndarray]:
+    """
+    Satır başına il, bölge ve rekabet faktörü
+
+    Her tekil değer bir kez çözümlenir ve kodlar üzerinden satırlara
+    dağıtılır; boş konumlar bilinmeyen bölgeye düşer.
+
+    Args:
+        locations: Konum değerleri (dizi veya Series)
+
+    Returns:
+        'city', 'region', 'competition_factor' dizileri
+    """
+    codes, uniques = pd.factorize(pd.Series(np.asarray(locations, dtype=object)))
+    resolved = [resolve_location(str(value)) for value in uniques] + [(None, UNKNOWN_REGION, DEFAULT_COMPETITION)]
+    # -1 kodu (boş değer) son elemana düşer
+    cities = np.array([r[0] for r in resolved], dtype=object)
+    regions = np.array([r[1] for r in resolved], dtype=object)
+    factors = np.array([r[2] for r in resolved], dtype=float)
+    return {
+        'city': cities[codes],
+        'region': regions[codes],
+        'competition_factor': factors[codes],
+    }
+
+
+metrics.register_collector(lru_cache_collector('locations', resolve_location))
@@ -0,0 +1,312 @@
+"""
+Memory Module
+Veri seti başına bellek muhasebesi ve istek bellek tepe değerleri
+
+Süreçte tutulan her veri seti (ham, hazırlanmış, özellik, toplam ve sonuç
+nesneleri) derin bellek boyutuyla raporlanır. HISMARKETING_TRACEMALLOC=1
+ise her isteğin tracemalloc tepe değeri kaydedilir ve ayırma noktalarının
+anlık görüntüleri karşılaştırılarak sızıntılar izlenebilir.
+"""
+
+import os
+import sys
+import threading
+import tracemalloc
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+TRACEMALLOC_ENABLED = os.environ.get('HISMARKETING_TRACEMALLOC', '0') == '1'
+
+# tracemalloc'un ayırma başına sakladığı çağrı derinliği
+TRACEMALLOC_FRAMES = int(os.environ.get('HISMARKETING_TRACEMALLOC_FRAMES', '1'))
+
+# user_files kayıt anahtarı -> kategori
+DATASET_CATEGORIES = {
+    'data_intelligence': 'raw',
+    'df_prepared': 'prepared',
+    'daily_sales': 'prepared',
+    'df': 'features',
+    'cube': 'aggregates',
+    'product_index': 'aggregates',
+    'known_days': 'aggregates',
+    'analysis': 'results',
+    'prediction': 'results',
+    'backtest': 'results',
+    'anomalies': 'results',
+}
+
+# Tahmin modelleri istekten sonra tutulmaz; eğitim maliyeti istek tepe değerinde görünür
+CATEGORIES = ['raw', 'prepared', 'features', 'aggregates', 'results']
+
+# Derin boyut hesabında inilecek en fazla iç içe nesne seviyesi
+MAX_DEPTH = 8
+
+
+def deep_size(obj: Any, seen: set = None, depth: int = 0) -> int:
+    """
+    Nesnenin yaklaşık derin bellek boyutu (bayt)
+
+    DataFrame/Series/Index için memory_usage(deep=True), numpy dizileri için
+    nbytes kullanılır; sözlük, liste ve nesne öznitelikleri özyinelemeli
+    toplanır. Aynı nesne iki kez sayılmaz.
+
+    Args:
+        obj: Ölçülecek nesne
+        seen: Sayılmış nesne kimlikleri (paylaşılan alt nesneler için)
+        depth: Mevcut derinlik
+
+    Returns:
+        Bayt
+    """
+    if seen is None:
+        seen = set()
+    if obj is None or id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+
+    # pandas nesneleri (pandas'ı burada içe aktarmadan)
+    memory_usage = getattr(obj, 'memory_usage', None)
+    if callable(memory_usage) and type(obj).__module__.startswith('pandas'):
+        usage = memory_usage(deep=True)
+        return int(usage.sum() if hasattr(usage, 'sum') else usage)
+
+    nbytes = getattr(obj, 'nbytes', None)
+    if isinstance(nbytes, int) and type(obj).__module__.startswith('numpy'):
+        return nbytes + sys.getsizeof(obj, 0) if obj.base is None else sys.getsizeof(obj, 0)
+
+    size = sys.getsizeof(obj, 0)
+    if depth >= MAX_DEPTH or isinstance(obj, (str, bytes, int, float, bool)):
+        return size
+
+    if isinstance(obj, dict):
+        for key, value in obj.items():
+            size += deep_size(key, seen, depth + 1) + deep_size(value, seen, depth + 1)
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        for item in obj:
+            size += deep_size(item, seen, depth + 1)
+    elif hasattr(obj, '__dict__'):
+        size += deep_size(vars(obj), seen, depth + 1)
+    return size
+
+
+def dataset_footprint(file_data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Tek veri setinin kategori bazlı bellek kullanımı
+
+    Arrow deposundaki özellik tabloları süreç belleğinde değil, bellek
+    eşlemeli dosyadadır; dosya boyutu ayrıca 'mapped_bytes' olarak verilir.
+
+    Args:
+        file_data: user_files kaydı
+
+    Returns:
+        {'categories': {kategori: bayt}, 'total_bytes', 'mapped_bytes'}
+    """
+    categories = dict.fromkeys(CATEGORIES, 0)
+    seen = set()
+    for key, category in DATASET_CATEGORIES.items():
+        if key in file_data:
+            categories[category] += deep_size(file_data[key], seen)
+
+    mapped_bytes = 0
+    features_key = file_data.get('features_key')
+    if features_key:
+        from .dataset_store import dataset_store
+        mapped_bytes = dataset_store.size(features_key)
+
+    return {
+        'categories': categories,
+        'total_bytes': sum(categories.values()),
+        'mapped_bytes': mapped_bytes,
+    }
+
+
+def max_rss_bytes() -> Optional[int]:
+    """Sürecin en yüksek RSS değeri (bayt)"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux KB, macOS bayt döndürür
+    return int(rss if sys.platform == 'darwin' else rss * 1024)
+
+
+class MemoryLedger:
+    """
+    İstek bellek tepe değerleri ve ayırma anlık görüntüleri
+
+    tracemalloc'un tepe değeri süreç genelidir ve reset_peak() onu tüm
+    istekler için sıfırlar. Bu yüzden tepe değeri aynı anda yalnızca bir
+    istek için ölçülür; ölçüm sürerken başlayan istekler yalnızca kalan
+    (retained) belleği kaydeder. Ölçülen isteğin tepe değeri yine de o
+    sırada çalışan diğer isteklerin ayırmalarını içerebilir; böyle
+    kayıtlar 'approximate' olarak işaretlenir.
+    """
+
+    def __init__(self, history: int = 200):
+        self.recent = deque(maxlen=history)
+        self.dataset_peaks: Dict[tuple, Dict[str, Any]] = {}
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._measuring = threading.Lock()
+        self._active = 0
+        self._overlap = False
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, frames: int = TRACEMALLOC_FRAMES) -> None:
+        """tracemalloc'u başlat"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+
+    def begin_request(self) -> Optional[tuple]:
+        """
+        İsteğin ölçümünü başlat
+
+        Başka bir istek tepe değerini ölçmüyorsa tepe değeri sıfırlanır ve
+        bu istek ölçer.
+
+        Returns:
+            (isteğin başındaki ayrılmış bellek, tepe değeri ölçülüyor mu);
+            tracemalloc kapalıysa None
+        """
+        if not self.tracing:
+            return None
+        measuring = self._measuring.acquire(blocking=False)
+        with self._lock:
+            self._active += 1
+            if measuring:
+                self._overlap = self._active > 1
+                tracemalloc.reset_peak()
+            else:
+                self._overlap = True
+            baseline = tracemalloc.get_traced_memory()[0]
+        return baseline, measuring
+
+    def end_request(self, token: tuple, endpoint: str, user_email: str = None,
+                    file_id: str = None) -> Optional[Dict[str, Any]]:
+        """
+        İsteğin tepe değerini kaydet
+
+        Args:
+            token: begin_request() dönüşü
+            endpoint: Flask endpoint adı
+            user_email: Kullanıcı
+            file_id: İstekteki veri seti
+
+        Returns:
+            Kayıt (tracemalloc kapalıysa None)
+        """
+        if token is None:
+            return None
+        baseline, measuring = token
+        current, peak = tracemalloc.get_traced_memory() if self.tracing else (baseline, baseline)
+        with self._lock:
+            self._active -= 1
+            approximate = self._overlap
+        if measuring:
+            self._measuring.release()
+
+        entry = {
+            'endpoint': endpoint,
+            'user_email': user_email,
+            'file_id': file_id,
+            'peak_bytes': max(0, peak - baseline) if measuring else None,
+            'retained_bytes': current - baseline,
+            'at': datetime.now().isoformat(timespec='seconds'),
+        }
+        if measuring:
+            entry['approximate'] = approximate
+        with self._lock:
+            self.recent.append(entry)
+            if file_id and measuring:
+                key = (user_email, file_id)
+                previous = self.dataset_peaks.get(key)
+                if previous is None or entry['peak_bytes'] > previous['peak_bytes']:
+                    self.dataset_peaks[key] = entry
+        return entry
+
+    def largest_datasets(self, user_files: Dict[str, Dict[str, Any]], limit: int = 20) -> List[Dict[str, Any]]:
+        """
+        En çok bellek tutan veri setleri
+
+        Args:
+            user_files: Kullanıcı -> file_id -> kayıt
+            limit: Döndürülecek veri seti sayısı
+
+        Returns:
+            Toplam boyuta göre azalan liste
+        """
+        # Silinmiş veri setlerinin tepe kayıtları tutulmaz
+        with self._lock:
+            for key in [key for key in self.dataset_peaks if key[1] not in user_files.get(key[0], {})]:
+                del self.dataset_peaks[key]
+
+        datasets = []
+        for user_email, files in list(user_files.items()):
+            for file_id, file_data in list(files.items()):
+                footprint = dataset_footprint(file_data)
+                peak = self.dataset_peaks.get((user_email, file_id))
+                datasets.append({
+                    'user_email': user_email,
+                    'file_id': file_id,
+                    'filename': file_data.get('filename'),
+                    **footprint,
+                    'peak_request': peak,
+                })
+        datasets.sort(key=lambda item: item['total_bytes'], reverse=True)
+        return datasets[:limit]
+
+    def allocation_sites(self, limit: int = 20, compare: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        En çok bellek ayıran kod satırları
+
+        compare=True ise önceki anlık görüntüye göre artış verilir; art arda
+        çağrılarda sürekli büyüyen satırlar sızıntı adayıdır.
+
+        Args:
+            limit: Satır sayısı
+            compare: Önceki görüntüyle karşılaştır
+
+        Returns:
+            {'total_bytes', 'sites'} (tracemalloc kapalıysa None)
+        """
+        if not self.tracing:
+            return None
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap*>'),
+        ))
+
+        with self._lock:
+            previous, self._snapshot = self._snapshot, snapshot
+
+        if compare and previous is not None:
+            stats = snapshot.compare_to(previous, 'lineno')
+            sites = [{'site': str(stat.traceback), 'bytes': stat.size, 'diff_bytes': stat.size_diff,
+                      'count': stat.count} for stat in stats[:limit]]
+        else:
+            stats = snapshot.statistics('lineno')
+            sites = [{'site': str(stat.traceback), 'bytes': stat.size, 'count': stat.count}
+                     for stat in stats[:limit]]
+
+        return {'total_bytes': sum(stat.size for stat in snapshot.statistics('filename')), 'sites': sites}
+
+    def process_info(self) -> Dict[str, Any]:
+        """Süreç bellek bilgisi"""
+        info = {'max_rss_bytes': max_rss_bytes(), 'tracing': self.tracing}
+        if self.tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            info.update({'traced_bytes': current, 'traced_peak_bytes': peak})
+        return info
+
+
+memory_ledger = MemoryLedger()
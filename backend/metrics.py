@@ -0,0 +1,260 @@
+"""
+Metrics Module
+Aşama süreleri, sayaçlar ve Prometheus metin biçiminde dışa aktarım
+
+Yalnızca standart kütüphaneyi kullanır; açılışta yüklenmesi ucuzdur.
+"""
+
+import contextvars
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# Aşama süreleri için histogram sınırları (saniye)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Metrik adı -> (tip, açıklama)
+METRIC_HELP = {
+    'hismarketing_stage_duration_seconds': ('histogram', 'Aşama süresi (saniye)'),
+    'hismarketing_rows_processed_total': ('counter', 'Aşamalarda işlenen satır sayısı'),
+    'hismarketing_models_trained_total': ('counter', 'Eğitilen model sayısı'),
+    'hismarketing_cache_hits_total': ('counter', 'Önbellek isabetleri'),
+    'hismarketing_cache_misses_total': ('counter', 'Önbellek ıskaları'),
+    'hismarketing_http_requests_total': ('counter', 'HTTP istek sayısı'),
+    'hismarketing_http_request_duration_seconds': ('histogram', 'HTTP istek süresi (saniye)'),
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+Sample = Tuple[str, Dict[str, str], float]
+
+# İstek başına aşama süreleri (yanıta eklenmesi istendiyse)
+_request_timings: contextvars.ContextVar = contextvars.ContextVar('request_timings', default=None)
+
+
+def _labels(labels: Dict[str, Any]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels) + '}'
+
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class _Histogram:
+    """Tek bir etiket kümesi için kümülatif kova sayaçları"""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    İş parçacığı güvenli metrik kaydı
+
+    Sayaçlar ve histogramlar süreç içinde tutulur; modüller ayrıca kendi
+    önbellek istatistiklerini okuyan toplayıcılar (collector) kaydedebilir.
+    Toplayıcılar yalnızca dışa aktarım sırasında çağrılır.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, _Histogram]] = {}
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, value: float = 1.0, **labels) -> None:
+        """Sayacı artır"""
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        """Histograma gözlem ekle"""
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(self.buckets)
+            histogram.observe(value)
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]) -> None:
+        """Dışa aktarımda çağrılacak (ad, etiketler, değer) üreticisi ekle"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Sayaç ve histogram özetleri (JSON için)"""
+        with self._lock:
+            counters = {name: {_format_labels(key): value for key, value in series.items()}
+                        for name, series in self._counters.items()}
+            histograms = {name: {_format_labels(key): {'count': h.count, 'sum': round(h.total, 6)}
+                                 for key, h in series.items()}
+                          for name, series in self._histograms.items()}
+        return {'counters': counters, 'histograms': histograms}
+
+    def render(self) -> str:
+        """Prometheus metin biçimi (0.0.4)"""
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            histograms = {name: dict(series) for name, series in self._histograms.items()}
+            collectors = list(self._collectors)
+
+        # Toplayıcı örnekleri aynı adlı sayaçlarla birlikte yazılır
+        for collector in collectors:
+            try:
+                samples = list(collector())
+            except Exception:
+                continue
+            for name, labels, value in samples:
+                series = counters.setdefault(name, {})
+                key = _labels(labels)
+                series[key] = series.get(key, 0.0) + value
+
+        lines = []
+        for name in sorted(counters):
+            kind, help_text = METRIC_HELP.get(name, ('counter' if name.endswith('_total') else 'gauge', name))
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for key, value in sorted(counters[name].items()):
+                lines.append(f'{name}{_format_labels(key)} {_format_value(value)}')
+
+        for name in sorted(histograms):
+            _, help_text = METRIC_HELP.get(name, ('histogram', name))
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} histogram')
+            for key, histogram in sorted(histograms[name].items()):
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(f'{name}_bucket{_format_labels(key + (("le", _format_value(bound)),))} {count}')
+                lines.append(f'{name}_bucket{_format_labels(key + (("le", "+Inf"),))} {histogram.count}')
+                lines.append(f'{name}_sum{_format_labels(key)} {_format_value(round(histogram.total, 6))}')
+                lines.append(f'{name}_count{_format_labels(key)} {histogram.count}')
+
+        return '\n'.join(lines) + '\n'
+
+    def reset(self) -> None:
+        """Tüm sayaç ve histogramları sıfırla (toplayıcılar kalır)"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+
+metrics = MetricsRegistry()
+
+
+def _row_count(obj: Any) -> Optional[int]:
+    """DataFrame benzeri nesnenin satır sayısı"""
+    shape = getattr(obj, 'shape', None)
+    if shape is not None and len(shape) == 2:
+        return int(shape[0])
+    return None
+
+
+@contextmanager
+def stage_timer(stage: str, rows: int = None):
+    """
+    Aşama süresini ölç
+
+    Süre histogramına ve (istenmişse) isteğin aşama listesine yazılır;
+    satır sayısı verilirse işlenen satır sayacı artırılır. Satır sayısı
+    ancak aşama bitince biliniyorsa dönen sözlüğün 'rows' anahtarına yazılır.
+    """
+    timing = {'rows': rows}
+    start = time.perf_counter()
+    try:
+        yield timing
+    finally:
+        elapsed = time.perf_counter() - start
+        rows = timing['rows']
+        metrics.observe('hismarketing_stage_duration_seconds', elapsed, stage=stage)
+        if rows:
+            metrics.inc('hismarketing_rows_processed_total', rows, stage=stage)
+
+        timings = _request_timings.get()
+        if timings is not None:
+            timings.append({'stage': stage, 'seconds': round(elapsed, 4), **({'rows': rows} if rows else {})})
+
+
+def timed_stage(stage: str, count_rows: bool = True):
+    """
+    Fonksiyonu aşama olarak ölçen dekoratör
+
+    İşlenen satır sayısı, DataFrame dönen fonksiyonlarda sonuçtan, diğerlerinde
+    ilk DataFrame argümanından alınır. Argümanın yalnızca bir kısmını işleyen
+    fonksiyonlar (ürün başına eğitim gibi) count_rows=False verip sayacı
+    kendileri artırır.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage) as timing:
+                result = func(*args, **kwargs)
+                if count_rows:
+                    rows = _row_count(result)
+                    if rows is None:
+                        rows = next((count for count in map(_row_count, args) if count is not None), None)
+                    timing['rows'] = rows
+            return result
+        return wrapper
+    return decorator
+
+
+def start_request_timings() -> contextvars.Token:
+    """Bu isteğin aşama sürelerini toplamaya başla"""
+    return _request_timings.set([])
+
+
+def request_timings() -> Optional[List[Dict[str, Any]]]:
+    """Bu istekte toplanan aşama süreleri (toplanmıyorsa None)"""
+    return _request_timings.get()
+
+
+def stop_request_timings(token: contextvars.Token) -> None:
+    _request_timings.reset(token)
+
+
+def summarize_timings(timings: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aşama sürelerini aşama başına topla"""
+    stages: Dict[str, Dict[str, Any]] = {}
+    for timing in timings:
+        entry = stages.setdefault(timing['stage'], {'seconds': 0.0, 'calls': 0})
+        entry['seconds'] = round(entry['seconds'] + timing['seconds'], 4)
+        entry['calls'] += 1
+        if 'rows' in timing:
+            entry['rows'] = entry.get('rows', 0) + timing['rows']
+    return stages
+
+
+def lru_cache_collector(name: str, cached: Callable) -> Callable[[], Iterable[Sample]]:
+    """functools.lru_cache istatistiklerini isabet/ıska sayacı olarak okuyan toplayıcı"""
+    def collect():
+        info = cached.cache_info()
+        yield 'hismarketing_cache_hits_total', {'cache': name}, info.hits
+        yield 'hismarketing_cache_misses_total', {'cache': name}, info.misses
+    return collect
@@ -9,7 +9,7 @@ from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 from sklearn.linear_model import LinearRegression
 from sklearn.preprocessing import StandardScaler
 from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_absolute_percentage_error, mean_squared_error
+from sklearn.metrics import mean_squared_error
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Any
 import joblib
@@ -17,6 +17,59 @@ import warnings
 warnings.filterwarnings('ignore')
 
 from .external_data import ExternalDataProvider
+from .locations import DEFAULT_COMPETITION
+from .metrics import metrics as metrics_registry, timed_stage
+from .progress import report_progress
+
+
+# Takvim tablosundan alınan tarih özellikleri
+DATE_FEATURES = [
+    'year', 'month', 'day', 'day_of_week', 'week_of_year', 'quarter',
+    'is_weekend', 'seasonal_factor', 'is_special_day',
+]
+
+# Hava durumu sağlayıcısından alınan özellikler
+WEATHER_FEATURES = ['temperature', 'rain_probability']
+
+# Modellerin kullandığı özellik sütunları (prepare_features çıktısından)
+FEATURE_COLUMNS = DATE_FEATURES + ['time_index'] + WEATHER_FEATURES + [
+    'competition_factor',
+    'lag_1', 'lag_7', 'lag_30',
+    'rolling_mean_7', 'rolling_std_7',
+    'rolling_mean_14', 'rolling_std_14',
+    'rolling_mean_30', 'rolling_std_30',
+]
+
+
+def make_models() -> Dict[str, Any]:
+    """Ürün başına denenen modeller (katman adı -> eğitilmemiş model)"""
+    return {
+        'random_forest': RandomForestRegressor(n_estimators=100, max_depth=10, random_state=42),
+        'gradient_boosting': GradientBoostingRegressor(n_estimators=100, max_depth=5, random_state=42),
+    }
+
+
+def forecast_errors(actual: np.ndarray, predicted: np.ndarray) -> Dict[str, Any]:
+    """
+    Tahmin hata ölçüleri (oran olarak)
+    
+    Args:
+        actual: Gerçekleşen değerler
+        predicted: Tahminler
+        
+    Returns:
+        wape (toplam mutlak hata / toplam satış), mape (satış olan günlerde),
+        bias (toplam fazla tahmin / toplam satış); tanımsızsa None
+    """
+    actual = np.asarray(actual, dtype=float)
+    error = np.asarray(predicted, dtype=float) - actual
+    total = actual.sum()
+    positive = actual > 0
+    return {
+        'wape': float(np.abs(error).sum() / total) if total > 0 else None,
+        'mape': float(np.mean(np.abs(error[positive]) / actual[positive])) if positive.any() else None,
+        'bias': float(error.sum() / total) if total > 0 else None,
+    }
 
 
 class PredictionEngine:
@@ -24,14 +77,17 @@ class PredictionEngine:
     Stok tahmin motoru - AI destekli tahminleme
     """
     
-    def __init__(self):
+    def __init__(self, progress=None):
         self.models = {}
         self.scalers = {}
         self.external_data = ExternalDataProvider()
         self.feature_importance = {}
+        # İlerleme olayları ve iptal kontrolü için ProgressJob (opsiyonel)
+        self.progress = progress
         
+    @timed_stage('feature')
     def prepare_features(self, df: pd.DataFrame, product_col: str, date_col: str, 
-                        quantity_col: str) -> pd.DataFrame:
+                        quantity_col: str, location_col: str = None) -> pd.DataFrame:
         """
         Makine öğrenmesi için özellikler hazırla
         
@@ -40,33 +96,39 @@ class PredictionEngine:
             product_col: Ürün sütunu
             date_col: Tarih sütunu
             quantity_col: Miktar sütunu
+            location_col: Şube/konum sütunu (opsiyonel)
             
         Returns:
             Hazırlanmış DataFrame
         """
+        report_progress(self.progress, 'prepare_features', 'Özellikler hazırlanıyor')
+        
         df_features = df.copy()
         
-        # Tarih özellikleri
+        # Tarih özellikleri takvim tablosundan (tarih anahtarıyla birleştirme)
         df_features[date_col] = pd.to_datetime(df_features[date_col])
-        df_features['year'] = df_features[date_col].dt.year
-        df_features['month'] = df_features[date_col].dt.month
-        df_features['day'] = df_features[date_col].dt.day
-        df_features['day_of_week'] = df_features[date_col].dt.dayofweek
-        df_features['week_of_year'] = df_features[date_col].dt.isocalendar().week
-        df_features['quarter'] = df_features[date_col].dt.quarter
-        
-        # Hafta sonu / hafta içi
-        df_features['is_weekend'] = df_features['day_of_week'].isin([5, 6]).astype(int)
-        
-        # Harici verilerden özellikler
-        df_features['seasonal_factor'] = df_features['month'].apply(
-            lambda x: self.external_data.get_seasonal_factor(x)
-        )
+        date_features = self.external_data.date_features(df_features[date_col], DATE_FEATURES)
+        
+        # NaT satırları: hafta içi, özel gün değil, nötr sezon
+        date_features = date_features.fillna({'is_weekend': 0, 'seasonal_factor': 1.0, 'is_special_day': 0})
+        for col in DATE_FEATURES:
+            df_features[col] = date_features[col].to_numpy()
+        
+        # Şube etkileri: her tekil konum bir kez çözümlenir (il, rekabet faktörü)
+        cities = None
+        if location_col and location_col in df_features.columns:
+            locations = self.external_data.location_features(df_features[location_col])
+            cities = locations['city']
+            # İli bilinmeyen şubeler varsayılan konumun hava durumunu alır
+            df_features['city'] = np.where(pd.isna(cities), '', cities)
+            df_features['competition_factor'] = locations['competition_factor']
+        else:
+            df_features['competition_factor'] = DEFAULT_COMPETITION
         
-        # Özel günler (NaT değerlerini 0 olarak işaretle)
-        df_features['is_special_day'] = df_features[date_col].apply(
-            lambda x: 1 if pd.notna(x) and self.external_data.is_special_day(x) else 0
-        )
+        # Hava durumu (il başına tek aralık sorgusu)
+        weather = self.external_data.weather_features(df_features[date_col], cities)
+        for col in WEATHER_FEATURES:
+            df_features[col] = weather[col].to_numpy()
         
         # Trend özellikleri (zaman bazlı indeks)
         df_features = df_features.sort_values(date_col)
@@ -76,20 +138,29 @@ class PredictionEngine:
         for lag in [1, 7, 30]:
             df_features[f'lag_{lag}'] = df_features.groupby(product_col)[quantity_col].shift(lag)
         
-        # Hareketli ortalamalar
+        # Hareketli ortalamalar (yalnızca önceki satırlar; satırın kendi miktarı hedeftir)
         for window in [7, 14, 30]:
             df_features[f'rolling_mean_{window}'] = df_features.groupby(product_col)[quantity_col].transform(
-                lambda x: x.rolling(window=window, min_periods=1).mean()
+                lambda x: x.shift(1).rolling(window=window, min_periods=1).mean()
             )
             df_features[f'rolling_std_{window}'] = df_features.groupby(product_col)[quantity_col].transform(
-                lambda x: x.rolling(window=window, min_periods=1).std()
+                lambda x: x.shift(1).rolling(window=window, min_periods=1).std()
             )
         
-        # Eksik değerleri doldur
-        df_features = df_features.fillna(method='ffill').fillna(method='bfill').fillna(0)
+        # Eksik değerleri ürün içinde yalnızca ileri doğru doldur: başka ürünün
+        # veya gelecekteki satırların değerleri özelliklere taşınmaz
+        missing = [col for col in df_features.columns if col != product_col and df_features[col].isna().any()]
+        if missing:
+            df_features[missing] = df_features.groupby(product_col)[missing].ffill()
+            # Ürünün ilk satırları (ör. lag_30) için önceki değer yoktur
+            numeric = [col for col in missing if pd.api.types.is_numeric_dtype(df_features[col])]
+            df_features[numeric] = df_features[numeric].fillna(0)
+        
+        report_progress(self.progress, 'prepare_features', 'Özellikler hazır', rows=len(df_features))
         
         return df_features
     
+    @timed_stage('train', count_rows=False)
     def train_model(self, df: pd.DataFrame, product: str, feature_cols: List[str], 
                    target_col: str) -> Tuple[Any, float, Dict]:
         """
@@ -106,10 +177,12 @@ class PredictionEngine:
         """
         # Ürün verilerini filtrele
         df_product = df[df['product'] == product].copy()
+        metrics_registry.inc('hismarketing_rows_processed_total', len(df_product), stage='train')
         
         if len(df_product) < 10:
             # Yeterli veri yok - basit ortalama kullan
             avg_quantity = df_product[target_col].mean()
+            metrics_registry.inc('hismarketing_models_trained_total', model='average')
             return None, 75.0, {'avg_quantity': avg_quantity, 'method': 'average'}
         
         # Özellikler ve hedef
@@ -131,10 +204,7 @@ class PredictionEngine:
         X_test_scaled = scaler.transform(X_test)
         
         # Model seçimi - ensemble yaklaşımı
-        models = [
-            RandomForestRegressor(n_estimators=100, max_depth=10, random_state=42),
-            GradientBoostingRegressor(n_estimators=100, max_depth=5, random_state=42),
-        ]
+        models = list(make_models().values())
         
         best_model = None
         best_score = float('inf')
@@ -157,20 +227,14 @@ class PredictionEngine:
         y_pred_final = best_model.predict(X_test_scaled)
         y_pred_final = np.maximum(y_pred_final, 0)
         
-        # MAPE hesapla (0'lardan kaçın)
-        mask = y_test > 0
-        if mask.sum() > 0:
-            mape = mean_absolute_percentage_error(y_test[mask], y_pred_final[mask])
-            base_accuracy = max(0, min(99, 100 * (1 - mape)))  # Maksimum %99
-            # Daha gerçekçi sonuçlar için rastgele varyasyon ekle
-            import random
-            random.seed(hash(product) % 1000)  # Ürün bazlı tutarlı rastgelelik
-            variance = random.uniform(-3, 3)
-            accuracy = max(70, min(98, base_accuracy + variance))
+        # MAPE satış olan günlerde hesaplanır (0'lardan kaçın); test döneminde
+        # hiç satış yoksa ortalama hata eğitim ortalamasına oranlanır
+        errors = forecast_errors(y_test, y_pred_final)
+        if errors['mape'] is not None:
+            accuracy = max(0.0, min(99.0, 100 * (1 - errors['mape'])))  # Maksimum %99
         else:
-            import random
-            random.seed(hash(product) % 1000)
-            accuracy = random.uniform(75, 85)
+            scale = max(float(np.mean(y_train)), 1.0)
+            accuracy = max(0.0, min(99.0, 100 * (1 - float(np.mean(y_pred_final)) / scale)))
         
         # Özellik önemliliği
         if hasattr(best_model, 'feature_importances_'):
@@ -181,17 +245,22 @@ class PredictionEngine:
         metrics = {
             'rmse': float(best_score),
             'accuracy': float(accuracy),
+            'wape': errors['wape'],
+            'mape': errors['mape'],
+            'bias': errors['bias'],
             'train_samples': len(X_train),
             'test_samples': len(X_test),
             'feature_importance': feature_importance
         }
         
         # Model ve scaler'ı kaydet
+        metrics_registry.inc('hismarketing_models_trained_total', model=type(best_model).__name__)
         self.models[product] = best_model
         self.scalers[product] = scaler
         
         return best_model, accuracy, metrics
     
+    @timed_stage('predict', count_rows=False)
     def predict_future(self, df: pd.DataFrame, product: str, feature_cols: List[str],
                       months: int = 6) -> List[float]:
         """
@@ -226,32 +295,35 @@ class PredictionEngine:
                 return [0] * months
         
         # Son veriyi al
-        df_product = df[df['product'] == product].sort_values('date').tail(1)
+        history = df[df['product'] == product]
+        df_product = history.sort_values('date').tail(1)
         
         if len(df_product) == 0:
             return [0] * months
         
+        # Birden fazla şubede satılan üründe son satırın şubesi yerine
+        # en çok satıldığı şubenin ili ve rekabet faktörü kullanılır
+        competition_factor = df_product['competition_factor'].iloc[0]
+        city = None
+        if 'city' in history.columns:
+            by_branch = history.groupby(['city', 'competition_factor'], sort=False)['quantity'].sum()
+            city, competition_factor = by_branch.idxmax()
+        
         # Gelecek özelliklerini oluştur
         predictions = []
         last_date = df_product['date'].iloc[0]
         
+        future_dates = [last_date + timedelta(days=30 * (i + 1)) for i in range(months)]
+        future_features = self.external_data.date_features(future_dates, DATE_FEATURES)
+        future_weather = self.external_data.weather_features(future_dates, city)
+        future_features[WEATHER_FEATURES] = future_weather[WEATHER_FEATURES].to_numpy()
+        
         for i in range(months):
-            # Bir sonraki ay
-            future_date = last_date + timedelta(days=30 * (i + 1))
-            
             # Özellikler
-            features = {
-                'year': future_date.year,
-                'month': future_date.month,
-                'day': 15,  # Ay ortası
-                'day_of_week': future_date.weekday(),
-                'week_of_year': future_date.isocalendar()[1],
-                'quarter': (future_date.month - 1) // 3 + 1,
-                'is_weekend': int(future_date.weekday() >= 5),
-                'seasonal_factor': self.external_data.get_seasonal_factor(future_date.month),
-                'is_special_day': 1 if self.external_data.is_special_day(future_date) else 0,
-                'time_index': df_product['time_index'].iloc[0] + 30 * (i + 1),
-            }
+            features = future_features.iloc[i].to_dict()
+            features['day'] = 15  # Ay ortası
+            features['time_index'] = df_product['time_index'].iloc[0] + 30 * (i + 1)
+            features['competition_factor'] = competition_factor
             
             # Lag ve rolling features - son tahminleri kullan
             if i == 0:
@@ -290,7 +362,8 @@ class PredictionEngine:
         return predictions
     
     def generate_predictions(self, df: pd.DataFrame, product_col: str, date_col: str,
-                           quantity_col: str, top_n: int = 20) -> Dict[str, Any]:
+                           quantity_col: str, top_n: int = 20, exclude_anomalies=None,
+                           location_col: str = None) -> Dict[str, Any]:
         """
         Tüm ürünler için tahmin oluştur
         
@@ -300,6 +373,8 @@ class PredictionEngine:
             date_col: Tarih sütunu
             quantity_col: Miktar sütunu
             top_n: En çok satan kaç ürün
+            exclude_anomalies: AnomalyResult verilirse ani artış günleri eğitimden çıkarılır
+            location_col: Şube/konum sütunu (opsiyonel, şube bazlı rekabet ve hava durumu)
             
         Returns:
             Tahmin sonuçları
@@ -309,17 +384,19 @@ class PredictionEngine:
         df['date'] = pd.to_datetime(df[date_col])
         df['quantity'] = pd.to_numeric(df[quantity_col], errors='coerce').fillna(0)
         
-        df_features = self.prepare_features(df, 'product', 'date', 'quantity')
+        # Aykırı günleri yalnızca eğitim verisinden çıkar (özetler tüm veriyi kullanır)
+        df_train = df
+        masked_rows = 0
+        if exclude_anomalies is not None:
+            masked = exclude_anomalies.row_mask(df['product'], df['date'])
+            masked_rows = int(masked.sum())
+            if masked_rows:
+                df_train = df[~masked]
+        
+        df_features = self.prepare_features(df_train, 'product', 'date', 'quantity', location_col)
         
         # Özellik sütunları
-        feature_cols = [
-            'year', 'month', 'day', 'day_of_week', 'week_of_year', 'quarter',
-            'is_weekend', 'seasonal_factor', 'is_special_day', 'time_index',
-            'lag_1', 'lag_7', 'lag_30',
-            'rolling_mean_7', 'rolling_std_7',
-            'rolling_mean_14', 'rolling_std_14',
-            'rolling_mean_30', 'rolling_std_30',
-        ]
+        feature_cols = FEATURE_COLUMNS
         
         # En çok satan ürünleri bul
         top_products = df.groupby('product')['quantity'].sum().nlargest(top_n).index.tolist()
@@ -328,8 +405,15 @@ class PredictionEngine:
         predictions = []
         total_accuracy = 0
         successful_models = 0
+        total_products = len(top_products)
+        
+        report_progress(self.progress, 'train_model', 'Modeller eğitiliyor', current=0, total=total_products)
         
-        for product in top_products:
+        for i, product in enumerate(top_products, 1):
+            # İptal edildiyse kalan ürünleri eğitme
+            if self.progress is not None:
+                self.progress.check_cancelled()
+            
             try:
                 # Model eğit
                 model, accuracy, metrics = self.train_model(
@@ -355,6 +439,10 @@ class PredictionEngine:
             except Exception as e:
                 print(f"Error predicting for {product}: {str(e)}")
                 continue
+            
+            finally:
+                report_progress(self.progress, 'train_model', f'{product} tamamlandı',
+                                current=i, total=total_products, product=str(product))
         
         # Ortalama doğruluk
         avg_accuracy = total_accuracy / successful_models if successful_models > 0 else 75.0
@@ -380,6 +468,7 @@ class PredictionEngine:
             })
         
         # Öneriler oluştur
+        report_progress(self.progress, 'recommend', 'Öneriler oluşturuluyor')
         recommendations = self.generate_recommendations(predictions, df)
         
         return {
@@ -394,10 +483,58 @@ class PredictionEngine:
                 'total_rows': len(df),
                 'date_range': f"{df['date'].min().strftime('%Y-%m-%d')} - {df['date'].max().strftime('%Y-%m-%d')}",
                 'unique_products': df['product'].nunique(),
-                'total_quantity': int(df['quantity'].sum())
+                'total_quantity': int(df['quantity'].sum()),
+                'masked_rows': masked_rows
             }
         }
     
+    def backtest(self, df: pd.DataFrame, product_col: str, date_col: str, quantity_col: str,
+                 top_n: int = None, folds: int = 3, horizon_days: int = 30,
+                 exclude_anomalies=None, location_col: str = None, n_jobs: int = None) -> Dict[str, Any]:
+        """
+        Kayan başlangıçlı geriye dönük test
+        
+        Özellikler generate_predictions ile aynı şekilde bir kez hazırlanır;
+        ürünler çekirdeklere dağıtılarak birden fazla kesimde sınanır.
+        
+        Args:
+            df: DataFrame
+            product_col: Ürün sütunu
+            date_col: Tarih sütunu
+            quantity_col: Miktar sütunu
+            top_n: En çok satan kaç ürün (None ise tüm ürünler)
+            folds: Kesim sayısı
+            horizon_days: Kesim başına sınama penceresi (gün)
+            exclude_anomalies: AnomalyResult verilirse ani artış günleri çıkarılır
+            location_col: Şube/konum sütunu (opsiyonel)
+            n_jobs: Paralel iş sayısı (varsayılan HISMARKETING_BACKTEST_JOBS)
+            
+        Returns:
+            Ürün ve model katmanı bazında WAPE, MAPE, sapma ve hesaplama süresi
+        """
+        from .backtesting import rolling_origin_backtest
+        
+        df['product'] = df[product_col]
+        df['date'] = pd.to_datetime(df[date_col])
+        df['quantity'] = pd.to_numeric(df[quantity_col], errors='coerce').fillna(0)
+        
+        if exclude_anomalies is not None:
+            masked = exclude_anomalies.row_mask(df['product'], df['date'])
+            if masked.any():
+                df = df[~masked]
+        
+        df_features = self.prepare_features(df, 'product', 'date', 'quantity', location_col)
+        
+        products = None
+        if top_n:
+            products = df.groupby('product')['quantity'].sum().nlargest(top_n).index.tolist()
+        
+        return rolling_origin_backtest(
+            df_features, FEATURE_COLUMNS, folds=folds, horizon_days=horizon_days,
+            products=products, n_jobs=n_jobs, progress=self.progress
+        )
+    
+    @timed_stage('recommend')
     def generate_recommendations(self, predictions: List[Dict], df: pd.DataFrame) -> List[Dict]:
         """
         Tahminlere dayalı öneriler oluştur
@@ -411,7 +548,10 @@ class PredictionEngine:
         """
         recommendations = []
         
-        for pred in predictions:
+        # Raf ömürleri tüm ürünler için tek çağrıda
+        shelf_lives = self.external_data.product_shelf_lives([pred['product'] for pred in predictions])
+        
+        for pred, shelf_life in zip(predictions, shelf_lives):
             product = pred['product']
             monthly_preds = pred['monthly_predictions']
             future_total = pred['total_predicted']
@@ -470,10 +610,15 @@ class PredictionEngine:
                 else:
                     rec += f" 🔻 Trend: Son 3 ayda ilk 3 aya göre %{abs(trend):.0f} azalma."
             
+            # Bozulabilir ürünler: stok artışı yerine sık ve küçük sipariş
+            if shelf_life <= 7:
+                rec += f" 🧊 Raf ömrü kısa ({shelf_life} gün): siparişleri sık ve küçük partiler halinde verin, fire oranını izleyin."
+            
             recommendations.append({
                 'product': product,
                 'recommendation': rec,
                 'change_percentage': round(change_pct, 1),
+                'shelf_life_days': int(shelf_life),
                 'priority': 'high' if abs(change_pct) > 20 else 'medium' if abs(change_pct) > 10 else 'low'
             })
         
@@ -0,0 +1,140 @@
+"""
+Product Query Module
+Ürün bazlı özet tablosu üzerinde sayfalı, sıralı ve aramalı sorgular
+"""
+
+import math
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+
+from .utils import turkish_lower
+
+
+class ProductQueryIndex:
+    """
+    Ürün özet tablosu ve sıralama indeksleri
+
+    Tablo veri seti başına bir kez oluşturulur. Her sıralama anahtarı için
+    sıralı pozisyon dizisi ve isim araması için küçük harfli sıralı isim
+    dizisi önceden hesaplanır; böylece her sayfa bir dilimleme işlemidir.
+    """
+
+    SORT_KEYS = ['quantity', 'revenue', 'profit', 'margin', 'name']
+    MAX_PAGE_SIZE = 500
+
+    def __init__(self, summary: pd.DataFrame):
+        """
+        Args:
+            summary: create_product_summary çıktısı
+                     (product, total_quantity, [total_revenue], [total_cost], profit)
+        """
+        n = len(summary)
+        self.size = n
+        self.names = summary['product'].astype(str).to_numpy()
+
+        def column(name):
+            if name in summary.columns:
+                return summary[name].fillna(0).to_numpy(dtype=float)
+            return np.zeros(n)
+
+        self.has_revenue = 'total_revenue' in summary.columns
+        self.has_cost = 'total_cost' in summary.columns
+
+        self.columns = {
+            'quantity': column('total_quantity'),
+            'revenue': column('total_revenue'),
+            'cost': column('total_cost'),
+            'profit': column('profit'),
+        }
+        revenue = self.columns['revenue']
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.columns['margin'] = np.where(revenue > 0, self.columns['profit'] / revenue * 100, 0.0)
+
+        # İsim araması için küçük harfli, sıralı isimler
+        folded = np.array([turkish_lower(name) for name in self.names], dtype=object)
+        self._name_order = np.argsort(folded, kind='stable')
+        self._folded_sorted = folded[self._name_order].astype(str)
+
+        # Sıralama anahtarı başına artan sıralı pozisyonlar
+        self._orders = {
+            key: np.argsort(self.columns[key], kind='stable')
+            for key in ['quantity', 'revenue', 'profit', 'margin']
+        }
+        self._orders['name'] = self._name_order
+
+    def _prefix_positions(self, prefix: str) -> np.ndarray:
+        """İsmi verilen önekle başlayan ürünlerin pozisyonları"""
+        folded = turkish_lower(prefix)
+        lo = np.searchsorted(self._folded_sorted, folded, side='left')
+        hi = np.searchsorted(self._folded_sorted, folded + '\uffff', side='left')
+        return self._name_order[lo:hi]
+
+    def _record(self, pos: int) -> Dict[str, Any]:
+        """Tek ürün kaydı"""
+        record = {
+            'product': self.names[pos],
+            'quantity': int(self.columns['quantity'][pos]),
+        }
+        if self.has_revenue:
+            record['revenue'] = float(self.columns['revenue'][pos])
+        if self.has_cost:
+            record['cost'] = float(self.columns['cost'][pos])
+        record['profit'] = float(self.columns['profit'][pos])
+        if self.has_revenue:
+            record['margin'] = round(float(self.columns['margin'][pos]), 2)
+        return record
+
+    def top(self, n: int, sort: str = 'quantity') -> List[Dict[str, Any]]:
+        """Seçilen anahtara göre en büyük n ürün"""
+        return [self._record(pos) for pos in self._orders[sort][::-1][:n]]
+
+    def query(self, sort: str = 'quantity', order: str = 'desc', page: int = 1,
+              page_size: int = 50, prefix: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Sayfalı ürün sorgusu
+
+        Args:
+            sort: Sıralama anahtarı (quantity, revenue, profit, margin, name)
+            order: 'asc' veya 'desc'
+            page: Sayfa numarası (1'den başlar)
+            page_size: Sayfa boyutu
+            prefix: Ürün adı öneki (opsiyonel)
+
+        Returns:
+            Sayfa sonuçları
+        """
+        if sort not in self.SORT_KEYS:
+            raise ValueError(f"Geçersiz sıralama anahtarı: {sort}")
+        if order not in ('asc', 'desc'):
+            raise ValueError(f"Geçersiz sıralama yönü: {order}")
+
+        page = max(1, int(page))
+        page_size = max(1, min(int(page_size), self.MAX_PAGE_SIZE))
+
+        if prefix:
+            positions = self._prefix_positions(prefix)
+            # Eşleşen alt küme kendi içinde sıralanır
+            if sort == 'name':
+                ordered = positions
+            else:
+                ordered = positions[np.argsort(self.columns[sort][positions], kind='stable')]
+        else:
+            ordered = self._orders[sort]
+
+        if order == 'desc':
+            ordered = ordered[::-1]
+
+        total = len(ordered)
+        start = (page - 1) * page_size
+        page_positions = ordered[start:start + page_size]
+
+        return {
+            'items': [self._record(pos) for pos in page_positions],
+            'total': total,
+            'page': page,
+            'page_size': page_size,
+            'pages': math.ceil(total / page_size) if total else 0,
+            'sort': sort,
+            'order': order,
+        }
@@ -0,0 +1,219 @@
+"""
+Profiling Module
+Yönetici isteğiyle veya örnekleme ile istek profili çıkarma
+
+Profil cProfile ile alınır ve girdi dosyasının parmak iziyle birlikte
+diske yazılır; yavaş bir müşteri dosyası dosyanın kendisi olmadan
+incelenebilir. Kayıtlı .prof dosyaları pstats veya snakeviz ile açılır.
+"""
+
+import cProfile
+import hashlib
+import io
+import json
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+
+PROFILE_DIR = os.environ.get('HISMARKETING_PROFILE_DIR', os.path.join('user_data', 'profiles'))
+
+# İsteklerin bu oranı işaret olmadan da profillenir (0 kapalı)
+PROFILE_SAMPLE_RATE = float(os.environ.get('HISMARKETING_PROFILE_SAMPLE', '0'))
+
+# Saklanacak en fazla profil; eskiler silinir
+PROFILE_KEEP = int(os.environ.get('HISMARKETING_PROFILE_KEEP', '50'))
+
+# Parmak izi için dosyanın başından ve sonundan okunacak bayt
+FINGERPRINT_SAMPLE_BYTES = 1024 * 1024
+
+# Özette gösterilecek fonksiyon sayısı
+TOP_FUNCTIONS = 25
+
+# Aynı anda tek profil: cProfile iş parçacığı başınadır, eşzamanlı profiller
+# birbirinin süresini bozar
+_active = threading.Lock()
+
+
+def sampled(rate: float = None) -> bool:
+    """Bu istek örnekleme ile profillenecek mi"""
+    rate = PROFILE_SAMPLE_RATE if rate is None else rate
+    return rate > 0 and random.random() < rate
+
+
+def file_fingerprint(filepath: str, sample_bytes: int = FINGERPRINT_SAMPLE_BYTES) -> Dict[str, Any]:
+    """
+    Girdi dosyasının parmak izi
+
+    Boyut ile ilk ve son sample_bytes baytın SHA-256 özeti; aynı dosyanın
+    yerelde yeniden üretilip üretilmediği bununla karşılaştırılır.
+
+    Args:
+        filepath: Dosya yolu
+        sample_bytes: Baştan ve sondan okunacak bayt
+
+    Returns:
+        {'size', 'sha256', 'extension'}
+    """
+    size = os.path.getsize(filepath)
+    digest = hashlib.sha256(str(size).encode())
+    with open(filepath, 'rb') as f:
+        digest.update(f.read(sample_bytes))
+        if size > sample_bytes:
+            f.seek(max(sample_bytes, size - sample_bytes))
+            digest.update(f.read(sample_bytes))
+    return {
+        'size': size,
+        'sha256': digest.hexdigest(),
+        'extension': filepath.rsplit('.', 1)[-1].lower(),
+    }
+
+
+class RequestProfile:
+    """
+    Tek isteğin profili
+
+    start() ve stop() aynı iş parçacığında çağrılmalıdır. Başka bir profil
+    çalışıyorsa start() False döner ve istek profillenmeden devam eder.
+    """
+
+    def __init__(self, endpoint: str, user_email: str, reason: str):
+        self.profile_id = uuid.uuid4().hex[:12]
+        self.endpoint = endpoint
+        self.user_email = user_email
+        self.reason = reason
+        self.profiler = cProfile.Profile()
+        self.started = None
+        self.seconds = None
+
+    def start(self) -> bool:
+        if not _active.acquire(blocking=False):
+            return False
+        self.started = time.perf_counter()
+        self.profiler.enable()
+        return True
+
+    def stop(self) -> None:
+        if self.seconds is not None:
+            return
+        self.profiler.disable()
+        self.seconds = time.perf_counter() - self.started
+        _active.release()
+
+    def top_functions(self, limit: int = TOP_FUNCTIONS) -> List[Dict[str, Any]]:
+        """Kümülatif süreye göre en pahalı fonksiyonlar"""
+        stats = pstats.Stats(self.profiler, stream=io.StringIO())
+        rows = []
+        for (filename, line, name), (_, calls, own, cumulative, _) in stats.stats.items():
+            rows.append({
+                'function': f"{os.path.basename(filename)}:{line}({name})",
+                'calls': calls,
+                'own_seconds': round(own, 4),
+                'cumulative_seconds': round(cumulative, 4),
+            })
+        rows.sort(key=lambda row: row['cumulative_seconds'], reverse=True)
+        return rows[:limit]
+
+    def save(self, status: int, fingerprint: Dict[str, Any] = None,
+             extra: Dict[str, Any] = None, directory: str = None) -> Dict[str, Any]:
+        """
+        Profili ve özet bilgisini diske yaz
+
+        Args:
+            status: HTTP yanıt kodu
+            fingerprint: Girdi dosyası parmak izi
+            extra: Ek bilgi (satır sayısı, sütunlar vb.)
+            directory: Profil klasörü (varsayılan PROFILE_DIR)
+
+        Returns:
+            Profil özet bilgisi
+        """
+        directory = directory or PROFILE_DIR
+        os.makedirs(directory, exist_ok=True)
+
+        self.profiler.dump_stats(os.path.join(directory, f'{self.profile_id}.prof'))
+        meta = {
+            'profile_id': self.profile_id,
+            'endpoint': self.endpoint,
+            'user_email': self.user_email,
+            'reason': self.reason,
+            'status': status,
+            'created_at': datetime.now().isoformat(timespec='seconds'),
+            'seconds': round(self.seconds, 4),
+            'fingerprint': fingerprint,
+            **(extra or {}),
+            'top_functions': self.top_functions(),
+        }
+        with open(os.path.join(directory, f'{self.profile_id}.json'), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2, default=str)
+
+        prune_profiles(directory=directory)
+        return meta
+
+
+def list_profiles(directory: str = None) -> List[Dict[str, Any]]:
+    """
+    Kayıtlı profiller (yeniden eskiye, fonksiyon listesi olmadan)
+
+    Returns:
+        Profil özet bilgileri
+    """
+    directory = directory or PROFILE_DIR
+    if not os.path.isdir(directory):
+        return []
+
+    profiles = []
+    for name in os.listdir(directory):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            continue
+        meta.pop('top_functions', None)
+        profiles.append(meta)
+
+    profiles.sort(key=lambda meta: meta.get('created_at', ''), reverse=True)
+    return profiles
+
+
+def load_profile(profile_id: str, directory: str = None) -> Optional[Dict[str, Any]]:
+    """Profil özet bilgisi (yoksa None)"""
+    path = profile_path(profile_id, '.json', directory)
+    if path is None:
+        return None
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def profile_path(profile_id: str, suffix: str = '.prof', directory: str = None) -> Optional[str]:
+    """Profil dosyasının yolu; geçersiz veya olmayan kimlikte None"""
+    if not profile_id.isalnum():
+        return None
+    path = os.path.join(directory or PROFILE_DIR, profile_id + suffix)
+    return path if os.path.exists(path) else None
+
+
+def prune_profiles(keep: int = None, directory: str = None) -> int:
+    """
+    En yeni keep profil dışındakileri sil
+
+    Returns:
+        Silinen profil sayısı
+    """
+    keep = PROFILE_KEEP if keep is None else keep
+    directory = directory or PROFILE_DIR
+    removed = 0
+    for meta in list_profiles(directory)[keep:]:
+        for suffix in ('.json', '.prof'):
+            path = os.path.join(directory, meta['profile_id'] + suffix)
+            if os.path.exists(path):
+                os.remove(path)
+        removed += 1
+    return removed
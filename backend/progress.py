@@ -0,0 +1,224 @@
+"""
+Progress Module
+Uzun süren analiz ve tahmin işleri için ilerleme olayları ve iptal desteği
+"""
+
+import json
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+
+class JobCancelled(Exception):
+    """İş kullanıcı tarafından iptal edildi"""
+    pass
+
+
+class ProgressJob:
+    """
+    Tek bir işin ilerleme olaylarını tutar
+
+    Olaylar sıralı bir listede saklanır; dinleyiciler kaldıkları indeksten
+    devam ederek yeni olayları bekler.
+    """
+
+    def __init__(self, job_id: str, owner: str, kind: str):
+        self.job_id = job_id
+        self.owner = owner
+        self.kind = kind
+        self.started_at = time.time()
+        self.updated_at = self.started_at
+        self.finished_at = None
+        self.status = 'running'
+        self.events: List[Dict[str, Any]] = []
+        self._stage_starts: Dict[str, float] = {}
+        self._cancelled = threading.Event()
+        self._condition = threading.Condition()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def finished(self) -> bool:
+        return self.status != 'running'
+
+    def publish(self, stage: str, message: str = None, current: int = None,
+                total: int = None, **extra) -> None:
+        """
+        Yeni ilerleme olayı yayınla
+
+        Args:
+            stage: Aşama adı (örn: 'prepare_features', 'train_model')
+            message: Kullanıcıya gösterilecek mesaj
+            current: Tamamlanan adım sayısı
+            total: Toplam adım sayısı
+        """
+        now = time.time()
+        elapsed = now - self.started_at
+        stage_started = self._stage_starts.setdefault(stage, now)
+        event = {
+            'job_id': self.job_id,
+            'stage': stage,
+            'message': message,
+            'elapsed': round(elapsed, 2),
+            **extra
+        }
+
+        if current is not None and total:
+            event['current'] = current
+            event['total'] = total
+            event['percent'] = round(current / total * 100, 1)
+            # Aşama başlangıcından bu yana geçen süreye göre kalan süre
+            stage_elapsed = now - stage_started
+            event['eta'] = round(stage_elapsed / current * (total - current), 1) if current > 0 else None
+
+        with self._condition:
+            self.events.append(event)
+            self.updated_at = now
+            self._condition.notify_all()
+
+    def check_cancelled(self) -> None:
+        """İş iptal edildiyse JobCancelled fırlat"""
+        if self.cancelled:
+            raise JobCancelled(self.job_id)
+
+    def cancel(self) -> None:
+        """İşi iptal et"""
+        self._cancelled.set()
+        with self._condition:
+            self._condition.notify_all()
+
+    def finish(self, status: str = 'done', message: str = None) -> None:
+        """İşi tamamla (done, cancelled veya error)"""
+        self.status = status
+        self.finished_at = time.time()
+        self.publish(status, message)
+
+    def wait_for_events(self, cursor: int, timeout: float) -> List[Dict[str, Any]]:
+        """
+        cursor indeksinden sonraki olayları döndür, yoksa timeout kadar bekle
+        """
+        with self._condition:
+            if len(self.events) <= cursor and not self.finished:
+                self._condition.wait(timeout)
+            return self.events[cursor:]
+
+
+class ProgressRegistry:
+    """
+    Süreç içindeki işlerin kaydı
+    """
+
+    # Biten işlerin olayları bu süre kadar saklanır (saniye)
+    FINISHED_TTL = 300
+
+    # Bu süre boyunca olay yayınlamayan bitmemiş işler (başlamadan kalan
+    # olay akışları, yanıt vermeyen işler) sonlandırılıp silinir (saniye)
+    IDLE_TTL = 1800
+
+    def __init__(self):
+        self._jobs: Dict[str, ProgressJob] = {}
+        self._lock = threading.Lock()
+
+    def create(self, job_id: str, owner: str, kind: str) -> ProgressJob:
+        """Yeni iş oluştur (aynı ID varsa yenisiyle değiştirilir)"""
+        job = ProgressJob(job_id, owner, kind)
+        with self._lock:
+            self._cleanup()
+            self._jobs[job_id] = job
+        return job
+
+    def get_or_create(self, job_id: str, owner: str, kind: str) -> Optional[ProgressJob]:
+        """
+        İşi getir, yoksa oluştur
+
+        İstemci olay akışını işin kendisinden önce açabildiği için iki taraf
+        da bu metodu kullanır. Başka kullanıcıya ait ID için None döner.
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                self._cleanup()
+                job = ProgressJob(job_id, owner, kind)
+                self._jobs[job_id] = job
+        if job.owner != owner:
+            return None
+        return job
+
+    def get(self, job_id: str, owner: str = None) -> Optional[ProgressJob]:
+        """İşi getir (owner verilirse sahiplik kontrol edilir)"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None or (owner is not None and job.owner != owner):
+            return None
+        return job
+
+    def _cleanup(self) -> None:
+        """Süresi dolan işleri temizle"""
+        now = time.time()
+        expired = []
+        for job_id, job in self._jobs.items():
+            if job.finished:
+                if now - job.finished_at > self.FINISHED_TTL:
+                    expired.append(job_id)
+            elif now - job.updated_at > self.IDLE_TTL:
+                # Bekleyen dinleyiciler akışı kapatır; iş hâlâ çalışıyorsa durur
+                job.cancel()
+                job.finish('error', 'İş zaman aşımına uğradı')
+                expired.append(job_id)
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+def stream_events(job: ProgressJob, heartbeat: float = 15.0,
+                  cancel_on_disconnect: bool = False) -> Iterator[str]:
+    """
+    İş olaylarını Server-Sent Events formatında üret
+
+    Args:
+        job: İzlenecek iş
+        heartbeat: Olay yoksa yorum satırı gönderme aralığı (saniye)
+        cancel_on_disconnect: İstemci bağlantıyı kapatırsa işi iptal et
+
+    Yields:
+        SSE mesajları
+    """
+    cursor = 0
+    try:
+        while True:
+            events = job.wait_for_events(cursor, timeout=heartbeat)
+            if not events:
+                if job.finished:
+                    break
+                yield ': keep-alive\n\n'
+                continue
+
+            for event in events:
+                yield f"data: {json.dumps(event, ensure_ascii=False)}\n\n"
+            cursor += len(events)
+
+            if job.finished and cursor >= len(job.events):
+                break
+    except GeneratorExit:
+        if cancel_on_disconnect and not job.finished:
+            job.cancel()
+        raise
+
+
+def report_progress(job: Optional[ProgressJob], stage: str, message: str = None,
+                    current: int = None, total: int = None, **extra) -> None:
+    """
+    İş varsa olay yayınla ve iptal kontrolü yap
+
+    Args:
+        job: İlerleme işi (None ise hiçbir şey yapılmaz)
+        stage: Aşama adı
+        message: Mesaj
+        current: Tamamlanan adım
+        total: Toplam adım
+    """
+    if job is None:
+        return
+    job.check_cancelled()
+    job.publish(stage, message, current=current, total=total, **extra)
@@ -0,0 +1,141 @@
+"""
+Reports Module
+Excel raporlarını sabit bellekle oluşturup parça parça akıtır
+"""
+
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from openpyxl import Workbook
+
+
+EXCEL_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+# Yanıta yazılan parça boyutu
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# (sayfa adı, başlıklar, satırlar)
+Sheet = Tuple[str, List[str], Iterable[List[Any]]]
+
+
+def _prediction_sheets(data: Dict[str, Any]) -> List[Sheet]:
+    """Tahmin raporu sayfaları"""
+    sheets = []
+    predictions = data.get('predictions') or []
+
+    if predictions:
+        months = data.get('prediction_months') or max(
+            len(pred.get('monthly_predictions', [])) for pred in predictions
+        )
+        headers = ['Ürün'] + [f'Ay {i}' for i in range(1, months + 1)] + ['Toplam']
+
+        def prediction_rows():
+            for pred in predictions:
+                values = list(pred.get('monthly_predictions', []))
+                values += [None] * (months - len(values))
+                yield [pred['product']] + values + [pred.get('total_predicted')]
+
+        sheets.append(('Tahminler', headers, prediction_rows()))
+
+    recommendations = data.get('recommendations') or []
+    if recommendations:
+        sheets.append((
+            'Öneriler',
+            ['Ürün', 'Öncelik', 'Değişim (%)', 'Öneri'],
+            ([rec['product'], rec.get('priority'), rec.get('change_percentage'), rec.get('recommendation')]
+             for rec in recommendations)
+        ))
+
+    return sheets
+
+
+def _analysis_sheets(data: Dict[str, Any]) -> List[Sheet]:
+    """Analiz raporu sayfaları"""
+    sheets = []
+
+    product_profits = data.get('product_profits') or []
+    if product_profits:
+        sheets.append((
+            'Ürün Kârları',
+            ['Ürün', 'Adet', 'Gelir', 'Kâr'],
+            ([row['product'], row.get('quantity'), row.get('revenue'), row.get('profit')]
+             for row in product_profits)
+        ))
+
+    monthly_sales = data.get('monthly_sales') or []
+    if monthly_sales:
+        sheets.append((
+            'Aylık Satışlar',
+            ['Ay', 'Satış'],
+            ([row['month'], row.get('sales')] for row in monthly_sales)
+        ))
+
+    return sheets
+
+
+def build_report_sheets(prediction: Optional[Dict] = None,
+                        analysis: Optional[Dict] = None) -> List[Sheet]:
+    """
+    Rapor verisinden Excel sayfalarını oluştur
+
+    Args:
+        prediction: Tahmin raporu (opsiyonel)
+        analysis: Analiz raporu (opsiyonel)
+
+    Returns:
+        Sayfa listesi (satırlar tembel olarak üretilir)
+    """
+    sheets = []
+    if prediction:
+        sheets.extend(_prediction_sheets(prediction))
+    if analysis:
+        sheets.extend(_analysis_sheets(analysis))
+    return sheets
+
+
+def write_excel_report(sheets: List[Sheet], fileobj) -> None:
+    """
+    Sayfaları write-only çalışma kitabına yaz
+
+    Satırlar tek tek diske aktarıldığı için bellek kullanımı
+    satır sayısından bağımsızdır.
+
+    Args:
+        sheets: Sayfa listesi
+        fileobj: Hedef dosya nesnesi
+    """
+    wb = Workbook(write_only=True)
+
+    for title, headers, rows in sheets:
+        ws = wb.create_sheet(title=title[:31])
+        ws.append(headers)
+        for row in rows:
+            ws.append(row)
+
+    # Boş rapor da geçerli bir çalışma kitabı olmalı
+    if not sheets:
+        wb.create_sheet(title='Rapor')
+
+    wb.save(fileobj)
+
+
+def stream_excel_report(sheets: List[Sheet], chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Excel raporunu geçici dosya üzerinden parça parça döndür
+
+    Args:
+        sheets: Sayfa listesi
+        chunk_size: Parça boyutu (byte)
+
+    Yields:
+        Dosya parçaları
+    """
+    with tempfile.TemporaryFile(suffix='.xlsx') as tmp:
+        write_excel_report(sheets, tmp)
+        tmp.seek(0)
+
+        while True:
+            chunk = tmp.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
@@ -0,0 +1,411 @@
+"""
+Sales Cube Module
+Ürün × ay × (kategori, konum, tedarikçi) üzerinde önceden toplanmış satış küpü
+Konum sütunu varsa il ve bölge boyutları konumdan türetilir
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+
+from .locations import UNKNOWN_REGION, location_attributes
+from .utils import group_codes, aggregate_by_codes
+
+
+class SalesCube:
+    """
+    Veri seti başına bir kez oluşturulan satış küpü
+
+    Her hücre bir (ürün, ay, boyutlar...) kombinasyonudur ve miktar, gelir,
+    maliyet toplamlarıyla satır sayısını tutar. Özetler, aylık trendler ve
+    kırılımlar ham satırlar yerine hücreler üzerinden toplanarak hesaplanır.
+    """
+
+    DIMENSIONS = ['category', 'location', 'supplier']
+    LOCATION_DIMENSIONS = ['city', 'region']
+    MEASURES = ['quantity', 'revenue', 'cost']
+
+    # Tarihi olmayan satırların ay kodu
+    UNKNOWN_MONTH = -1
+
+    def __init__(self, cells: pd.DataFrame, keys: List[str], measures: List[str], row_count: int):
+        self.cells = cells
+        self.keys = keys
+        self.measures = measures
+        self.row_count = row_count
+        self._build_indexes()
+
+    def _build_indexes(self) -> None:
+        """
+        Boyut başına grup indeksleri
+
+        Her boyut için hücre başına tamsayı kod, benzersiz değerler ve
+        değer -> kod sözlüğü bir kez hesaplanır. Filtreler ve kırılımlar
+        bu kodlar üzerinde çalışır.
+        """
+        self._codes = {}
+        self._uniques = {}
+        self._lookup = {}
+        for key in self.keys:
+            try:
+                codes, uniques = pd.factorize(self.cells[key], sort=True)
+            except TypeError:
+                # Karışık tipli değerler sıralanamaz
+                codes, uniques = pd.factorize(self.cells[key], sort=False)
+            self._codes[key] = codes
+            self._uniques[key] = uniques
+            self._lookup[key] = {str(value): code for code, value in enumerate(uniques)}
+        self._values = {m: self.cells[m].to_numpy(dtype=float) for m in self.measures}
+        self._values['count'] = self.cells['count'].to_numpy(dtype=float)
+
+    @classmethod
+    def build(cls, df: pd.DataFrame, di) -> 'SalesCube':
+        """
+        Hazırlanmış DataFrame'den küpü oluştur
+
+        Args:
+            df: prepare_dataframe çıktısı
+            di: Sütunları algılamış DataIntelligence
+
+        Returns:
+            SalesCube
+        """
+        key_data = {}
+
+        product_col = di.get_column('product')
+        if product_col and product_col in df.columns:
+            key_data['product'] = df[product_col]
+
+        date_col = di.get_column('date')
+        if date_col and date_col in df.columns:
+            dates = pd.to_datetime(df[date_col], errors='coerce')
+            month = (dates.dt.year * 12 + dates.dt.month - 1).fillna(cls.UNKNOWN_MONTH)
+            key_data['month'] = month.astype(np.int64)
+
+        for dim in cls.DIMENSIONS:
+            col = di.get_column(dim)
+            # Aynı sütun birden fazla tipe eşleşmişse tekrar ekleme
+            if col and col in df.columns and col not in (product_col, date_col):
+                key_data[dim] = df[col]
+
+        # Konumdan türetilen il ve bölge boyutları (hücre sayısını artırmaz)
+        if 'location' in key_data:
+            attributes = location_attributes(key_data['location'])
+            for dim in cls.LOCATION_DIMENSIONS:
+                key_data[dim] = np.where(pd.isna(attributes[dim]), UNKNOWN_REGION, attributes[dim])
+
+        keys = list(key_data.keys())
+        measures = [m for m in cls.MEASURES if di.get_column(m) and di.get_column(m) in df.columns]
+        values = {m: pd.to_numeric(df[di.get_column(m)], errors='coerce').to_numpy(dtype=float) for m in measures}
+
+        if keys:
+            key_frame_input = pd.DataFrame(key_data)
+            codes, cells = group_codes(key_frame_input, keys)
+        else:
+            codes = np.zeros(len(df), dtype=np.int64)
+            cells = pd.DataFrame(index=range(1 if len(df) else 0))
+
+        agg = aggregate_by_codes(codes, len(cells), values, {m: ['sum'] for m in measures})
+        for m in measures:
+            cells[m] = agg[f'sum_{m}']
+        cells['count'] = np.bincount(codes[codes >= 0], minlength=len(cells)).astype(np.int64)
+
+        return cls(cells.reset_index(drop=True), keys, measures, len(df))
+
+    def merge(self, other: 'SalesCube') -> 'SalesCube':
+        """
+        İki küpü birleştir (örn: mevcut veri + yeni eklenen satırlar)
+
+        Args:
+            other: Aynı sütun eşleştirmesiyle oluşturulmuş küp
+
+        Returns:
+            Yeni SalesCube
+        """
+        return SalesCube.combine([self, other])
+
+    @classmethod
+    def combine(cls, cubes: List['SalesCube']) -> 'SalesCube':
+        """
+        Birden fazla küpü tek küpte birleştir
+
+        Hücreler aynı anahtarlarla yeniden gruplanıp toplanır; maliyet
+        satır sayısına değil hücre sayısına bağlıdır. Parça parça analizde
+        her parçanın küpü bu şekilde katlanır.
+
+        Args:
+            cubes: Aynı sütun eşleştirmesiyle oluşturulmuş küpler
+
+        Returns:
+            Yeni SalesCube
+        """
+        first = cubes[0]
+        for cube in cubes[1:]:
+            if cube.keys != first.keys or cube.measures != first.measures:
+                raise ValueError("Küpler farklı boyut veya ölçülere sahip")
+
+        keys, measures = first.keys, first.measures
+        cells = pd.concat([cube.cells for cube in cubes], ignore_index=True)
+
+        if keys:
+            codes, merged = group_codes(cells[keys], keys)
+        else:
+            codes = np.zeros(len(cells), dtype=np.int64)
+            merged = pd.DataFrame(index=range(1 if len(cells) else 0))
+
+        columns = measures + ['count']
+        values = {col: cells[col].to_numpy(dtype=float) for col in columns}
+        agg = aggregate_by_codes(codes, len(merged), values, {col: ['sum'] for col in columns})
+        for col in measures:
+            merged[col] = agg[f'sum_{col}']
+        merged['count'] = agg['sum_count'].astype(np.int64)
+
+        return cls(merged.reset_index(drop=True), keys, measures, sum(cube.row_count for cube in cubes))
+
+    @staticmethod
+    def month_label(code: int) -> str:
+        """Ay kodunu 'YYYY-MM' biçimine çevir"""
+        return f"{code // 12:04d}-{code % 12 + 1:02d}"
+
+    @staticmethod
+    def _month_code(value: str) -> int:
+        """'YYYY-MM' değerini ay koduna çevir"""
+        try:
+            year, month = map(int, str(value).split('-')[:2])
+        except ValueError:
+            raise ValueError(f"Geçersiz ay: {value} (YYYY-MM bekleniyor)")
+        if not 1 <= month <= 12:
+            raise ValueError(f"Geçersiz ay: {value} (YYYY-MM bekleniyor)")
+        return year * 12 + month - 1
+
+    def _mask(self, filters: Optional[Dict[str, Any]] = None,
+              start_month: str = None, end_month: str = None) -> np.ndarray:
+        """Filtrelere uyan hücrelerin maskesi"""
+        mask = np.ones(len(self.cells), dtype=bool)
+
+        for key, value in (filters or {}).items():
+            if key not in self.keys:
+                raise ValueError(f"Bilinmeyen boyut: {key}")
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            if key == 'month':
+                values = [self._month_code(v) if isinstance(v, str) else v for v in values]
+            wanted = [self._lookup[key][str(v)] for v in values if str(v) in self._lookup[key]]
+            mask &= np.isin(self._codes[key], wanted)
+
+        if (start_month or end_month) and 'month' in self.keys:
+            month = self.cells['month'].to_numpy()
+            if start_month:
+                mask &= month >= self._month_code(start_month)
+            if end_month:
+                mask &= (month <= self._month_code(end_month)) & (month != self.UNKNOWN_MONTH)
+
+        return mask
+
+    def filter(self, filters: Optional[Dict[str, Any]] = None,
+               start_month: str = None, end_month: str = None) -> pd.DataFrame:
+        """
+        Filtrelenmiş küp hücreleri
+
+        Args:
+            filters: Boyut -> değer veya değer listesi
+            start_month: Başlangıç ayı ('YYYY-MM', dahil)
+            end_month: Bitiş ayı ('YYYY-MM', dahil)
+
+        Returns:
+            Hücre DataFrame'i
+        """
+        mask = self._mask(filters, start_month, end_month)
+        return self.cells if mask.all() else self.cells[mask]
+
+    def rollup(self, by: List[str], filters: Optional[Dict[str, Any]] = None,
+               start_month: str = None, end_month: str = None) -> pd.DataFrame:
+        """
+        Seçilen boyutlara göre küpü topla
+
+        Boyut kodları karma tabanlı tek bir grup koduna birleştirilir ve
+        ölçüler np.bincount ile toplanır.
+
+        Args:
+            by: Gruplama boyutları (boş ise genel toplam)
+            filters: Boyut filtreleri
+            start_month: Başlangıç ayı
+            end_month: Bitiş ayı
+
+        Returns:
+            Boyutlar + ölçü toplamları + satır sayısı
+        """
+        for key in by:
+            if key not in self.keys:
+                raise ValueError(f"Bilinmeyen boyut: {key}")
+
+        columns = self.measures + ['count']
+        mask = self._mask(filters, start_month, end_month)
+
+        if not by:
+            return pd.DataFrame([{col: self._values[col][mask].sum() for col in columns}])
+
+        # Tarihi olmayan satırlar aylık kırılımda yer almaz
+        if 'month' in by:
+            mask &= self.cells['month'].to_numpy() != self.UNKNOWN_MONTH
+
+        sizes = [len(self._uniques[key]) for key in by]
+        combined = np.zeros(int(mask.sum()), dtype=np.int64)
+        for key, size in zip(by, sizes):
+            combined = combined * size + self._codes[key][mask]
+
+        group_ids, inverse = np.unique(combined, return_inverse=True)
+
+        result = {}
+        # Birleşik koddan boyut kodlarını geri çöz
+        remaining = group_ids
+        decoded = {}
+        for key, size in reversed(list(zip(by, sizes))):
+            decoded[key] = remaining % size
+            remaining = remaining // size
+        for key in by:
+            result[key] = self._uniques[key].take(decoded[key])
+
+        for col in columns:
+            result[col] = np.bincount(inverse, weights=self._values[col][mask], minlength=len(group_ids))
+        result['count'] = result['count'].astype(np.int64)
+
+        return pd.DataFrame(result)
+
+    def drilldown(self, by: List[str], filters: Optional[Dict[str, Any]] = None,
+                  start_month: str = None, end_month: str = None, limit: int = 1000) -> Dict[str, Any]:
+        """
+        Boyut kırılımı (API yanıtı için)
+
+        Args:
+            by: Gruplama boyutları
+            filters: Boyut filtreleri
+            start_month: Başlangıç ayı
+            end_month: Bitiş ayı
+            limit: En fazla satır sayısı
+
+        Returns:
+            Satırlar, toplamlar ve satır sayısı
+        """
+        rolled = self.rollup(by, filters, start_month, end_month)
+        totals = self.rollup([], filters, start_month, end_month).iloc[0]
+
+        if 'revenue' in rolled.columns and 'cost' in rolled.columns:
+            rolled['profit'] = rolled['revenue'] - rolled['cost']
+
+        if 'month' in by:
+            rolled = rolled.sort_values(['month'] + [k for k in by if k != 'month'], kind='stable')
+            rolled['month'] = [self.month_label(code) for code in rolled['month']]
+        elif 'quantity' in rolled.columns:
+            rolled = rolled.sort_values('quantity', ascending=False, kind='stable')
+
+        total_rows = len(rolled)
+        rolled = rolled.head(limit)
+
+        total_values = {col: float(totals[col]) for col in self.measures}
+        total_values['count'] = int(totals['count'])
+        if 'revenue' in total_values and 'cost' in total_values:
+            total_values['profit'] = total_values['revenue'] - total_values['cost']
+
+        return {
+            'by': by,
+            'rows': [
+                {key: (value.item() if hasattr(value, 'item') else value) for key, value in row.items()}
+                for row in rolled.to_dict('records')
+            ],
+            'total_rows': total_rows,
+            'truncated': total_rows > limit,
+            'totals': total_values,
+        }
+
+    def dimension_values(self, key: str) -> List[Any]:
+        """Boyutun benzersiz değerleri"""
+        if key not in self.keys:
+            raise ValueError(f"Bilinmeyen boyut: {key}")
+        if key == 'month':
+            return [self.month_label(code) for code in self._uniques[key] if code != self.UNKNOWN_MONTH]
+        return self._uniques[key].tolist()
+
+    def monthly_series(self, measure: str = 'quantity', filters: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """
+        Aylık toplam serisi (create_monthly_aggregation ile aynı biçim)
+
+        Returns:
+            year_month, measure sütunlu DataFrame (aya göre sıralı)
+        """
+        if 'month' not in self.keys:
+            return pd.DataFrame(columns=['year_month', measure])
+
+        monthly = self.rollup(['month'], filters).sort_values('month')
+        return pd.DataFrame({
+            'year_month': [self.month_label(code) for code in monthly['month']],
+            measure: monthly[measure].to_numpy()
+        })
+
+    def product_summary(self, filters: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """
+        Ürün özeti (create_product_summary ile aynı biçim)
+        """
+        rolled = self.rollup(['product'], filters)
+
+        summary = pd.DataFrame({
+            'product': rolled['product'],
+            'total_quantity': rolled['quantity'] if 'quantity' in rolled.columns else 0,
+        })
+        if 'revenue' in rolled.columns:
+            summary['total_revenue'] = rolled['revenue']
+        if 'cost' in rolled.columns:
+            summary['total_cost'] = rolled['cost']
+
+        if 'total_revenue' in summary.columns and 'total_cost' in summary.columns:
+            summary['profit'] = summary['total_revenue'] - summary['total_cost']
+        elif 'total_revenue' in summary.columns:
+            summary['profit'] = summary['total_revenue']
+        else:
+            summary['profit'] = 0
+
+        if 'total_revenue' in summary.columns:
+            revenue = summary['total_revenue'].to_numpy()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                summary['margin'] = np.where(revenue > 0, summary['profit'].to_numpy() / revenue * 100, 0.0)
+
+        return summary.sort_values('total_quantity', ascending=False, kind='stable').reset_index(drop=True)
+
+    def summary_statistics(self) -> Dict[str, Any]:
+        """
+        Özet istatistikler (DataIntelligence.get_summary_statistics ile aynı anahtarlar)
+        """
+        stats = {}
+        totals = self.cells[self.measures + ['count']].sum()
+        rows = int(totals['count'])
+
+        if 'product' in self.keys:
+            counts = self.rollup(['product'])[['product', 'count']]
+            counts = counts.sort_values('count', ascending=False, kind='stable')
+            stats['unique_products'] = int(len(counts))
+            stats['top_products'] = dict(zip(counts['product'].head(10), counts['count'].head(10).astype(int)))
+
+        if 'quantity' in self.measures:
+            stats['total_quantity'] = int(totals['quantity'])
+            stats['avg_quantity'] = float(totals['quantity'] / rows) if rows else 0.0
+
+        if 'revenue' in self.measures:
+            stats['total_revenue'] = float(totals['revenue'])
+            stats['avg_revenue'] = float(totals['revenue'] / rows) if rows else 0.0
+
+        if 'cost' in self.measures:
+            stats['total_cost'] = float(totals['cost'])
+
+        if 'revenue' in self.measures and 'cost' in self.measures:
+            stats['total_profit'] = stats['total_revenue'] - stats['total_cost']
+            stats['profit_margin'] = (stats['total_profit'] / stats['total_revenue'] * 100) if stats['total_revenue'] > 0 else 0
+
+        return stats
+
+    def info(self) -> Dict[str, Any]:
+        """Küp hakkında kısa bilgi"""
+        return {
+            'rows': self.row_count,
+            'cells': len(self.cells),
+            'dimensions': self.keys,
+            'measures': self.measures,
+        }
@@ -0,0 +1,105 @@
+"""
+Shelf Life Module
+Ürün adlarından raf ömrü sınıflandırması
+
+Tüm anahtar kelimeler tek bir düzenli ifadede derlenir; bir ürün sütunu
+tekil adlar üzerinden tek çağrıda sınıflandırılır.
+"""
+
+import re
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+from .metrics import lru_cache_collector, metrics
+from .utils import turkish_fold
+
+
+# (kategori, raf ömrü (gün), anahtar kelimeler); birden fazla kural eşleşirse
+# listede önce gelen kazanır
+SHELF_LIFE_RULES: List[Tuple[str, int, List[str]]] = [
+    ('dairy', 7, ['süt', 'milk', 'yoğurt', 'yogurt', 'peynir', 'cheese']),
+    ('meat', 3, ['et', 'meat', 'tavuk', 'chicken', 'balık', 'fish']),
+    ('produce', 5, ['sebze', 'vegetable', 'meyve', 'fruit']),
+    ('bakery', 2, ['ekmek', 'bread']),
+    ('shelf_stable', 365, ['konserve', 'canned', 'makarna', 'pasta', 'pirinç', 'rice']),
+]
+
+DEFAULT_SHELF_LIFE = 30
+
+
+class ShelfLifeClassifier:
+    """
+    Derlenmiş raf ömrü sınıflandırıcısı
+
+    Ad ve anahtar kelimeler Türkçe kurallarla küçültülüp ASCII'ye katlanır
+    ('SÜT', 'Süt', 'Sut' aynıdır). Anahtar kelimeler kelime başında aranır:
+    'Etli Ekmek' et, 'Paket Şeker' ise et değildir. Sonuçlar tekil ad
+    başına önbelleklenir.
+    """
+
+    def __init__(self, rules: List[Tuple[str, int, List[str]]] = None,
+                 default: int = DEFAULT_SHELF_LIFE, cache_size: int = 262144):
+        self.rules = rules if rules is not None else SHELF_LIFE_RULES
+        self.default = default
+
+        # Kural başına bir yakalama grubu: (kw1|kw2)|(kw3|kw4)|...
+        groups = []
+        for _, _, keywords in self.rules:
+            folded = sorted({turkish_fold(word) for word in keywords}, key=len, reverse=True)
+            groups.append('(' + '|'.join(re.escape(word) for word in folded) + ')')
+        self.pattern = re.compile(r'\b(?:' + '|'.join(groups) + ')')
+
+        # Son eleman varsayılandır: eşleşmeyen (-1) sıralar ona düşer
+        self._days = np.array([days for _, days, _ in self.rules] + [default], dtype=np.int64)
+        self._rule_index = lru_cache(maxsize=cache_size)(self._match)
+
+    def _match(self, name: str) -> int:
+        """Eşleşen en öncelikli kuralın sırası (yoksa -1)"""
+        best = len(self.rules)
+        for match in self.pattern.finditer(turkish_fold(name)):
+            best = min(best, match.lastindex - 1)
+            if best == 0:
+                break
+        return best if best < len(self.rules) else -1
+
+    def category(self, name: str) -> Optional[str]:
+        """Ürünün raf ömrü kategorisi (eşleşme yoksa None)"""
+        index = self._rule_index(str(name))
+        return self.rules[index][0] if index >= 0 else None
+
+    def days(self, name: str, category: str = None) -> int:
+        """Tek ürünün raf ömrü (gün); ad eşleşmezse kategori denenir"""
+        index = self._rule_index(str(name))
+        if index < 0 and category:
+            index = self._rule_index(str(category))
+        return int(self._days[index])
+
+    def _indices(self, values) -> np.ndarray:
+        """Değer başına kural sırası; her tekil değer bir kez sınıflandırılır"""
+        codes, uniques = pd.factorize(pd.Series(np.asarray(values, dtype=object)))
+        unique_indices = np.array([self._rule_index(str(value)) for value in uniques], dtype=np.int64)
+        # NaN (-1 kodu) eşleşmez
+        return np.where(codes >= 0, unique_indices[codes] if len(uniques) else -1, -1)
+
+    def classify(self, products, categories=None) -> np.ndarray:
+        """
+        Ürün sütununun raf ömürleri (gün)
+
+        Args:
+            products: Ürün adları (dizi veya Series)
+            categories: Satır başına kategori (opsiyonel); adı eşleşmeyen ürünlerde kullanılır
+
+        Returns:
+            int64 dizisi
+        """
+        indices = self._indices(products)
+        if categories is not None:
+            indices = np.where(indices >= 0, indices, self._indices(categories))
+        return self._days[indices]
+
+
+shelf_life_classifier = ShelfLifeClassifier()
+
+metrics.register_collector(lru_cache_collector('shelf_life', shelf_life_classifier._rule_index))
@@ -0,0 +1,314 @@
+"""
+Sketches Module
+Çok büyük dosyalar için tek geçişte, sınırlı bellekle yaklaşık analiz
+- HyperLogLog: farklı değer sayısı
+- KLL: yüzdelikler (medyan, p90, p99)
+- Misra-Gries: en sık görülen değerler
+"""
+
+import math
+import numpy as np
+import pandas as pd
+from typing import Any, Dict, List, Optional
+
+
+def _hash_values(values) -> np.ndarray:
+    """Değerleri 64 bit hash'e çevir (süreçten bağımsız, deterministik)"""
+    return pd.util.hash_array(np.asarray(values, dtype=object))
+
+
+def _bit_length(x: np.ndarray) -> np.ndarray:
+    """uint64 dizisi için bit uzunluğu (vektörel)"""
+    hi = (x >> np.uint64(32)).astype(np.float64)
+    lo = (x & np.uint64(0xFFFFFFFF)).astype(np.float64)
+    # frexp 2^53'e kadar tamsayılar için tam bit uzunluğunu verir
+    return np.where(hi > 0, 32 + np.frexp(hi)[1], np.frexp(lo)[1])
+
+
+class HyperLogLog:
+    """
+    Farklı değer sayısı tahmini
+
+    2^p register kullanır; göreli standart hata 1.04 / sqrt(2^p).
+    """
+
+    def __init__(self, p: int = 14):
+        self.p = p
+        self.m = 1 << p
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def update(self, values) -> None:
+        """Değer dizisini ekle"""
+        if len(values) == 0:
+            return
+        hashes = _hash_values(values)
+        index = (hashes >> np.uint64(64 - self.p)).astype(np.int64)
+        rest_bits = 64 - self.p
+        rest = hashes & np.uint64((1 << rest_bits) - 1)
+        rank = (rest_bits - _bit_length(rest) + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other: 'HyperLogLog') -> None:
+        """Başka bir sketch ile birleştir"""
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    @property
+    def relative_error(self) -> float:
+        """Göreli standart hata"""
+        return 1.04 / math.sqrt(self.m)
+
+    def estimate(self) -> float:
+        """Farklı değer sayısı tahmini"""
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.power(2.0, -self.registers.astype(np.float64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        # Küçük değerlerde doğrusal sayım daha isabetli
+        if raw <= 2.5 * m and zeros > 0:
+            return m * math.log(m / zeros)
+        return float(raw)
+
+    def result(self) -> Dict[str, Any]:
+        """Tahmin ve ~%95 güven aralığı"""
+        estimate = self.estimate()
+        margin = 2 * self.relative_error * estimate
+        return {
+            'estimate': int(round(estimate)),
+            'lower': int(max(0, math.floor(estimate - margin))),
+            'upper': int(math.ceil(estimate + margin)),
+            'relative_std_error': round(self.relative_error, 4),
+        }
+
+
+class KLLSketch:
+    """
+    Yüzdelik tahmini (KLL sketch)
+
+    Seviye h'deki her öğe 2^h ağırlık taşır; dolan seviyeler sıralanıp
+    rastgele yarısı bir üst seviyeye taşınır. Bellek yaklaşık 3k öğedir.
+    """
+
+    def __init__(self, k: int = 200, seed: int = 42):
+        self.k = k
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level: int) -> int:
+        """Seviye kapasitesi (üst seviyeler en büyük)"""
+        depth = len(self.levels) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def update(self, values) -> None:
+        """Sayısal değer dizisini ekle (NaN değerler atlanır)"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        self.count += len(values)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compress()
+
+    def merge(self, other: 'KLLSketch') -> None:
+        """Başka bir sketch ile birleştir"""
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for h, level in enumerate(other.levels):
+            self.levels[h] = np.concatenate([self.levels[h], level])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+    def _compress(self) -> None:
+        """Kapasiteyi aşan seviyeleri alttan üste sıkıştır"""
+        h = 0
+        while h < len(self.levels):
+            if len(self.levels[h]) >= self._capacity(h):
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                level = np.sort(self.levels[h])
+                # Tek sayıda öğe varsa biri bu seviyede kalır
+                keep, level = (level[:1], level[1:]) if len(level) % 2 else (level[:0], level)
+                promoted = level[int(self._rng.integers(2))::2]
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    @property
+    def rank_error(self) -> float:
+        """
+        Normalize sıra hatası (tek yüzdelik sorgusu, ~%99 güven)
+        Apache DataSketches KLL için verilen yaklaşık formül
+        """
+        return 2.296 / self.k ** 0.9723
+
+    def quantiles(self, qs: List[float]) -> Dict[str, Optional[float]]:
+        """İstenen yüzdelikler"""
+        if self.count == 0:
+            return {f'p{int(q * 100)}': None for q in qs}
+
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2 ** h, dtype=np.float64) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items = items[order]
+        cumulative = np.cumsum(weights[order])
+        total = cumulative[-1]
+
+        result = {}
+        for q in qs:
+            pos = int(np.searchsorted(cumulative, q * total, side='left'))
+            result[f'p{int(q * 100)}'] = float(items[min(pos, len(items) - 1)])
+        return result
+
+    def result(self, qs: List[float] = (0.5, 0.9, 0.99)) -> Dict[str, Any]:
+        """Yüzdelikler ve hata sınırı"""
+        return {
+            'count': self.count,
+            'min': self.min if self.count else None,
+            'max': self.max if self.count else None,
+            'quantiles': self.quantiles(list(qs)),
+            'rank_error': round(self.rank_error, 4),
+            'retained_items': int(sum(len(level) for level in self.levels)),
+        }
+
+
+class HeavyHitters:
+    """
+    En sık görülen değerler (birleştirilebilir Misra-Gries özeti)
+
+    En fazla k sayaç tutulur. Tahmin edilen sayı gerçek sayıdan en fazla
+    `error` kadar küçüktür; error <= n / (k + 1).
+    """
+
+    def __init__(self, k: int = 100):
+        self.k = k
+        self.counters = pd.Series(dtype=np.float64)
+        self.total = 0
+        self.error = 0.0
+
+    def update(self, values, weights=None) -> None:
+        """Değer dizisini (opsiyonel ağırlıklarla) ekle"""
+        if len(values) == 0:
+            return
+        if weights is None:
+            counts = pd.Series(values).value_counts(dropna=True).astype(np.float64)
+        else:
+            counts = pd.Series(np.asarray(weights, dtype=np.float64)).groupby(np.asarray(values)).sum()
+        self.total += float(counts.sum())
+        self._merge_counts(counts)
+
+    def merge(self, other: 'HeavyHitters') -> None:
+        """Başka bir özet ile birleştir"""
+        self.total += other.total
+        self.error += other.error
+        self._merge_counts(other.counters)
+
+    def _merge_counts(self, counts: pd.Series) -> None:
+        """Sayaçları birleştir ve k'yı aşıyorsa (k+1). değeri düş"""
+        combined = self.counters.add(counts, fill_value=0)
+        if len(combined) > self.k:
+            threshold = float(combined.nlargest(self.k + 1).iloc[-1])
+            combined = combined - threshold
+            combined = combined[combined > 0]
+            self.error += threshold
+        self.counters = combined
+
+    def result(self, top: int = 10) -> Dict[str, Any]:
+        """En sık değerler ve sayı aralıkları"""
+        items = self.counters.nlargest(top)
+        return {
+            'items': [
+                {
+                    'value': value.item() if hasattr(value, 'item') else value,
+                    'count_lower': float(count),
+                    'count_upper': float(count + self.error),
+                }
+                for value, count in items.items()
+            ],
+            'max_count_error': float(self.error),
+            'error_bound': float(self.total / (self.k + 1)),
+        }
+
+
+class SketchProfile:
+    """
+    Hazırlanmış veri parçalarından tek geçişte yaklaşık profil
+
+    Bellek kullanımı satır sayısından bağımsızdır; toplamlar kesin,
+    farklı sayı, yüzdelik ve sık değerler yaklaşıktır.
+    """
+
+    NUMERIC_TYPES = ['quantity', 'price', 'revenue', 'cost']
+
+    def __init__(self, di, hll_precision: int = 14, kll_k: int = 200, heavy_hitters_k: int = 100):
+        self.di = di
+        self.rows = 0
+        self.product_distinct = HyperLogLog(hll_precision)
+        self.product_frequency = HeavyHitters(heavy_hitters_k)
+        self.quantiles = {t: KLLSketch(kll_k) for t in self.NUMERIC_TYPES if di.get_column(t)}
+        self.sums = {t: 0.0 for t in self.quantiles}
+        self.missing = {t: 0 for t in self.quantiles}
+        self.date_min = None
+        self.date_max = None
+
+    def update(self, chunk: pd.DataFrame) -> None:
+        """
+        prepare_dataframe(fill_missing=False) çıktısı bir parçayı ekle
+        """
+        self.rows += len(chunk)
+
+        product_col = self.di.get_column('product')
+        if product_col and product_col in chunk.columns:
+            products = chunk[product_col].dropna().to_numpy()
+            self.product_distinct.update(products)
+            self.product_frequency.update(products)
+
+        for col_type, sketch in self.quantiles.items():
+            col = self.di.get_column(col_type)
+            if col not in chunk.columns:
+                continue
+            values = chunk[col].to_numpy(dtype=np.float64)
+            sketch.update(values)
+            self.sums[col_type] += float(np.nansum(values))
+            self.missing[col_type] += int(np.isnan(values).sum())
+
+        date_col = self.di.get_column('date')
+        if date_col and date_col in chunk.columns:
+            dates = chunk[date_col].dropna()
+            if len(dates):
+                low, high = dates.min(), dates.max()
+                self.date_min = low if self.date_min is None else min(self.date_min, low)
+                self.date_max = high if self.date_max is None else max(self.date_max, high)
+
+    def result(self) -> Dict[str, Any]:
+        """Yaklaşık analiz sonucu"""
+        result = {
+            'mode': 'approximate',
+            'row_count': self.rows,
+            'date_range': {
+                'start': self.date_min.strftime('%Y-%m-%d') if self.date_min is not None else None,
+                'end': self.date_max.strftime('%Y-%m-%d') if self.date_max is not None else None,
+            },
+            'measures': {},
+        }
+
+        if self.di.get_column('product'):
+            result['unique_products'] = self.product_distinct.result()
+            result['top_products'] = self.product_frequency.result()
+
+        for col_type, sketch in self.quantiles.items():
+            result['measures'][col_type] = {
+                'sum': self.sums[col_type],
+                'missing': self.missing[col_type],
+                **sketch.result()
+            }
+
+        if 'revenue' in self.sums and 'cost' in self.sums:
+            result['total_profit'] = self.sums['revenue'] - self.sums['cost']
+
+        return result
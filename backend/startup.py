@@ -0,0 +1,146 @@
+"""
+Startup Module
+Ağır kütüphanelerin gecikmeli yüklenmesi, ön yükleme ve açılış süresi raporu
+"""
+
+import importlib
+import importlib.util
+import os
+import sys
+import threading
+import time
+import types
+from typing import Any, Dict, List
+
+
+# Süreç içinde bu modülün ilk yüklendiği an (açılış süresinin referansı)
+PROCESS_STARTED = time.perf_counter()
+
+# Analiz ve tahmin için gereken ağır modüller (yükleme sırasıyla)
+ML_MODULES = [
+    'numpy',
+    'pandas',
+    'scipy',
+    'joblib',
+    'sklearn.ensemble',
+    'sklearn.linear_model',
+    'sklearn.preprocessing',
+    'sklearn.model_selection',
+    'sklearn.metrics',
+    'openpyxl',
+    'backend.data_intelligence',
+    'backend.prediction_engine',
+    'backend.product_query',
+    'backend.reports',
+]
+
+_state: Dict[str, Any] = {
+    'app_ready_seconds': None,
+    'preloaded': False,
+    'import_times': {},
+}
+
+
+# İlk yüklemeyi tek iş parçacığına indirger
+_lazy_lock = threading.Lock()
+
+
+class _LazyModule(types.ModuleType):
+    """
+    İlk öznitelik erişiminde gerçek modülü yükleyen vekil
+
+    importlib.util.LazyLoader Python 3.12 öncesinde kilitsizdir; aynı anda
+    gelen ilk istekler yarım yüklenmiş modül görebilir. Vekil sys.modules'a
+    yazılmaz, yükleme kilit altında normal import ile yapılır.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self._module = None
+
+    def _load(self):
+        with _lazy_lock:
+            if self._module is None:
+                module = importlib.import_module(self.__name__)
+                # Sonraki erişimler __getattr__'a düşmeden vekilden okunur
+                self.__dict__.update(module.__dict__)
+                self._module = module
+        return self._module
+
+    def __getattr__(self, attr: str):
+        # Yalnızca vekilde bulunmayan öznitelikler için çağrılır
+        return getattr(self._module or self._load(), attr)
+
+
+def lazy_import(name: str):
+    """
+    Modülü ilk öznitelik erişiminde yükleyecek şekilde içe aktar
+
+    Modül zaten yüklüyse doğrudan döndürülür. İlk yükleme iş parçacıkları
+    arasında kilitle sıraya sokulur.
+
+    Args:
+        name: Modül adı
+
+    Returns:
+        Modül (gecikmeli)
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    if importlib.util.find_spec(name) is None:
+        raise ImportError(f"Modül bulunamadı: {name}")
+
+    return _LazyModule(name)
+
+
+def preload_ml_stack(modules: List[str] = None) -> Dict[str, float]:
+    """
+    ML kütüphanelerini şimdi yükle ve her birinin süresini kaydet
+
+    Gunicorn'da preload_app ile ana süreçte çağrılırsa, fork edilen
+    worker'lar yüklenmiş sayfaları copy-on-write olarak paylaşır.
+
+    Args:
+        modules: Yüklenecek modüller (None ise ML_MODULES)
+
+    Returns:
+        Modül bazlı yükleme süreleri (saniye)
+    """
+    import_times = _state['import_times']
+
+    for name in modules or ML_MODULES:
+        started = time.perf_counter()
+        importlib.import_module(name)
+        import_times[name] = round(time.perf_counter() - started, 4)
+
+    _state['preloaded'] = True
+    return dict(import_times)
+
+
+def mark_app_ready() -> float:
+    """Uygulamanın istek almaya hazır olduğu anı kaydet"""
+    _state['app_ready_seconds'] = round(time.perf_counter() - PROCESS_STARTED, 4)
+    return _state['app_ready_seconds']
+
+
+def should_preload() -> bool:
+    """HISMARKETING_PRELOAD=1 ise ML kütüphaneleri açılışta yüklenir"""
+    return os.environ.get('HISMARKETING_PRELOAD', '0') == '1'
+
+
+def startup_report() -> Dict[str, Any]:
+    """
+    Açılış süresi raporu
+
+    Returns:
+        Süreç bilgisi, hazır olma süresi ve modül yükleme süreleri
+    """
+    return {
+        'pid': os.getpid(),
+        'app_ready_seconds': _state['app_ready_seconds'],
+        'uptime_seconds': round(time.perf_counter() - PROCESS_STARTED, 2),
+        'preloaded': _state['preloaded'],
+        'import_times': dict(_state['import_times']),
+        'ml_stack_loaded': 'sklearn.ensemble' in sys.modules,
+    }
@@ -3,13 +3,36 @@ Utility Functions
 Yardımcı fonksiyonlar ve araçlar
 """
 
-import pandas as pd
+from __future__ import annotations
+
 import os
 import uuid
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Iterator, List, Tuple
 import hashlib
 import json
+import gzip
+import threading
+
+from .metrics import timed_stage
+from .startup import lazy_import
+
+# pandas/numpy ilk kullanımda yüklenir (kimlik doğrulama yolları bunlara ihtiyaç duymaz)
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+
+# Opsiyonel hızlı JSON kütüphanesi (kurulu değilse standart json kullanılır)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Süreçler arası dosya kilidi (Windows'ta yok; orada yalnızca süreç içi kilit kullanılır)
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
 
 
 def generate_file_id() -> str:
@@ -40,6 +63,12 @@ def allowed_file(filename: str) -> bool:
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in allowed_extensions
 
 
+# CSV okumada denenecek encoding ve ayırıcılar
+CSV_ENCODINGS = ['utf-8', 'latin1', 'iso-8859-9', 'cp1254']
+CSV_DELIMITERS = [',', ';', '\t']
+
+
+@timed_stage('read')
 def read_data_file(filepath: str) -> pd.DataFrame:
     """
     Veri dosyasını oku (Excel veya CSV)
@@ -54,11 +83,8 @@ def read_data_file(filepath: str) -> pd.DataFrame:
     
     if ext == 'csv':
         # CSV için farklı encoding ve delimiter denemeleri
-        encodings = ['utf-8', 'latin1', 'iso-8859-9', 'cp1254']
-        delimiters = [',', ';', '\t']
-        
-        for encoding in encodings:
-            for delimiter in delimiters:
+        for encoding in CSV_ENCODINGS:
+            for delimiter in CSV_DELIMITERS:
                 try:
                     df = pd.read_csv(filepath, encoding=encoding, delimiter=delimiter)
                     if len(df.columns) > 1:  # En az 2 sütun olmalı
@@ -76,10 +102,226 @@ def read_data_file(filepath: str) -> pd.DataFrame:
         raise ValueError(f"Desteklenmeyen dosya formatı: {ext}")
 
 
+def detect_csv_format(filepath: str, sample_rows: int = 10000) -> Tuple[str, str]:
+    """
+    CSV dosyasının encoding ve ayırıcısını örnek satırlardan bul
+    
+    Args:
+        filepath: Dosya yolu
+        sample_rows: Denenecek satır sayısı
+        
+    Returns:
+        (encoding, delimiter)
+    """
+    for encoding in CSV_ENCODINGS:
+        for delimiter in CSV_DELIMITERS:
+            try:
+                sample = pd.read_csv(filepath, encoding=encoding, delimiter=delimiter, nrows=sample_rows)
+                if len(sample.columns) > 1:  # En az 2 sütun olmalı
+                    return encoding, delimiter
+            except:
+                continue
+    
+    return 'utf-8', ','
+
+
+def iter_data_chunks(filepath: str, chunksize: int = 100000) -> Iterator[pd.DataFrame]:
+    """
+    Veri dosyasını parça parça oku
+    
+    CSV dosyaları diskten parça parça okunur; Excel dosyaları tek seferde
+    okunup dilimlenir.
+    
+    Args:
+        filepath: Dosya yolu
+        chunksize: Parça başına satır sayısı
+        
+    Yields:
+        DataFrame parçaları
+    """
+    ext = filepath.rsplit('.', 1)[1].lower()
+    
+    if ext == 'csv':
+        encoding, delimiter = detect_csv_format(filepath)
+        with pd.read_csv(filepath, encoding=encoding, delimiter=delimiter, chunksize=chunksize) as reader:
+            for chunk in reader:
+                yield chunk
+    
+    elif ext in ['xlsx', 'xls']:
+        df = pd.read_excel(filepath)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize]
+    
+    else:
+        raise ValueError(f"Desteklenmeyen dosya formatı: {ext}")
+
+
+def append_rows_to_file(filepath: str, rows: pd.DataFrame) -> str:
+    """
+    Yeni satırları kayıtlı veri dosyasının sonuna ekle
+    
+    CSV dosyalarına yalnızca yeni satırlar, dosyanın kendi encoding, ayırıcı
+    ve sütun sırasıyla yazılır. Excel dosyaları ilk eklemede bir kez CSV'ye
+    dönüştürülür; sonraki eklemeler yine yalnızca yeni satırları yazar.
+    
+    Args:
+        filepath: Kayıtlı dosya yolu
+        rows: Eklenecek ham satırlar
+        
+    Returns:
+        Güncel dosya yolu (Excel dönüştürüldüyse yeni CSV yolu)
+    """
+    base, ext = filepath.rsplit('.', 1)
+    ext = ext.lower()
+    
+    if ext in ['xlsx', 'xls']:
+        existing = read_data_file(filepath)
+        csv_path = f"{base}.csv"
+        pd.concat([existing, rows.reindex(columns=existing.columns)], ignore_index=True).to_csv(
+            csv_path, index=False, encoding='utf-8'
+        )
+        os.remove(filepath)
+        return csv_path
+    
+    if ext != 'csv':
+        raise ValueError(f"Desteklenmeyen dosya formatı: {ext}")
+    
+    encoding, delimiter = detect_csv_format(filepath)
+    header = pd.read_csv(filepath, encoding=encoding, delimiter=delimiter, nrows=0).columns
+    
+    # Dosya satır sonu ile bitmiyorsa yeni satırlar son satıra yapışmasın
+    with open(filepath, 'rb+') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) not in (b'\n', b'\r'):
+                f.write(b'\n')
+    
+    rows.reindex(columns=header).to_csv(
+        filepath, mode='a', header=False, index=False, encoding=encoding, sep=delimiter
+    )
+    return filepath
+
+
+def unique_days(dates: pd.Series) -> np.ndarray:
+    """
+    Tarih sütunundaki benzersiz günler (sıralı datetime64[D] dizisi)
+    
+    Args:
+        dates: Tarih serisi (eksikler atlanır)
+        
+    Returns:
+        Sıralı benzersiz günler
+    """
+    days = pd.to_datetime(dates, errors='coerce').dropna().to_numpy(dtype='datetime64[D]')
+    return np.unique(days)
+
+
+# Her rapor tipi için saklanacak en fazla sürüm sayısı
+REPORT_HISTORY_LIMIT = 10
+
+REPORT_INDEX_FILE = 'index.json'
+
+REPORT_LOCK_FILE = 'index.lock'
+
+_report_thread_lock = threading.Lock()
+
+
+@contextmanager
+def _report_index_lock(user_dir: str):
+    """
+    Rapor indeksinin oku-değiştir-yaz adımları için kilit
+    
+    İş parçacıkları süreç içi kilitle, Gunicorn worker'ları kullanıcı
+    klasöründeki kilit dosyası üzerinde fcntl.flock ile sıraya girer;
+    aynı sürüm numarasını iki worker'ın alması ve indeksin birbirinin
+    üzerine yazılması böylece önlenir.
+    """
+    with _report_thread_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(os.path.join(user_dir, REPORT_LOCK_FILE), 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _user_dir(user_email: str) -> str:
+    """Kullanıcı klasörünün yolu"""
+    return os.path.join('user_data', hashlib.md5(user_email.encode()).hexdigest())
+
+
+def _write_json_atomic(filepath: str, data: Any) -> None:
+    """JSON dosyasını önce geçici dosyaya yazıp yerine taşı"""
+    tmp_path = f"{filepath}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, filepath)
+
+
+def _load_report_index(user_dir: str) -> Dict[str, Any]:
+    """Kullanıcının rapor indeksini yükle"""
+    index_path = os.path.join(user_dir, REPORT_INDEX_FILE)
+    if not os.path.exists(index_path):
+        return {}
+    try:
+        with open(index_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _legacy_report_entries(user_dir: str, data_type: str) -> List[Dict[str, Any]]:
+    """
+    İndeks öncesi kaydedilmiş {type}_{timestamp}.json dosyalarını bul
+    (eskiden yeniye sıralı)
+    """
+    if not os.path.exists(user_dir):
+        return []
+    
+    files = sorted(
+        f for f in os.listdir(user_dir)
+        if f.startswith(f"{data_type}_") and f.endswith('.json')
+    )
+    return [
+        {'version': i, 'file': f, 'created_at': None, 'size': os.path.getsize(os.path.join(user_dir, f))}
+        for i, f in enumerate(files, 1)
+    ]
+
+
+def _get_report_entry(index: Dict[str, Any], user_dir: str, data_type: str) -> Dict[str, Any]:
+    """İndeksteki rapor tipi kaydını getir, yoksa eski dosyalardan oluştur"""
+    entry = index.get(data_type)
+    if entry is None:
+        history = _legacy_report_entries(user_dir, data_type)
+        entry = {
+            'latest': history[-1]['file'] if history else None,
+            'next_version': len(history) + 1,
+            'history': history
+        }
+        index[data_type] = entry
+    return entry
+
+
+def _read_report_file(filepath: str) -> Any:
+    """Rapor dosyasını oku (sıkıştırılmış veya eski düz JSON)"""
+    if filepath.endswith('.gz'):
+        with gzip.open(filepath, 'rb') as f:
+            return loads_json(f.read())
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
 def save_user_data(user_email: str, data_type: str, data: Any) -> str:
     """
     Kullanıcı verisini kaydet
     
+    Rapor sıkıştırılmış JSON olarak yazılır, indeksteki son sürüm işaretçisi
+    güncellenir ve REPORT_HISTORY_LIMIT'i aşan eski sürümler silinir.
+    
     Args:
         user_email: Kullanıcı e-postası
         data_type: Veri tipi (analysis, prediction vb.)
@@ -89,47 +331,112 @@ def save_user_data(user_email: str, data_type: str, data: Any) -> str:
         Kayıt dosya yolu
     """
     # Kullanıcı klasörü
-    user_dir = os.path.join('user_data', hashlib.md5(user_email.encode()).hexdigest())
+    user_dir = _user_dir(user_email)
     os.makedirs(user_dir, exist_ok=True)
     
-    # Dosya adı
-    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-    filename = f"{data_type}_{timestamp}.json"
-    filepath = os.path.join(user_dir, filename)
-    
-    # JSON olarak kaydet
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, ensure_ascii=False, indent=2, default=str)
+    with _report_index_lock(user_dir):
+        index = _load_report_index(user_dir)
+        entry = _get_report_entry(index, user_dir, data_type)
+        
+        # Dosya adı
+        version = entry['next_version']
+        filename = f"{data_type}_{version:06d}.json.gz"
+        filepath = os.path.join(user_dir, filename)
+        
+        # Sıkıştırılmış JSON olarak kaydet
+        with gzip.open(filepath, 'wb', compresslevel=6) as f:
+            f.write(dumps_json(data, default=str))
+        
+        entry['history'].append({
+            'version': version,
+            'file': filename,
+            'created_at': datetime.now().isoformat(),
+            'size': os.path.getsize(filepath)
+        })
+        entry['latest'] = filename
+        entry['next_version'] = version + 1
+        
+        # Eski sürümleri temizle
+        expired = entry['history'][:-REPORT_HISTORY_LIMIT]
+        entry['history'] = entry['history'][-REPORT_HISTORY_LIMIT:]
+        for old in expired:
+            try:
+                os.remove(os.path.join(user_dir, old['file']))
+            except OSError:
+                pass
+        
+        _write_json_atomic(os.path.join(user_dir, REPORT_INDEX_FILE), index)
     
     return filepath
 
 
-def load_user_data(user_email: str, data_type: str) -> Any:
+def load_user_data(user_email: str, data_type: str, version: int = None) -> Any:
     """
-    Kullanıcı verisini yükle (en son)
+    Kullanıcı verisini yükle (varsayılan olarak en son)
     
     Args:
         user_email: Kullanıcı e-postası
         data_type: Veri tipi
+        version: Sürüm numarası (None ise en son)
         
     Returns:
         Veri veya None
     """
-    user_dir = os.path.join('user_data', hashlib.md5(user_email.encode()).hexdigest())
+    user_dir = _user_dir(user_email)
     
     if not os.path.exists(user_dir):
         return None
     
-    # En son dosyayı bul
-    files = [f for f in os.listdir(user_dir) if f.startswith(data_type)]
-    if not files:
+    index = _load_report_index(user_dir)
+    entry = _get_report_entry(index, user_dir, data_type)
+    
+    if version is None:
+        filename = entry['latest']
+    else:
+        filename = next((h['file'] for h in entry['history'] if h['version'] == version), None)
+    
+    if not filename:
+        return None
+    
+    filepath = os.path.join(user_dir, filename)
+    if not os.path.exists(filepath):
         return None
     
-    files.sort(reverse=True)
-    filepath = os.path.join(user_dir, files[0])
+    return _read_report_file(filepath)
+
+
+def list_user_reports(user_email: str, data_type: str) -> List[Dict[str, Any]]:
+    """
+    Kullanıcının rapor sürüm geçmişini listele (yeniden eskiye)
     
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+    Args:
+        user_email: Kullanıcı e-postası
+        data_type: Veri tipi
+        
+    Returns:
+        Sürüm bilgileri listesi
+    """
+    user_dir = _user_dir(user_email)
+    
+    if not os.path.exists(user_dir):
+        return []
+    
+    index = _load_report_index(user_dir)
+    entry = _get_report_entry(index, user_dir, data_type)
+    return list(reversed(entry['history']))
+
+
+def turkish_lower(text: str) -> str:
+    """Türkçe kurallarına göre küçük harfe çevir (I -> ı, İ -> i)"""
+    return str(text).replace('I', 'ı').replace('İ', 'i').lower()
+
+
+_TURKISH_FOLD = str.maketrans('ıçğöşü', 'icgosu')
+
+
+def turkish_fold(text: str) -> str:
+    """Türkçe küçük harf + ASCII katlama ('SÜT', 'Süt', 'Sut' -> 'sut')"""
+    return turkish_lower(text).translate(_TURKISH_FOLD)
 
 
 def format_currency(value: float) -> str:
@@ -189,61 +496,242 @@ def create_monthly_aggregation(df: pd.DataFrame, date_col: str, value_col: str)
     return monthly
 
 
+def group_codes(df: pd.DataFrame, keys: List[str]) -> Tuple[np.ndarray, pd.DataFrame]:
+    """
+    Gruplama anahtarlarını tamsayı grup kodlarına dönüştür
+    
+    Kodlar bir kez hesaplanıp birden fazla toplama için tekrar kullanılabilir.
+    
+    Args:
+        df: DataFrame
+        keys: Gruplama sütunları
+        
+    Returns:
+        (satır başına grup kodu, grup başına anahtar değerleri DataFrame'i)
+    """
+    if len(keys) == 1:
+        codes, uniques = pd.factorize(df[keys[0]], sort=False)
+        return codes, pd.DataFrame({keys[0]: uniques})
+    
+    # Eksik anahtarlı satırlar tekli gruplamadaki gibi -1 kodu alır
+    grouped = df.groupby(keys, sort=False, observed=True)
+    codes = grouped.ngroup().fillna(-1).to_numpy(dtype=np.int64)
+    key_frame = grouped.size().index.to_frame(index=False)
+    return codes, key_frame
+
+
+def aggregate_by_codes(codes: np.ndarray, n_groups: int, values: Dict[str, np.ndarray],
+                       stats: Dict[str, List[str]]) -> Dict[str, np.ndarray]:
+    """
+    Grup kodları üzerinden tüm ölçüleri tek geçişte topla
+    
+    Args:
+        codes: Satır başına grup kodu (geçersiz satırlar için -1)
+        n_groups: Grup sayısı
+        values: Ölçü adı -> değer dizisi
+        stats: Ölçü adı -> istatistikler (sum, mean, count, min, max)
+        
+    Returns:
+        '{stat}_{ölçü}' -> grup başına değer dizisi
+    """
+    valid = codes >= 0
+    if not valid.all():
+        codes = codes[valid]
+        values = {name: arr[valid] for name, arr in values.items()}
+    
+    result = {}
+    for name, funcs in stats.items():
+        arr = np.asarray(values[name], dtype=float)
+        present = ~np.isnan(arr)
+        filled = np.where(present, arr, 0.0)
+        
+        sums = counts = None
+        if {'sum', 'mean'} & set(funcs):
+            sums = np.bincount(codes, weights=filled, minlength=n_groups)
+        if {'count', 'mean'} & set(funcs):
+            counts = np.bincount(codes, weights=present, minlength=n_groups)
+        
+        for func in funcs:
+            if func == 'sum':
+                result[f'sum_{name}'] = sums
+            elif func == 'count':
+                result[f'count_{name}'] = counts.astype(np.int64)
+            elif func == 'mean':
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    result[f'mean_{name}'] = np.where(counts > 0, sums / counts, np.nan)
+            elif func in ('min', 'max'):
+                out = np.full(n_groups, np.inf if func == 'min' else -np.inf)
+                ufunc = np.minimum if func == 'min' else np.maximum
+                ufunc.at(out, codes[present], arr[present])
+                out[np.isinf(out)] = np.nan
+                result[f'{func}_{name}'] = out
+            else:
+                raise ValueError(f"Desteklenmeyen istatistik: {func}")
+    
+    return result
+
+
 def create_product_summary(df: pd.DataFrame, product_col: str, quantity_col: str, 
-                          revenue_col: str = None, cost_col: str = None) -> pd.DataFrame:
+                          revenue_col: str = None, cost_col: str = None,
+                          dimensions: List[str] = None, extra_stats: List[str] = None,
+                          codes: Tuple[np.ndarray, pd.DataFrame] = None) -> pd.DataFrame:
     """
     Ürün bazlı özet oluştur
     
+    Tüm ölçüler tek bir gruplama kodlaması üzerinden tek geçişte hesaplanır.
+    
     Args:
         df: DataFrame
         product_col: Ürün sütunu
         quantity_col: Miktar sütunu
         revenue_col: Gelir sütunu (opsiyonel)
         cost_col: Maliyet sütunu (opsiyonel)
+        dimensions: Ek gruplama sütunları (kategori, konum, tedarikçi vb.)
+        extra_stats: Ek istatistikler (mean, count, min, max) - 
+                     '{stat}_quantity' / '{stat}_revenue' sütunları eklenir
+        codes: Daha önce group_codes ile hesaplanmış (kodlar, anahtarlar)
         
     Returns:
         Ürün özet DataFrame
     """
-    summary = df.groupby(product_col).agg({
-        quantity_col: 'sum'
-    }).reset_index()
+    keys = [product_col] + [d for d in (dimensions or []) if d and d in df.columns and d != product_col]
+    
+    if codes is None:
+        codes = group_codes(df, keys)
+    group_code, key_frame = codes
     
-    summary.columns = ['product', 'total_quantity']
+    extra_stats = list(extra_stats or [])
+    values = {'quantity': df[quantity_col].to_numpy(dtype=float)}
+    stats = {'quantity': ['sum'] + extra_stats}
     
     if revenue_col and revenue_col in df.columns:
-        revenue_sum = df.groupby(product_col)[revenue_col].sum().reset_index()
-        summary = summary.merge(revenue_sum, left_on='product', right_on=product_col, how='left')
-        summary = summary.drop(columns=[product_col])
-        summary = summary.rename(columns={revenue_col: 'total_revenue'})
+        values['revenue'] = df[revenue_col].to_numpy(dtype=float)
+        stats['revenue'] = ['sum'] + extra_stats
     
     if cost_col and cost_col in df.columns:
-        cost_sum = df.groupby(product_col)[cost_col].sum().reset_index()
-        summary = summary.merge(cost_sum, left_on='product', right_on=product_col, how='left')
-        summary = summary.drop(columns=[product_col])
-        summary = summary.rename(columns={cost_col: 'total_cost'})
+        values['cost'] = df[cost_col].to_numpy(dtype=float)
+        stats['cost'] = ['sum']
+    
+    agg = aggregate_by_codes(group_code, len(key_frame), values, stats)
+    
+    summary = key_frame.rename(columns={product_col: 'product'})
+    summary['total_quantity'] = agg['sum_quantity']
+    if pd.api.types.is_integer_dtype(df[quantity_col]):
+        summary['total_quantity'] = summary['total_quantity'].astype(np.int64)
+    if 'revenue' in values:
+        summary['total_revenue'] = agg['sum_revenue']
+    if 'cost' in values:
+        summary['total_cost'] = agg['sum_cost']
     
     if 'total_revenue' in summary.columns and 'total_cost' in summary.columns:
-        summary['profit'] = summary['total_revenue'].fillna(0) - summary['total_cost'].fillna(0)
+        summary['profit'] = summary['total_revenue'] - summary['total_cost']
     elif 'total_revenue' in summary.columns:
-        summary['profit'] = summary['total_revenue'].fillna(0)
+        summary['profit'] = summary['total_revenue']
     else:
         summary['profit'] = 0
     
-    return summary.sort_values('total_quantity', ascending=False)
+    if 'total_revenue' in summary.columns:
+        revenue = summary['total_revenue'].to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            summary['margin'] = np.where(revenue > 0, summary['profit'].to_numpy() / revenue * 100, 0.0)
+    
+    for stat in extra_stats:
+        for name in ('quantity', 'revenue'):
+            if f'{stat}_{name}' in agg:
+                summary[f'{stat}_{name}'] = agg[f'{stat}_{name}']
+    
+    return summary.sort_values('total_quantity', ascending=False, kind='stable').reset_index(drop=True)
+
+
+def frame_to_records(df: pd.DataFrame, columns: Dict[str, str] = None) -> List[Dict[str, Any]]:
+    """
+    DataFrame'i JSON'a hazır kayıt listesine çevir
+    
+    Her sütun tek seferde to_numpy().tolist() ile Python tiplerine dönüştürülür;
+    satır satır iterrows ve numpy skaler dönüşümü yapılmaz.
+    
+    Args:
+        df: DataFrame
+        columns: Kaynak sütun -> çıktı anahtarı (None ise tüm sütunlar aynı adla)
+        
+    Returns:
+        Kayıt listesi
+    """
+    if columns is None:
+        columns = {col: str(col) for col in df.columns}
+    
+    keys = list(columns.values())
+    values = [df[col].to_numpy().tolist() for col in columns]
+    return [dict(zip(keys, row)) for row in zip(*values)]
+
+
+def _json_default(obj: Any) -> Any:
+    """NumPy ve Pandas tiplerini JSON uyumlu tiplere çevir"""
+    if isinstance(obj, np.integer):
+        return int(obj)
+    elif isinstance(obj, np.floating):
+        return float(obj)
+    elif isinstance(obj, np.bool_):
+        return bool(obj)
+    elif isinstance(obj, np.ndarray):
+        return obj.tolist()
+    elif isinstance(obj, (pd.Timestamp, datetime)):
+        return obj.isoformat()
+    elif isinstance(obj, pd.Period):
+        return str(obj)
+    raise TypeError(f"JSON'a dönüştürülemeyen tip: {type(obj).__name__}")
+
+
+def dumps_json(data: Any, indent: bool = False, sort_keys: bool = False, default=None) -> bytes:
+    """
+    Veriyi UTF-8 JSON byte dizisine çevir
+    
+    orjson kuruluysa NumPy dizileri ve skalerleri yerel olarak serileştirilir,
+    değilse standart json ve _json_default kullanılır.
+    
+    Args:
+        data: Serileştirilecek veri
+        indent: 2 boşluk girintili çıktı
+        sort_keys: Anahtarları sırala
+        default: Bilinmeyen tipler için son çare dönüştürücü (örn: str)
+        
+    Returns:
+        JSON byte dizisi
+    """
+    def fallback(obj):
+        try:
+            return _json_default(obj)
+        except TypeError:
+            if default is None:
+                raise
+            return default(obj)
+    
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(data, default=fallback, option=option)
+    
+    return json.dumps(
+        data, default=fallback, ensure_ascii=False, sort_keys=sort_keys,
+        indent=2 if indent else None, separators=None if indent else (',', ':')
+    ).encode('utf-8')
+
+
+def loads_json(data: Any) -> Any:
+    """JSON byte dizisini veya metnini çözümle"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 class NumpyEncoder(json.JSONEncoder):
     """NumPy ve Pandas tiplerini JSON'a dönüştürmek için"""
     def default(self, obj):
-        if isinstance(obj, np.integer):
-            return int(obj)
-        elif isinstance(obj, np.floating):
-            return float(obj)
-        elif isinstance(obj, np.ndarray):
-            return obj.tolist()
-        elif isinstance(obj, pd.Timestamp):
-            return obj.isoformat()
-        return super(NumpyEncoder, self).default(obj)
-
-
-import numpy as np  # NumpyEncoder için gerekli
+        try:
+            return _json_default(obj)
+        except TypeError:
+            return super(NumpyEncoder, self).default(obj)
+
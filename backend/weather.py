@@ -0,0 +1,276 @@
+"""
+Weather Module
+Hava durumu sağlayıcıları ve paylaşılan önbellek
+
+Sağlayıcılar (konum, tarih aralığı) için tek çağrıda günlük tablo döndürür;
+satış verisiyle tarih anahtarı üzerinden birleştirilir.
+"""
+
+import os
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, Optional
+
+from .metrics import metrics
+from .utils import turkish_fold
+
+
+# Günlük hava durumu tablosunun sütunları
+WEATHER_COLUMNS = ['temperature', 'rain_probability', 'humidity']
+
+# Önbellekte tutulacak en fazla (sağlayıcı, konum, yıl) tablosu
+WEATHER_CACHE_SIZE = int(os.environ.get('HISMARKETING_WEATHER_CACHE', '256'))
+
+DEFAULT_LOCATION = 'Istanbul'
+
+
+def normalize_location(location: Optional[str]) -> str:
+    """Konum anahtarı ('Istanbul', 'İstanbul' ve 'ISTANBUL' aynı anahtara düşer)"""
+    if location is None or location == '' or (isinstance(location, float) and np.isnan(location)):
+        location = DEFAULT_LOCATION
+    return turkish_fold(location).strip()
+
+
+def weather_condition(rain_probability) -> np.ndarray:
+    """Yağış olasılığından hava durumu etiketi"""
+    return np.where(np.asarray(rain_probability, dtype=float) > 0.4, 'rainy', 'sunny')
+
+
+class WeatherCache:
+    """
+    Sınırlı boyutlu, iş parçacığı güvenli LRU önbellek
+
+    Anahtar başına bir yıllık günlük tablo tutulur; dolunca en uzun süredir
+    kullanılmayan tablo atılır. Tüm istekler aynı önbelleği paylaşır.
+    """
+
+    def __init__(self, max_entries: int = WEATHER_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[tuple, pd.DataFrame]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: tuple) -> Optional[pd.DataFrame]:
+        with self._lock:
+            frame = self._entries.get(key)
+            if frame is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return frame
+
+    def put(self, key: tuple, frame: pd.DataFrame) -> None:
+        with self._lock:
+            self._entries[key] = frame
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Önbellek istatistikleri"""
+        with self._lock:
+            return {'entries': len(self._entries), 'max_entries': self.max_entries,
+                    'hits': self.hits, 'misses': self.misses}
+
+
+weather_cache = WeatherCache()
+
+
+def _weather_cache_samples():
+    stats = weather_cache.stats()
+    yield 'hismarketing_cache_hits_total', {'cache': 'weather'}, stats['hits']
+    yield 'hismarketing_cache_misses_total', {'cache': 'weather'}, stats['misses']
+
+
+metrics.register_collector(_weather_cache_samples)
+
+
+class WeatherProvider:
+    """
+    Hava durumu sağlayıcı arayüzü
+
+    Alt sınıflar `_fetch_year` ile bir konumun bir yıllık günlük tablosunu
+    üretir; aralık sorguları yıllara bölünüp paylaşılan önbellekten okunur.
+    """
+
+    name = 'base'
+
+    def __init__(self, cache: Optional[WeatherCache] = None):
+        self.cache = cache if cache is not None else weather_cache
+
+    def _fetch_year(self, location: str, year: int) -> pd.DataFrame:
+        """Bir yılın günlük tablosu (tarih indeksli, WEATHER_COLUMNS)"""
+        raise NotImplementedError
+
+    def _year(self, location: str, year: int) -> pd.DataFrame:
+        key = (self.name, location, year)
+        frame = self.cache.get(key)
+        if frame is None:
+            frame = self._fetch_year(location, year)
+            self.cache.put(key, frame)
+        return frame
+
+    def get_range(self, location: Optional[str], start, end) -> pd.DataFrame:
+        """
+        Konum ve tarih aralığı için günlük hava durumu
+
+        Args:
+            location: Konum (None ise varsayılan)
+            start: İlk gün
+            end: Son gün
+
+        Returns:
+            Tarih indeksli DataFrame (temperature, rain_probability, humidity, condition)
+        """
+        location = normalize_location(location)
+        start, end = pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize()
+        years = [self._year(location, year) for year in range(start.year, end.year + 1)]
+        frame = pd.concat(years) if len(years) > 1 else years[0]
+        frame = frame.loc[start:end].copy()
+        frame['condition'] = weather_condition(frame['rain_probability'])
+        return frame
+
+    def get(self, location: Optional[str], date) -> Dict:
+        """Tek gün için hava durumu"""
+        row = self.get_range(location, date, date).iloc[0]
+        return {
+            'temperature': float(row['temperature']),
+            'condition': row['condition'],
+            'humidity': float(row['humidity']),
+            'rain_probability': float(row['rain_probability']),
+        }
+
+
+class SimulatedWeatherProvider(WeatherProvider):
+    """
+    Aylık iklim ortalamalarından simüle edilmiş hava durumu
+
+    Gerçek veri yokken ve geleceğe dönük tahminlerde kullanılır.
+    """
+
+    name = 'simulated'
+
+    # Aylık ortalama sıcaklık (°C)
+    MONTHLY_TEMPERATURES = {
+        1: 7, 2: 8, 3: 11, 4: 16, 5: 21, 6: 26,
+        7: 29, 8: 29, 9: 25, 10: 19, 11: 14, 12: 9
+    }
+
+    # Aylık yağış olasılığı (kış aylarında daha yüksek)
+    MONTHLY_RAIN_PROBABILITY = {
+        1: 0.6, 2: 0.5, 3: 0.4, 4: 0.4, 5: 0.3, 6: 0.2,
+        7: 0.1, 8: 0.1, 9: 0.2, 10: 0.4, 11: 0.5, 12: 0.6
+    }
+
+    def _fetch_year(self, location: str, year: int) -> pd.DataFrame:
+        days = pd.date_range(f'{year}-01-01', f'{year}-12-31', freq='D', name='date')
+        month = days.month
+        return pd.DataFrame({
+            'temperature': month.map(self.MONTHLY_TEMPERATURES).astype(float),
+            'rain_probability': month.map(self.MONTHLY_RAIN_PROBABILITY).astype(float),
+            'humidity': (60 + (month % 3) * 10).astype(float),
+        }, index=days)
+
+
+class LocalWeatherProvider(WeatherProvider):
+    """
+    Yerel dosyadan geçmiş hava durumu gözlemleri
+
+    SQLite veritabanı (.db, .sqlite; `weather` tablosu) veya CSV dosyası
+    okunur. Beklenen sütunlar: location, date, temperature,
+    rain_probability ve opsiyonel humidity. Kaydı olmayan günler yedek
+    sağlayıcıdan (varsayılan: simülasyon) doldurulur.
+    """
+
+    def __init__(self, path: str, fallback: Optional[WeatherProvider] = None,
+                 cache: Optional[WeatherCache] = None):
+        super().__init__(cache)
+        self.path = path
+        self.name = f'local:{os.path.abspath(path)}'
+        self.fallback = fallback if fallback is not None else SimulatedWeatherProvider(cache=self.cache)
+        self._is_sqlite = path.rsplit('.', 1)[-1].lower() in ('db', 'sqlite', 'sqlite3')
+        self._frame = None
+        self._locations = None
+        self._lock = threading.Lock()
+
+    def _load_csv(self) -> pd.DataFrame:
+        """CSV dosyasını bir kez oku (konum, tarih indeksli)"""
+        with self._lock:
+            if self._frame is None:
+                frame = pd.read_csv(self.path)
+                frame['location'] = frame['location'].map(normalize_location)
+                frame['date'] = pd.to_datetime(frame['date'], errors='coerce').dt.normalize()
+                frame = frame.dropna(subset=['date'])
+                self._frame = frame.set_index(['location', 'date']).sort_index()
+            return self._frame
+
+    def _sqlite_locations(self, conn) -> Dict[str, str]:
+        """Normalize konum -> veritabanındaki yazım"""
+        with self._lock:
+            if self._locations is None:
+                rows = conn.execute('SELECT DISTINCT location FROM weather').fetchall()
+                self._locations = {normalize_location(raw): raw for (raw,) in rows}
+            return self._locations
+
+    def _observations(self, location: str, year: int) -> pd.DataFrame:
+        """Bir konumun bir yıllık gözlemleri"""
+        if self._is_sqlite:
+            with sqlite3.connect(self.path) as conn:
+                raw = self._sqlite_locations(conn).get(location)
+                if raw is None:
+                    return pd.DataFrame(columns=WEATHER_COLUMNS)
+                columns = [row[1] for row in conn.execute('PRAGMA table_info(weather)')]
+                selected = ['date'] + [col for col in WEATHER_COLUMNS if col in columns]
+                frame = pd.read_sql_query(
+                    f"SELECT {', '.join(selected)} FROM weather WHERE location = ? AND date BETWEEN ? AND ?",
+                    conn, params=(raw, f'{year}-01-01', f'{year}-12-31 23:59:59'))
+            frame['date'] = pd.to_datetime(frame['date'], errors='coerce').dt.normalize()
+            return frame.dropna(subset=['date']).groupby('date').mean(numeric_only=True)
+
+        frame = self._load_csv()
+        if location not in frame.index.get_level_values('location'):
+            return pd.DataFrame(columns=WEATHER_COLUMNS)
+        observations = frame.loc[location]
+        observations = observations.loc[f'{year}-01-01':f'{year}-12-31']
+        return observations.groupby(level=0).mean(numeric_only=True)
+
+    def _fetch_year(self, location: str, year: int) -> pd.DataFrame:
+        base = self.fallback._year(location, year)
+        observations = self._observations(location, year)
+        observations = observations[[col for col in WEATHER_COLUMNS if col in observations.columns]]
+        # Gözlem öncelikli, eksikler yedek sağlayıcıdan
+        return observations.astype(float).combine_first(base).reindex(base.index)
+
+
+def get_weather_provider(path: Optional[str] = None) -> WeatherProvider:
+    """
+    Yapılandırılmış hava durumu sağlayıcısı
+
+    HISMARKETING_WEATHER_DB bir SQLite veya CSV dosyasını gösteriyorsa yerel
+    gözlemler, aksi halde simülasyon kullanılır. Sağlayıcılar dosya başına
+    bir kez oluşturulur.
+    """
+    path = path or os.environ.get('HISMARKETING_WEATHER_DB')
+    if path and os.path.exists(path):
+        return _local_provider(os.path.abspath(path))
+    return _simulated_provider()
+
+
+@lru_cache(maxsize=None)
+def _simulated_provider() -> SimulatedWeatherProvider:
+    return SimulatedWeatherProvider()
+
+
+@lru_cache(maxsize=8)
+def _local_provider(path: str) -> LocalWeatherProvider:
+    return LocalWeatherProvider(path)
@@ -0,0 +1,4 @@
+"""
+Benchmarks
+Sentetik veriyle yükleme, analiz ve tahmin hattı ölçümleri
+"""
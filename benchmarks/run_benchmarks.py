@@ -0,0 +1,331 @@
+"""
+Benchmark Runner
+Yükleme, analiz ve tahmin hattının aşama aşama ölçümü
+
+Her senaryo için deterministik bir satış dosyası üretilir ve uygulamanın
+kullandığı fonksiyonlar sırayla çalıştırılır. Aşama başına süre, satır/sn
+ve en yüksek bellek (tracemalloc) JSON olarak yazılır; önceki bir sonuç
+dosyasıyla karşılaştırılabilir.
+
+Kullanım:
+    python benchmarks/run_benchmarks.py --preset small -o bench.json
+    python benchmarks/run_benchmarks.py --preset medium --baseline bench.json --max-slowdown 1.3
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from benchmarks.synthetic_data import XLSX_MAX_ROWS, generate_sales_data, write_sales_file
+
+
+# (satır, ürün) senaryoları
+PRESETS = {
+    'small': [(10_000, 10)],
+    'medium': [(100_000, 1_000)],
+    'large': [(1_000_000, 10_000)],
+    'xl': [(10_000_000, 100_000)],
+}
+
+STAGES = ['read', 'analyze', 'prepare', 'aggregate', 'features', 'anomalies', 'predict']
+
+# Tarihlerin bu orandan azı okunabildiyse senaryo geçersizdir (aşamalar
+# eksik veriyle çalışıp yanıltıcı derecede hızlı görünür)
+MIN_PARSED_DATE_RATIO = 0.99
+
+
+class StageRecorder:
+    """Aşama süreleri ve bellek tepe değerleri"""
+
+    def __init__(self, rows: int, trace_memory: bool = True):
+        self.rows = rows
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict[str, float]] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            base, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        yield
+        seconds = time.perf_counter() - start
+
+        result = {
+            'seconds': round(seconds, 4),
+            'rows_per_second': round(self.rows / seconds, 1) if seconds > 0 else None,
+        }
+        if self.trace_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            result['peak_mb'] = round((peak - base) / 1024 / 1024, 2)
+        self.stages[name] = result
+
+
+def _max_rss_mb() -> Optional[float]:
+    """Sürecin en yüksek RSS değeri (MB)"""
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux KB, macOS bayt döndürür
+    return round(rss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def run_scenario(path: str, rows: int, stages: List[str], top_n: int,
+                 trace_memory: bool = True) -> Tuple[Dict[str, Dict[str, float]], Optional[float]]:
+    """
+    Tek bir dosya için hattı çalıştır
+
+    Args:
+        path: Satış dosyası
+        rows: Satır sayısı (satır/sn için)
+        stages: Çalıştırılacak aşamalar (sıra STAGES ile aynıdır)
+        top_n: Tahmin edilecek ürün sayısı
+        trace_memory: tracemalloc ile bellek ölçülsün mü
+
+    Returns:
+        (aşama -> ölçüm sözlüğü, tarihi okunabilen satır oranı)
+    """
+    from backend.anomaly_detection import detect_dataset_anomalies
+    from backend.data_intelligence import DataIntelligence
+    from backend.prediction_engine import PredictionEngine
+    from backend.sales_cube import SalesCube
+    from backend.utils import read_data_file
+
+    recorder = StageRecorder(rows, trace_memory)
+    di = DataIntelligence()
+
+    # Sonraki aşamalar öncekilerin çıktısına ihtiyaç duyar; istenmeyen
+    # aşamalar yine çalışır ama ölçüme girmez
+    def measured(name):
+        return recorder.stage(name) if name in stages else _unmeasured()
+
+    with measured('read'):
+        df = read_data_file(path)
+    with measured('analyze'):
+        di.analyze_file(df)
+    with measured('prepare'):
+        prepared = di.prepare_dataframe(df)
+
+    date_col = di.get_column('date')
+    date_ratio = None
+    if date_col:
+        present = int(df[date_col].notna().sum())
+        date_ratio = round(int(prepared[date_col].notna().sum()) / present, 4) if present else None
+    del df
+    di.df = None
+
+    if 'aggregate' in stages:
+        with recorder.stage('aggregate'):
+            cube = SalesCube.build(prepared, di)
+            cube.summary_statistics()
+            cube.monthly_series('quantity')
+            cube.product_summary()
+
+    needs_features = any(stage in stages for stage in ('features', 'anomalies', 'predict'))
+    if not needs_features:
+        return recorder.stages, date_ratio
+
+    with measured('features'):
+        features = di.extract_features(prepared)
+    del prepared
+
+    if 'anomalies' in stages:
+        with recorder.stage('anomalies'):
+            detect_dataset_anomalies(features, di)
+
+    if 'predict' in stages:
+        product_col = di.get_column('product')
+        quantity_col = di.get_column('quantity')
+        location_col = di.get_column('location')
+        columns = [col for col in (product_col, date_col, quantity_col, location_col) if col]
+        with recorder.stage('predict'):
+            PredictionEngine().generate_predictions(
+                features[columns].copy(), product_col, date_col, quantity_col,
+                top_n=top_n, location_col=location_col
+            )
+
+    return recorder.stages, date_ratio
+
+
+@contextmanager
+def _unmeasured():
+    yield
+
+
+def environment_info() -> Dict[str, Any]:
+    """Sonuçların karşılaştırılabilmesi için ortam bilgisi"""
+    import numpy
+    import pandas
+    import sklearn
+
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'packages': {
+            'numpy': numpy.__version__,
+            'pandas': pandas.__version__,
+            'scikit-learn': sklearn.__version__,
+        },
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Sonuçları önceki ölçümle karşılaştır
+
+    Returns:
+        Senaryo ve aşama başına süre oranları (yeni / eski)
+    """
+    previous = {scenario['name']: scenario for scenario in baseline.get('scenarios', [])}
+    rows = []
+    for scenario in results['scenarios']:
+        old = previous.get(scenario['name'])
+        if old is None:
+            continue
+        for stage, measurement in scenario['stages'].items():
+            old_measurement = old['stages'].get(stage)
+            if not old_measurement or not old_measurement['seconds']:
+                continue
+            rows.append({
+                'scenario': scenario['name'],
+                'stage': stage,
+                'baseline_seconds': old_measurement['seconds'],
+                'seconds': measurement['seconds'],
+                'ratio': round(measurement['seconds'] / old_measurement['seconds'], 3),
+            })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Yükleme/analiz/tahmin hattı ölçümü')
+    parser.add_argument('--preset', action='append', choices=sorted(PRESETS),
+                        help='Senaryo seti (birden fazla verilebilir; varsayılan small)')
+    parser.add_argument('--rows', type=int, help='Özel senaryo satır sayısı')
+    parser.add_argument('--products', type=int, default=100, help='Özel senaryo ürün sayısı')
+    parser.add_argument('--language', default='tr', help='tr, en veya tr,en')
+    parser.add_argument('--format', default='csv', help='csv, xlsx veya csv,xlsx')
+    parser.add_argument('--stages', default=','.join(STAGES), help='Ölçülecek aşamalar')
+    parser.add_argument('--top-n', type=int, default=10, help='Tahmin edilecek ürün sayısı')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-tracemalloc', action='store_true', help='Bellek ölçümünü kapat (daha az ek yük)')
+    parser.add_argument('--workdir', help='Üretilen dosyaların klasörü (varsayılan geçici klasör)')
+    parser.add_argument('-o', '--output', help='Sonuç JSON dosyası')
+    parser.add_argument('--baseline', help='Karşılaştırılacak önceki sonuç dosyası')
+    parser.add_argument('--max-slowdown', type=float,
+                        help='Bu orandan fazla yavaşlayan aşama varsa çıkış kodu 1')
+    args = parser.parse_args()
+
+    stages = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+    unknown = [stage for stage in stages if stage not in STAGES]
+    if unknown:
+        parser.error(f"Geçersiz aşama: {', '.join(unknown)}")
+
+    sizes = [(args.rows, args.products)] if args.rows else []
+    for preset in args.preset or ([] if sizes else ['small']):
+        sizes.extend(PRESETS[preset])
+
+    languages = [lang.strip() for lang in args.language.split(',')]
+    formats = [fmt.strip() for fmt in args.format.split(',')]
+
+    trace_memory = not args.no_tracemalloc
+    if trace_memory:
+        tracemalloc.start()
+
+    workdir = args.workdir or tempfile.mkdtemp(prefix='hismarketing-bench-')
+    results = {'meta': environment_info(), 'scenarios': []}
+    exit_code = 0
+
+    for rows, products in sizes:
+        for language in languages:
+            df = generate_sales_data(rows, products, language, seed=args.seed)
+            for fmt in formats:
+                name = f"{rows}x{products}-{language}-{fmt}"
+                if fmt == 'xlsx' and rows > XLSX_MAX_ROWS:
+                    print(f"{name}: atlandı (XLSX satır sınırı)")
+                    continue
+
+                path = os.path.join(workdir, f"{name}.{fmt}")
+                write_sales_file(df, path)
+
+                print(f"{name}: çalışıyor...", flush=True)
+                measured, date_ratio = run_scenario(path, rows, stages, args.top_n, trace_memory)
+                scenario = {
+                    'name': name,
+                    'rows': rows,
+                    'products': products,
+                    'language': language,
+                    'format': fmt,
+                    'file_bytes': os.path.getsize(path),
+                    'parsed_date_ratio': date_ratio,
+                    'stages': measured,
+                    'total_seconds': round(sum(m['seconds'] for m in measured.values()), 4),
+                    'max_rss_mb': _max_rss_mb(),
+                }
+                results['scenarios'].append(scenario)
+
+                for stage, measurement in measured.items():
+                    peak = f", tepe {measurement['peak_mb']} MB" if 'peak_mb' in measurement else ''
+                    print(f"  {stage:<10} {measurement['seconds']:>9.3f} sn{peak}")
+                if date_ratio is not None and date_ratio < MIN_PARSED_DATE_RATIO:
+                    print(f"  UYARI: tarihlerin yalnızca %{date_ratio * 100:.1f}'i okunabildi")
+                    exit_code = 1
+
+                if not args.workdir:
+                    os.remove(path)
+            del df
+
+    if trace_memory:
+        tracemalloc.stop()
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            comparison = compare(results, json.load(f))
+        results['comparison'] = comparison
+        print('\nKarşılaştırma (yeni / eski süre):')
+        for row in comparison:
+            flag = ''
+            if args.max_slowdown and row['ratio'] > args.max_slowdown:
+                flag = '  <-- yavaşlama'
+                exit_code = 1
+            print(f"  {row['scenario']:<28} {row['stage']:<10} {row['ratio']:>6.2f}x{flag}")
+
+    output = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+        print(f"\nSonuçlar yazıldı: {args.output}")
+    else:
+        print(output)
+
+    sys.exit(exit_code)
+
+
+if __name__ == '__main__':
+    main()
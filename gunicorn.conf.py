@@ -0,0 +1,37 @@
+"""
+Gunicorn yapılandırması
+
+Ortam değişkenleri:
+    HISMARKETING_BIND     Dinlenecek adres (varsayılan 0.0.0.0:5000)
+    HISMARKETING_WORKERS  Worker sayısı (varsayılan 1; aşağıdaki nota bakın)
+    HISMARKETING_THREADS  Worker başına iş parçacığı (varsayılan 8)
+    HISMARKETING_PRELOAD  1 ise uygulama ve ML kütüphaneleri fork öncesi yüklenir
+"""
+
+import json
+import os
+
+bind = os.environ.get('HISMARKETING_BIND', '0.0.0.0:5000')
+# Yüklenen veri setleri (user_files), ilerleme işleri, ürün indeksi ve satış
+# küpü süreç belleğinde tutulur; bir worker'da yüklenen dosya diğerinde
+# bulunamaz. Bu kayıtlar disk/SQLite üzerinden paylaşılana kadar tek worker
+# kullanılır ve eşzamanlılık iş parçacıklarıyla artırılır.
+workers = int(os.environ.get('HISMARKETING_WORKERS', '1'))
+# Tahmin istekleri ve SSE akışları uzun sürebilir
+threads = int(os.environ.get('HISMARKETING_THREADS', '8'))
+timeout = 300
+
+# Ön yükleme açıksa uygulama ana süreçte içe aktarılır (copy-on-write paylaşım)
+preload_app = os.environ.get('HISMARKETING_PRELOAD', '0') == '1'
+
+
+def when_ready(server):
+    """Ana süreç hazır olduğunda açılış raporunu yazdır"""
+    from backend.startup import startup_report
+    server.log.info('Açılış raporu: %s', json.dumps(startup_report()))
+
+
+def post_fork(server, worker):
+    """Worker açıldığında açılış raporunu yazdır"""
+    from backend.startup import startup_report
+    server.log.info('Worker %s açılış raporu: %s', worker.pid, json.dumps(startup_report()))
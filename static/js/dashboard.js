@@ -243,6 +243,11 @@ function showAnalysisResults(data) {
     if (data.top_products && data.top_products.length > 0) {
         createTopProductsTable(data.top_products);
     }
+    
+    // Create anomalies table
+    if (data.anomalies) {
+        createAnomaliesTable(data.anomalies);
+    }
 }
 
 function createSalesTrendChart(monthlyData) {
@@ -340,6 +345,34 @@ function createTopProductsTable(products) {
     container.innerHTML = html;
 }
 
+function createAnomaliesTable(anomalies) {
+    const container = document.getElementById('anomaliesTable');
+    const typeNames = { spike: 'Ani artış', drop: 'Düşüş', stockout: 'Stok tükenmesi' };
+    
+    if (!anomalies.top || anomalies.top.length === 0) {
+        container.innerHTML = '<p>Anormal gün bulunamadı.</p>';
+        return;
+    }
+    
+    let html = `<p>${anomalies.total} anormal gün, ${anomalies.products_affected} ürün</p>`;
+    html += '<table><thead><tr><th>Ürün</th><th>Tarih</th><th>Tip</th><th>Miktar</th><th>Beklenen</th></tr></thead><tbody>';
+    
+    anomalies.top.forEach(item => {
+        html += `
+            <tr>
+                <td><strong>${item.product}</strong></td>
+                <td>${item.date}</td>
+                <td>${typeNames[item.type] || item.type}</td>
+                <td>${item.quantity}</td>
+                <td>${item.expected}</td>
+            </tr>
+        `;
+    });
+    
+    html += '</tbody></table>';
+    container.innerHTML = html;
+}
+
 async function generatePredictions() {
     if (!currentData || !currentData.file_id) {
         alert('Lütfen önce veri yükleyin ve analiz edin!');
@@ -360,13 +393,18 @@ async function generatePredictions() {
     let messageIndex = 0;
     btn.innerHTML = loadingMessages[0];
     
-    // Her 1.5 saniyede bir mesajı değiştir
+    // Her 1.5 saniyede bir mesajı değiştir (gerçek ilerleme gelene kadar)
     const messageInterval = setInterval(() => {
         messageIndex = (messageIndex + 1) % loadingMessages.length;
         btn.innerHTML = loadingMessages[messageIndex];
     }, 1500);
     
     const token = localStorage.getItem('userToken');
+    const jobId = createJobId();
+    const progressSource = openProgressStream(jobId, 'prediction', (event) => {
+        clearInterval(messageInterval);
+        btn.innerHTML = formatProgress(event);
+    });
     
     try {
         // Minimum 3 saniye loading süresi
@@ -377,7 +415,7 @@ async function generatePredictions() {
                     'Content-Type': 'application/json',
                     'Authorization': 'Bearer ' + token
                 },
-                body: JSON.stringify({ file_id: currentData.file_id })
+                body: JSON.stringify({ file_id: currentData.file_id, job_id: jobId })
             }),
             new Promise(resolve => setTimeout(resolve, 3000))
         ]);
@@ -399,11 +437,48 @@ async function generatePredictions() {
         alert('Tahmin oluşturulurken bir hata oluştu: ' + error.message);
     } finally {
         clearInterval(messageInterval);
+        progressSource.close();
         btn.disabled = false;
         btn.innerHTML = '<i class="fas fa-magic"></i> Tahmin Oluştur';
     }
 }
 
+function createJobId() {
+    if (window.crypto && window.crypto.randomUUID) {
+        return window.crypto.randomUUID();
+    }
+    return Date.now().toString(36) + Math.random().toString(36).slice(2);
+}
+
+function openProgressStream(jobId, kind, onProgress) {
+    // Sayfa kapanırsa sunucu işi iptal eder
+    const token = localStorage.getItem('userToken');
+    const url = `/api/jobs/${jobId}/events?kind=${kind}&cancel_on_disconnect=1&token=${encodeURIComponent(token)}`;
+    const source = new EventSource(url);
+    
+    source.onmessage = (e) => {
+        const event = JSON.parse(e.data);
+        if (['done', 'cancelled', 'error'].includes(event.stage)) {
+            source.close();
+            return;
+        }
+        onProgress(event);
+    };
+    
+    return source;
+}
+
+function formatProgress(event) {
+    let text = event.message || 'İşleniyor...';
+    if (event.total) {
+        text = `${event.stage === 'train_model' ? 'Modeller eğitiliyor' : text} (${event.current}/${event.total})`;
+        if (event.eta !== null && event.eta !== undefined) {
+            text += ` - kalan ~${Math.ceil(event.eta)} sn`;
+        }
+    }
+    return `<i class="fas fa-spinner fa-spin"></i> ${text}`;
+}
+
 function showPredictionResults(data) {
     document.getElementById('predictionResults').style.display = 'block';
     
@@ -0,0 +1,18 @@
+"""
+HisMarketing WSGI Entrypoint
+Üretim ortamı giriş noktası
+
+Kullanım:
+    gunicorn -c gunicorn.conf.py wsgi:application
+
+HISMARKETING_PRELOAD=1 ise ML kütüphaneleri ana süreçte yüklenir ve
+fork edilen worker'lar bu sayfaları paylaşır. Aksi halde her worker
+ağır modülleri ilk analiz/tahmin isteğinde yükler.
+"""
+
+from backend.startup import preload_ml_stack, should_preload
+
+if should_preload():
+    preload_ml_stack()
+
+from app import app as application